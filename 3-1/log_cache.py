@@ -0,0 +1,299 @@
+# log_cache.py
+# 파싱된 미션 로그를 열(column) 단위 바이너리로 저장해 두는 캐시
+#
+# 파일 구성(리틀엔디언):
+#   헤더 | 로그 헤더 줄(UTF-8) | 이벤트 사전(u16 길이 + UTF-8) * k | 8바이트 정렬
+#        | 타임스탬프[int64 epoch * n] | 메시지 오프셋[uint64 * (n+1)] | 이벤트 코드[uint8 * n] | 8바이트 정렬
+#        | 메시지 blob(UTF-8, 메시지마다 '\n'으로 끝남 -> 한 번에 디코드해서 split 가능)
+#
+# 원본 로그의 크기/mtime이 헤더와 같을 때만 유효. 다시 실행할 때는 텍스트를 파싱하지 않고
+# mmap으로 열어서 행을 바로 꺼낸다.
+#
+# 루트 log_cache.py와 3-1/log_cache.py는 같은 파일이다. 한쪽을 고치면 다른 쪽에도 그대로 복사할 것.
+# 두 main.py는 캐시에 담는 기준이 달라서 kind로 구분한다(파일 이름과 magic이 모두 다름):
+#   'rows'    : 루트 main.py. 파싱된 행만(앞뒤 공백은 잘리고, 형식이 틀린 줄은 빠진 채로) 저장
+#   'lossless': 3-1/main.py. 모든 줄이 ','.join(행)과 똑같을 때만 저장 -> 원문 줄을 그대로 되살릴 수 있음
+# 같은 로그를 두 스크립트가 번갈아 읽어도 서로의 캐시를 덮어쓰거나 잘못 읽지 않는다.
+import calendar
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import time
+from array import array
+from datetime import datetime
+from typing import Iterator
+
+KINDS = {'rows': b'MCCOLR02', 'lossless': b'MCCOLL02'}   # kind -> magic
+HEADER = struct.Struct('<8sQqQII')   # magic, 로그 크기, 로그 mtime_ns, 행 수, 이벤트 수, 헤더 줄 길이
+MAX_EVENTS = 256                     # 이벤트 코드는 uint8
+FLUSH_ROWS = 65536                   # 임시 열 파일로 내보내는 단위
+
+Row = tuple[str, str, str]
+
+
+def cache_path_for(log_path: str, kind: str) -> str:
+    if kind not in KINDS:
+        raise ValueError(f'kind must be one of {tuple(KINDS)}')
+    return f'{log_path}.{kind}.colcache'
+
+
+def _pad8(n: int) -> int:
+    return (8 - n % 8) % 8
+
+
+_SECONDS = [f':{i:02d}' for i in range(60)]
+_SECOND_VALUES = {text: i for i, text in enumerate(_SECONDS)}
+
+
+class _TsFormatter:
+    # epoch -> 'YYYY-MM-DD HH:MM:SS'. 로그는 보통 시간순이라 직전 '분' 문자열만 기억해도 충분
+    def __init__(self) -> None:
+        self._minute = None
+        self._prefix = ''
+
+    def __call__(self, epoch: int) -> str:
+        minute, sec = divmod(epoch, 60)
+        if minute != self._minute:
+            self._minute = minute
+            self._prefix = time.strftime('%Y-%m-%d %H:%M', time.gmtime(minute * 60))
+        return self._prefix + _SECONDS[sec]
+
+
+def _minute_epoch(prefix: str) -> int | None:
+    # 'YYYY-MM-DD HH:MM' -> epoch. 다시 포맷했을 때 똑같은 문자열이 나오는 경우만 인정
+    try:
+        epoch = calendar.timegm(datetime.fromisoformat(prefix).timetuple())
+    except ValueError:
+        return None
+    if time.strftime('%Y-%m-%d %H:%M', time.gmtime(epoch)) != prefix:
+        return None
+    return epoch
+
+
+class ColumnChunk:
+    """행 묶음을 캐시의 열 형식으로 바꿔 담는 조각.
+
+    pickle 가능한 배열만 들고 있어서 워커 프로세스에서 만든 뒤 그대로 넘겨줄 수 있다.
+    되살릴 수 없는 행(타임스탬프 형식이 다르거나 이벤트 종류가 너무 많음)이 나오면 ok=False.
+    """
+
+    def __init__(self) -> None:
+        self.ok = True
+        self.events: dict[str, int] = {}          # 이 조각 안에서만 쓰는 이벤트 코드
+        self.epochs = array('q')
+        self.ends = array('Q')                    # 조각 안 메시지 blob 기준 끝 오프셋
+        self.codes = bytearray()
+        self.msgs = bytearray()
+        self._minute_prefix: str | None = None   # 직전 행의 'YYYY-MM-DD HH:MM'과 그 epoch
+        self._minute_epoch: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def add(self, ts: str, event: str, msg: str) -> bool:
+        if not self.ok:
+            return False
+        prefix = ts[:16]
+        if prefix != self._minute_prefix:
+            self._minute_prefix = prefix
+            self._minute_epoch = _minute_epoch(prefix)
+        sec = _SECOND_VALUES.get(ts[16:])
+        code = self.events.get(event)
+        if code is None and len(self.events) < MAX_EVENTS:
+            code = self.events[event] = len(self.events)
+        if self._minute_epoch is None or sec is None or code is None:
+            self.ok = False
+            return False
+        self.epochs.append(self._minute_epoch + sec)
+        self.codes.append(code)
+        self.msgs += msg.encode('utf-8') + b'\n'
+        self.ends.append(len(self.msgs))
+        return True
+
+
+class ColumnCacheWriter:
+    """행(또는 ColumnChunk)을 받아 열별 임시 파일에 흘려 쓰고, commit()에서 캐시 파일 하나로 합친다.
+
+    메모리는 FLUSH_ROWS 행 분량만 쓴다. 캐시할 수 없는 행이 하나라도 나오면 그 뒤로는
+    아무것도 하지 않고 commit()도 건너뛴다.
+    """
+
+    def __init__(self, log_path: str, kind: str) -> None:
+        self.log_path = log_path
+        self.kind = kind
+        self.cache_path = cache_path_for(log_path, kind)
+        self.ok = True
+        st = os.stat(log_path)          # 읽기 시작 시점 기준 -> 읽는 중에 로그가 바뀌면 다음에 다시 만듦
+        self._src = (st.st_size, st.st_mtime_ns)
+        self._events: dict[str, int] = {}
+        self._n = 0
+        self._msg_bytes = 0
+        self._chunk = ColumnChunk()
+        self._files = [tempfile.TemporaryFile() for _ in range(4)]   # ts, offsets, codes, msgs
+        array('Q', [0]).tofile(self._files[1])
+
+    def add(self, ts: str, event: str, msg: str) -> None:
+        if not self.ok:
+            return
+        if not self._chunk.add(ts, event, msg):
+            self.discard()
+        elif len(self._chunk) >= FLUSH_ROWS:
+            self.add_chunk(self._chunk)
+            self._chunk = ColumnChunk()
+
+    def add_chunk(self, chunk: ColumnChunk) -> None:
+        """다른 곳(워커 등)에서 만든 조각을 이어 붙임. 이벤트 코드는 전체 기준으로 다시 매김."""
+        if not self.ok:
+            return
+        if not chunk.ok:
+            self.discard()
+            return
+        table = bytearray(range(256))
+        for name, local in chunk.events.items():
+            code = self._events.get(name)
+            if code is None:
+                if len(self._events) >= MAX_EVENTS:
+                    self.discard()
+                    return
+                code = self._events[name] = len(self._events)
+            table[local] = code
+        base = self._msg_bytes
+        ends = chunk.ends if base == 0 else array('Q', [e + base for e in chunk.ends])
+        f_ts, f_off, f_codes, f_msgs = self._files
+        chunk.epochs.tofile(f_ts)
+        ends.tofile(f_off)
+        f_codes.write(chunk.codes.translate(table))
+        f_msgs.write(chunk.msgs)
+        self._n += len(chunk)
+        self._msg_bytes += len(chunk.msgs)
+
+    def commit(self, header: str) -> bool:
+        """캐시 파일을 완성한다. 캐시할 수 없는 로그였으면 False."""
+        if self.ok and len(self._chunk):
+            self.add_chunk(self._chunk)
+        if not self.ok:
+            return False
+        head = header.encode('utf-8')
+        event_table = b''.join(struct.pack('<H', len(e.encode('utf-8'))) + e.encode('utf-8')
+                               for e in self._events)
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as out:
+                out.write(HEADER.pack(KINDS[self.kind], *self._src, self._n, len(self._events), len(head)))
+                out.write(head + event_table)
+                out.write(b'\0' * _pad8(HEADER.size + len(head) + len(event_table)))
+                for f in self._files[:3]:
+                    f.seek(0)
+                    shutil.copyfileobj(f, out)
+                out.write(b'\0' * _pad8(self._n))
+                self._files[3].seek(0)
+                shutil.copyfileobj(self._files[3], out)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            return False
+        finally:
+            self.discard()
+        return True
+
+    def discard(self) -> None:
+        self.ok = False
+        for f in self._files:
+            f.close()
+        self._chunk = ColumnChunk()
+
+
+class ColumnCache:
+    """mmap으로 연 캐시. for row in cache 로 (ts, event, msg)를 순서대로 꺼낸다."""
+
+    def __init__(self, cache_path: str, kind: str) -> None:
+        self.kind = kind
+        self._file = open(cache_path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._views: list[memoryview] = []
+        try:
+            self._map_sections()
+        except (struct.error, ValueError, TypeError, UnicodeDecodeError):
+            self.close()
+            raise ValueError(f'{cache_path}: 캐시 형식이 올바르지 않습니다.')
+
+    def _map_sections(self) -> None:
+        magic, size, mtime_ns, n, k, head_len = HEADER.unpack_from(self._mm, 0)
+        if magic != KINDS[self.kind]:
+            raise ValueError('bad magic')
+        self.src = (size, mtime_ns)
+        buf = memoryview(self._mm)
+        self._views.append(buf)
+        pos = HEADER.size
+        self.header = bytes(buf[pos:pos + head_len]).decode('utf-8')
+        pos += head_len
+        self.events: list[str] = []
+        for _ in range(k):
+            (length,) = struct.unpack_from('<H', self._mm, pos)
+            self.events.append(bytes(buf[pos + 2:pos + 2 + length]).decode('utf-8'))
+            pos += 2 + length
+        pos += _pad8(pos)
+
+        def take(count: int, fmt: str, size: int) -> memoryview:
+            nonlocal pos
+            view = buf[pos:pos + count * size].cast(fmt)
+            self._views.append(view)
+            pos += count * size
+            return view
+
+        self.epochs = take(n, 'q', 8)
+        self._offsets = take(n + 1, 'Q', 8)
+        self._codes = take(n, 'B', 1)
+        pos += _pad8(n)
+        self._msgs = buf[pos:pos + self._offsets[n]]
+        self._views.append(self._msgs)
+
+    def close(self) -> None:
+        for v in reversed(self._views):
+            v.release()
+        self._views.clear()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ColumnCache':
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def __iter__(self) -> Iterator[Row]:
+        # 한 행씩 꺼냄(메모리 일정)
+        fmt = _TsFormatter()
+        events, codes, offsets, msgs = self.events, self._codes, self._offsets, self._msgs
+        for i, epoch in enumerate(self.epochs):
+            yield fmt(epoch), events[codes[i]], str(msgs[offsets[i]:offsets[i + 1] - 1], 'utf-8')
+
+    def rows(self) -> list[Row]:
+        # 전체를 리스트로 한꺼번에: 열마다 한 번에 변환해서 행 단위 반복보다 빠름
+        fmt = _TsFormatter()
+        events = self.events
+        ts_col = [fmt(e) for e in self.epochs]
+        ev_col = [events[c] for c in self._codes]
+        msg_col = str(self._msgs, 'utf-8').split('\n')[:-1]   # 마지막 '\n' 뒤의 빈 조각 제외
+        return list(zip(ts_col, ev_col, msg_col))
+
+
+def load_cache(log_path: str, kind: str) -> ColumnCache | None:
+    """로그 옆의 kind 캐시가 유효하면 열어서 돌려줌(없거나 낡았으면 None)."""
+    try:
+        st = os.stat(log_path)
+        cache = ColumnCache(cache_path_for(log_path, kind), kind)
+    except (OSError, ValueError):
+        return None
+    if cache.src != (st.st_size, st.st_mtime_ns):
+        cache.close()
+        return None
+    return cache
@@ -0,0 +1,262 @@
+# log_index.py
+# mission_computer_main.json 검색용 인덱스(바이너리 파일, mmap으로 읽음)
+#
+# 파일 구성(리틀엔디언, 앞쪽 배열은 8바이트 정렬):
+#   헤더 | epoch[int64 * n] | 엔트리 오프셋[uint64 * (n+1)]
+#        | 토큰 오프셋[uint64 * (t+1)] | 포스팅 오프셋[uint64 * (t+1)] | 포스팅[uint32 * p]
+#        | 토큰 blob | 엔트리 blob(ts + '\0' + msg)
+#
+# 엔트리는 시간 오름차순으로 저장 -> 엔트리 번호 순서 = 시간 순서.
+# 토큰(ts와 msg의 단어)은 UTF-8 바이트 순으로 정렬.
+# 검색은 예전 JSON 전체 스캔과 같은 부분 문자열(대소문자 무시) 검색: 토큰 인덱스로 후보만 좁히고
+# 후보마다 'term in ts/msg'로 다시 확인한다.
+import bisect
+import calendar
+import mmap
+import os
+import re
+import struct
+from datetime import datetime, timedelta
+from typing import Iterable
+
+MAGIC = b'MCIDX002'                   # 002: ts 단어도 토큰에 포함
+HEADER = struct.Struct('<8sQqIIII')   # magic, json 크기, json mtime_ns, 엔트리 수, 토큰 수, 포스팅 수, 예약
+NO_TIME = -(2 ** 63)                  # 타임스탬프 해석 불가 -> 가장 오래된 쪽으로 정렬
+
+_TOKEN_RE = re.compile(r'\w+')
+_TIME_QUERY = re.compile(
+    r'^(\d{4})(?:-(\d{2})(?:-(\d{2})(?: (\d{1,2})(?::(\d{1,2})(?::(\d{1,2}))?)?)?)?)?$'
+)
+_STEPS = {3: timedelta(days=1), 4: timedelta(hours=1),
+          5: timedelta(minutes=1), 6: timedelta(seconds=1)}
+
+
+def index_path_for(json_path: str) -> str:
+    return json_path + '.idx'
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _epoch(dt: datetime) -> int:
+    return calendar.timegm(dt.timetuple())
+
+
+def parse_time_query(term: str) -> tuple[int, int] | None:
+    """'2023-08-27 11' 같은 시간 접두사 또는 'A ~ B' 범위를 [start, end) epoch로 변환."""
+    if '~' in term:
+        left, _, right = term.partition('~')
+        lo, hi = _prefix_bounds(left), _prefix_bounds(right)
+        if lo is None or hi is None:
+            return None
+        return lo[0], hi[1]
+    return _prefix_bounds(term)
+
+
+def _prefix_bounds(text: str) -> tuple[int, int] | None:
+    m = _TIME_QUERY.match(text.strip())
+    if not m:
+        return None
+    raw = [g for g in m.groups() if g is not None]
+    # 시/분/초는 마지막 칸만 한 자리 허용: '11:3' -> 11:30 ~ 11:39
+    if any(len(g) == 1 for g in raw[3:-1]):
+        return None
+    partial = len(raw) >= 4 and len(raw[-1]) == 1
+    parts = [int(g) for g in raw]
+    if partial:
+        parts[-1] *= 10
+    fields = parts + [1, 1, 0, 0, 0][len(parts) - 1:]
+    try:
+        start = datetime(*fields)
+    except ValueError:
+        return None
+    n = len(parts)
+    if n == 1:
+        end = datetime(start.year + 1, 1, 1)
+    elif n == 2:
+        end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    elif partial:
+        # 상위 단위(일/시/분)를 넘어가지 않게 자름
+        parent = datetime(*fields[:n - 1])
+        end = min(start + 10 * _STEPS[n], parent + _STEPS[n - 1])
+    else:
+        end = start + _STEPS[n]
+    return _epoch(start), _epoch(end)
+
+
+def _pad8(n: int) -> int:
+    return (8 - n % 8) % 8
+
+
+def build_index(index_path: str, json_path: str,
+                items: Iterable[tuple[str, str]], epochs: Iterable[int | None]) -> None:
+    """(ts, msg) 목록과 각 ts의 epoch(해석 불가면 None)로 인덱스 파일을 만든다."""
+    entries = [(NO_TIME if e is None else e, ts, msg) for (ts, msg), e in zip(items, epochs)]
+    entries.sort(key=lambda x: (x[0], x[1]))
+
+    postings_by_token: dict[bytes, list[int]] = {}
+    entry_blob = bytearray()
+    entry_offsets = [0]
+    for i, (_e, ts, msg) in enumerate(entries):
+        entry_blob += ts.encode('utf-8') + b'\0' + msg.encode('utf-8')
+        entry_offsets.append(len(entry_blob))
+        for tok in set(tokenize(ts + ' ' + msg)):
+            postings_by_token.setdefault(tok.encode('utf-8'), []).append(i)
+
+    tokens = sorted(postings_by_token)
+    token_blob = bytearray()
+    token_offsets = [0]
+    posting_offsets = [0]
+    postings: list[int] = []
+    for tok in tokens:
+        token_blob += tok
+        token_offsets.append(len(token_blob))
+        postings.extend(postings_by_token[tok])
+        posting_offsets.append(len(postings))
+
+    st = os.stat(json_path)
+    n, t, p = len(entries), len(tokens), len(postings)
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, n, t, p, 0))
+        f.write(struct.pack(f'<{n}q', *(e for e, _ts, _msg in entries)))
+        f.write(struct.pack(f'<{n + 1}Q', *entry_offsets))
+        f.write(struct.pack(f'<{t + 1}Q', *token_offsets))
+        f.write(struct.pack(f'<{t + 1}Q', *posting_offsets))
+        f.write(struct.pack(f'<{p}I', *postings))
+        f.write(b'\0' * _pad8(4 * p))
+        f.write(token_blob)
+        f.write(entry_blob)
+    os.replace(tmp_path, index_path)
+
+
+class LogSearchIndex:
+    """mmap으로 연 검색 인덱스. JSON은 전혀 읽지 않는다."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._views: list[memoryview] = []
+        try:
+            self._map_sections()
+        except (struct.error, ValueError, TypeError):
+            self.close()
+            raise ValueError(f'{path}: 인덱스 형식이 올바르지 않습니다.')
+
+    def _map_sections(self) -> None:
+        magic, self.src_size, self.src_mtime_ns, n, t, p, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError('bad magic')
+        buf = memoryview(self._mm)
+        self._views.append(buf)
+        pos = HEADER.size
+
+        def take(count: int, fmt: str, size: int) -> memoryview:
+            nonlocal pos
+            view = buf[pos:pos + count * size].cast(fmt)
+            self._views.append(view)
+            pos += count * size
+            return view
+
+        self.epochs = take(n, 'q', 8)
+        self._entry_offsets = take(n + 1, 'Q', 8)
+        token_offsets = take(t + 1, 'Q', 8)
+        self._posting_offsets = take(t + 1, 'Q', 8)
+        self._postings = take(p, 'I', 4)
+        pos += _pad8(4 * p)
+        token_end = pos + token_offsets[t]
+        self._token_base = pos                    # 토큰 blob은 mmap.find로 직접 검색
+        self._token_offsets = token_offsets
+        self._entry_blob = buf[token_end:token_end + self._entry_offsets[n]]
+        self._views.append(self._entry_blob)
+
+    @classmethod
+    def open(cls, index_path: str, json_path: str) -> 'LogSearchIndex | None':
+        """인덱스가 없거나 JSON보다 오래됐으면 None."""
+        try:
+            st = os.stat(json_path)
+            idx = cls(index_path)
+        except (OSError, ValueError):
+            return None
+        if idx.src_size != st.st_size or idx.src_mtime_ns != st.st_mtime_ns:
+            idx.close()
+            return None
+        return idx
+
+    def close(self) -> None:
+        for v in reversed(self._views):
+            v.release()
+        self._views.clear()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> 'LogSearchIndex':
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def entry(self, i: int) -> tuple[str, str]:
+        raw = bytes(self._entry_blob[self._entry_offsets[i]:self._entry_offsets[i + 1]])
+        ts, _, msg = raw.decode('utf-8').partition('\0')
+        return ts, msg
+
+    def _token_postings(self, part: bytes) -> set[int]:
+        # part를 부분 문자열로 가진 토큰들의 포스팅 합집합(토큰 blob에서 찾고 토큰 경계를 넘는 건 버림)
+        offsets = self._token_offsets
+        start_of_blob = self._token_base
+        end_of_blob = start_of_blob + offsets[len(offsets) - 1]
+        ids: set[int] = set()
+        pos = self._mm.find(part, start_of_blob, end_of_blob)
+        while pos != -1:
+            rel = pos - start_of_blob
+            i = bisect.bisect_right(offsets, rel) - 1
+            next_pos = start_of_blob + offsets[i + 1]
+            if rel + len(part) <= offsets[i + 1]:
+                ids.update(self._postings[self._posting_offsets[i]:self._posting_offsets[i + 1]])
+            else:
+                next_pos = pos + 1
+            pos = self._mm.find(part, next_pos, end_of_blob)
+        return ids
+
+    def _candidates(self, term: str) -> list[int] | None:
+        """term의 단어마다 그 단어를 포함한 토큰이 있는 엔트리의 교집합. 단어가 없으면 None(전체 확인)."""
+        result: set[int] | None = None
+        for tok in set(tokenize(term)):
+            ids = self._token_postings(tok.encode('utf-8'))
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        return None if result is None else sorted(result)
+
+    def _matches(self, low_term: str, i: int) -> bool:
+        ts, msg = self.entry(i)
+        return low_term in ts.lower() or low_term in msg.lower()
+
+    def search_text(self, term: str) -> list[int]:
+        """부분 문자열 검색(예전 전체 스캔과 같은 결과). 예: 'plosion', '11:40', 'tank expl'."""
+        low_term = term.lower()
+        ids = self._candidates(term)
+        if ids is None:
+            ids = range(len(self))
+        return [i for i in ids if self._matches(low_term, i)]
+
+    def search_range(self, start: int, end: int) -> range:
+        """[start, end) epoch 범위의 엔트리 번호(시간 오름차순)."""
+        lo = bisect.bisect_left(self.epochs, start)
+        hi = bisect.bisect_left(self.epochs, end, lo)
+        return range(lo, hi)
+
+    def search(self, term: str) -> list[tuple[str, str]]:
+        """'A ~ B' 시간 범위면 시간 검색, 아니면 부분 문자열 검색. 결과는 시간 역순."""
+        bounds = parse_time_query(term) if '~' in term else None
+        ids = self.search_range(*bounds) if bounds else self.search_text(term)
+        return [self.entry(i) for i in reversed(ids)]
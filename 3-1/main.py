@@ -1,9 +1,20 @@
 # main.py
+import argparse
+import heapq
 import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
+from operator import itemgetter
 from textwrap import fill
 from collections import Counter
 
+from log_cache import ColumnCacheWriter, ColumnChunk, load_cache
+from log_index import LogSearchIndex, build_index, index_path_for
+
 
 # import json -> 파이썬 객체(dict, list)를 json 문자열/파일로 저장하거나, 그 반대로 읽어오는 도구를 가져옴
 # from datetime import datetime  -> 문자열 타임스탬프 <> 시간객체 변환하고, 정렬/비교에 쓰려고 가져옴
@@ -15,12 +26,71 @@ JSON_FILE = 'mission_computer_main.json'   # 정리된 결과를 딕셔너리 
 REPORT_FILE = 'log_analysis.md'       # 로그를 분석해서 만든 사고원인분석보고서를 마크다운으로 저장할 파일 이름
 DANGER_FILE = 'danger_logs.log'       # 위험 키워드가 들어간 원문 로그 줄만 따로 모아서 저장할 파일 이름
 DT_FMT = '%Y-%m-%d %H:%M:%S'          # 타임스탬프 문자열 형식 정의. 예:2023-08-27 10:00:00 같은 형태
+CHECKPOINT_FILE = LOG_FILE + '.ckpt'  # --follow 모드에서 어디까지 읽었는지(바이트 오프셋)와 누적 통계를 저장
+FOLLOW_CHUNK_BYTES = 64 * 1024 * 1024  # --follow 모드에서 한 번에 읽을 최대 바이트
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024  # 이보다 큰 로그만 여러 프로세스로 나눠 파싱
+PARALLEL_CHUNK_BYTES = 8 * 1024 * 1024 # 워커 하나가 한 번에 맡는 바이트 범위 크기
+CACHE_KIND = 'lossless'                # 원문 줄을 그대로 되살릴 수 있을 때만 캐시(log_cache 참고)
+REPORT_TOP_K = 30                      # 보고서에 보여줄 최신 위험 로그 수(메모리도 이만큼만 사용)
 
 # 위험 키워드(대소문자 무시 영어, 한글은 그대로 매칭)
 DANGER_KEYWORDS_EN = ['explosion', 'leak', 'high temperature', 'oxygen', 'o2', 'fire', 'warning', 'danger']
 DANGER_KEYWORDS_KO = ['폭발', '누출', '고온', '산소', '화재', '경고', '위험']
 
 
+def _trie_pattern(words: list[str]) -> str:
+    # 키워드를 트라이로 묶어서 정규식 하나로 만듦 -> 공통 접두사는 한 번만 비교
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class DangerMatcher:
+    """위험 키워드 매처. 영어는 대소문자 무시, 한글은 그대로 매칭.
+
+    키워드 목록으로 정규식을 한 번만 컴파일해 두고, 메시지당 한 번의 스캔으로
+    걸린 키워드를 모두 돌려준다. 겹치는 키워드도 모두 센다('경고온도' -> 경고, 고온).
+    """
+
+    def __init__(self, en_keywords: list[str], ko_keywords: list[str]) -> None:
+        parts = []
+        if en_keywords:
+            parts.append('(?i:' + _trie_pattern([k.lower() for k in en_keywords]) + ')')
+        if ko_keywords:
+            parts.append(_trie_pattern(ko_keywords))
+        body = '|'.join(parts)
+        self.pattern = re.compile(body) if parts else None
+        # find_all용: 폭이 0인 lookahead라 매 위치에서 다시 시도 -> 앞 키워드와 겹친 키워드도 잡힘
+        self._overlapping = re.compile(f'(?=({body}))') if parts else None
+        # 트라이는 같은 위치에서 가장 긴 키워드만 잡으므로, 그 키워드의 접두사인 키워드도 같이 셈
+        words = [k.lower() for k in en_keywords] + list(ko_keywords)
+        self._expand = {w: [p for p in words if w.startswith(p)] for w in words}
+
+    def search(self, text: str) -> bool:
+        return self.pattern is not None and self.pattern.search(text) is not None
+
+    def find_all(self, text: str) -> list[str]:
+        if self._overlapping is None:
+            return []
+        expand = self._expand
+        return [k for m in self._overlapping.finditer(text) for k in expand[m.group(1).lower()]]
+
+
+DANGER_MATCHER = DangerMatcher(DANGER_KEYWORDS_EN, DANGER_KEYWORDS_KO)
+
+
 def read_lines(path: str) -> list[str]:        # path: str은 표지판 역할 / -> list[str]: 이 함수가 반환할 값이 어떤타입인지 알려주는 표시
     try:
         with open(path, 'r', encoding='utf-8') as f:   # with -> 컨텍스트 매니저 문법. 파일을 열고나면 블록이 끝날때 자동으로 close()해주는 안전장치.
@@ -54,6 +124,144 @@ def parse_csv_line(line: str) -> tuple[str, str, str] | None:
     return ts, event, msg
 
 
+def load_rows(path: str, workers: int | None = None
+              ) -> tuple[list[str], list[tuple[str, str, str]], dict | None]:
+    """(원문 줄 목록, 파싱된 행 목록, 미리 합쳐 둔 통계 또는 None)을 돌려줌.
+
+    로그 옆에 유효한 열 캐시(.lossless.colcache)가 있으면 텍스트 파싱 없이 캐시에서 바로 읽고,
+    없으면 파싱하면서 캐시를 새로 만든다. 원문 줄을 캐시에서 그대로 되살릴 수 있는
+    로그(모든 줄이 'ts,event,msg' 형태)만 캐시한다.
+    큰 로그는 여러 프로세스로 나눠 파싱한다(workers=None이면 크기를 보고 자동, 1이면 항상 단일).
+    """
+    cache = load_cache(path, CACHE_KIND)
+    if cache is not None:
+        with cache:
+            header = cache.header
+            data_rows = cache.rows()
+        lines = [header] if header else []
+        lines.extend(f'{ts},{ev},{msg}' for ts, ev, msg in data_rows)
+        return lines, data_rows, None
+
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    if workers is None:
+        workers = (os.cpu_count() or 1) if size >= PARALLEL_MIN_BYTES else 1
+    if workers > 1:
+        return parse_log_parallel(path, workers)
+
+    lines = read_lines(path)
+    try:
+        writer: ColumnCacheWriter | None = ColumnCacheWriter(path, CACHE_KIND)
+    except OSError:
+        writer = None
+    data_rows: list[tuple[str, str, str]] = []
+    start_idx = 1 if lines and lines[0].lower().startswith('timestamp') else 0
+    for line in lines[start_idx:]:
+        parsed = parse_csv_line(line)
+        if parsed:
+            data_rows.append(parsed)
+        if writer is None:
+            continue
+        if parsed and line == ','.join(parsed):
+            writer.add(*parsed)
+        else:
+            writer.discard()
+            writer = None
+    if writer is not None:
+        writer.commit(lines[0] if start_idx else '')
+    return lines, data_rows, None
+
+
+# -------------------
+# 병렬 파싱: 파일을 줄 경계에 맞춘 바이트 범위로 나눠 워커 프로세스가 각각 파싱
+# -------------------
+def split_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    """파일을 대략 같은 크기의 [start, end) 바이트 범위로 나누되, 경계는 항상 줄 바로 뒤."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, bounds[-1]))
+            f.readline()                  # 걸친 줄은 앞 범위에 포함
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _parse_range(path: str, start: int, end: int) -> dict:
+    # 워커 프로세스에서 실행: 범위 하나를 파싱하고 부분 통계와 캐시용 열 조각까지 만들어 돌려줌
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.decode('utf-8').splitlines()
+    header = ''
+    body = lines
+    if start == 0 and lines and lines[0].lower().startswith('timestamp'):
+        header, body = lines[0], lines[1:]
+
+    rows: list[tuple[str, str, str]] = []
+    chunk = ColumnChunk()
+    acc = ReportAccumulator(seq_base=start)   # 범위 안 행 수 < 범위 바이트 수 -> 범위끼리 번호가 안 겹침
+    for line in body:
+        parsed = parse_csv_line(line)
+        if parsed is None:
+            chunk.ok = False
+            continue
+        rows.append(parsed)
+        if chunk.ok and (line != ','.join(parsed) or not chunk.add(*parsed)):
+            chunk.ok = False
+        acc.add(parsed)
+    return {
+        'lines': lines,
+        'header': header,
+        'rows': rows,
+        'chunk': chunk,
+        'report': acc,
+        'sortable': None not in parse_timestamps(rows),   # 고정 레이아웃이면 문자열 순 = 시간 순
+    }
+
+
+def parse_log_parallel(path: str, workers: int
+                       ) -> tuple[list[str], list[tuple[str, str, str]], dict | None]:
+    """load_rows와 같은 결과를 여러 프로세스로 만든다. 범위별 ReportAccumulator를 합쳐서 build_stats 형태로 돌려줌."""
+    size = os.path.getsize(path)
+    ranges = split_ranges(path, max(workers, size // PARALLEL_CHUNK_BYTES + 1))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            parts = list(ex.map(_parse_range, repeat(path), *zip(*ranges))) if ranges else []
+    except UnicodeDecodeError:
+        print(f'[에러] {path} 파일의 인코딩이 UTF-8이 아닙니다.')
+        raise SystemExit(1)
+
+    lines: list[str] = []
+    data_rows: list[tuple[str, str, str]] = []
+    acc = ReportAccumulator()
+    try:
+        writer: ColumnCacheWriter | None = ColumnCacheWriter(path, CACHE_KIND)
+    except OSError:
+        writer = None
+    for part in parts:
+        lines.extend(part['lines'])
+        data_rows.extend(part['rows'])
+        acc.merge(part['report'])
+        if writer is not None:
+            writer.add_chunk(part['chunk'])
+    if writer is not None:
+        writer.commit(parts[0]['header'] if parts else '')
+
+    if not all(p['sortable'] for p in parts):
+        return lines, data_rows, None     # 타임스탬프 형식이 섞였으면 통계는 정렬 후 build_stats로
+    # 범위별 누적기를 합친 결과(최신 위험 행은 범위마다 K개씩만 넘어옴)
+    stats = acc.stats()
+    return lines, data_rows, stats
+
+
 def pretty_table(rows: list[tuple[str, str, str]]) -> str:
     ts_w = max([len('timestamp')] + [len(r[0]) for r in rows]) if rows else len('timestamp')
     ev_w = max([len('event')] + [len(r[1]) for r in rows]) if rows else len('event')
@@ -67,8 +275,60 @@ def pretty_table(rows: list[tuple[str, str, str]]) -> str:
     return '\n'.join(out)
 
 
+# DT_FMT('%Y-%m-%d %H:%M:%S') 고정 레이아웃 전용 빠른 파서
+_TS_MINUTE_RE = re.compile(r'(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d)', re.ASCII)
+_SECONDS = {f'{i:02d}': i for i in range(60)}
+_DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_EPOCH_ORDINAL = 719163   # date(1970, 1, 1).toordinal()
+
+
+def _minute_epoch(prefix: str) -> int | None:
+    # 'YYYY-MM-DD HH:MM' -> epoch 초 (형식/날짜가 잘못되면 None)
+    m = _TS_MINUTE_RE.fullmatch(prefix)
+    if m is None:
+        return None
+    y, mo, d, h, mi = (int(g) for g in m.groups())
+    leap = y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+    if (y < 1 or not 1 <= mo <= 12 or not 1 <= d <= _DAYS_IN_MONTH[mo]
+            or (mo == 2 and d == 29 and not leap) or h > 23 or mi > 59):
+        return None
+    py = y - 1
+    ordinal = py * 365 + py // 4 - py // 100 + py // 400 + _DAYS_BEFORE_MONTH[mo] + (mo > 2 and leap) + d
+    return (ordinal - _EPOCH_ORDINAL) * 86400 + h * 3600 + mi * 60
+
+
+def parse_timestamps(rows: list[tuple[str, ...]], ts_index: int = 0) -> list[int | None]:
+    """각 행의 타임스탬프를 epoch 초(int)로 한 번에 변환. 형식이 틀린 행은 None.
+
+    strptime을 행마다 부르지 않는다. 'YYYY-MM-DD HH:MM' 부분은 처음 나올 때 한 번만
+    계산해 두고, 행마다는 초 두 자리만 표에서 찾아 더한다.
+    """
+    minute_cache: dict[str, int | None] = {}
+    seconds = _SECONDS
+    out: list[int | None] = []
+    append = out.append
+    for row in rows:
+        ts = row[ts_index]
+        prefix = ts[:16]
+        base = minute_cache.get(prefix, -1)
+        if base == -1:
+            base = minute_cache[prefix] = _minute_epoch(prefix)
+        sec = seconds.get(ts[17:])
+        if base is None or sec is None or ts[16:17] != ':':
+            append(None)
+        else:
+            append(base + sec)
+    return out
+
+
 def sort_rows_by_time(rows_ts_msg: list[tuple[str, str]] | list[tuple[str, str, str]],
                       ts_index: int = 0) -> None:
+    if None not in parse_timestamps(rows_ts_msg, ts_index):
+        # 전부 고정 폭 레이아웃이면 문자열 순서 = 시간 순서 -> strptime 없이 안정 정렬
+        rows_ts_msg.sort(key=itemgetter(ts_index), reverse=True)
+        return
+    # '2023-8-27 9:00:00'처럼 자릿수가 다른 값이 섞이면 기존 방식 그대로
     try:
         rows_ts_msg.sort(
             key=lambda x: datetime.strptime(x[ts_index], DT_FMT),
@@ -79,16 +339,13 @@ def sort_rows_by_time(rows_ts_msg: list[tuple[str, str]] | list[tuple[str, str,
 
 
 def detect_danger(msg: str) -> bool:
-    low = msg.lower()
-    if any(k in low for k in DANGER_KEYWORDS_EN):
-        return True
-    return any(k in msg for k in DANGER_KEYWORDS_KO)
+    return DANGER_MATCHER.search(msg)
 
 
 def write_danger_file(lines: list[str]) -> None:
     # 헤더 제거 후 원문 라인 기준 필터링
     start_idx = 1 if lines and lines[0].lower().startswith('timestamp') else 0
-    danger_lines = [ln for ln in lines[start_idx:] if detect_danger(ln)]
+    danger_lines = [ln for ln in lines[start_idx:] if DANGER_MATCHER.search(ln)]
     try:
         with open(DANGER_FILE, 'w', encoding='utf-8') as f:
             for ln in danger_lines:
@@ -99,36 +356,134 @@ def write_danger_file(lines: list[str]) -> None:
         raise SystemExit(1)
 
 
+class ReportAccumulator:
+    """보고서 통계를 한 번의 순회로 모으는 누적기. 메모리는 로그 크기와 상관없이 O(K).
+
+    - 총 건수, 이벤트별/위험 키워드별 건수는 정확히 셈
+    - 위험 행은 '가장 최신' top_k개만 최소 힙으로 유지(힙 맨 위 = 남겨둔 것 중 가장 오래된 것)
+    - 최신 판단 기준(key)은 기본이 타임스탬프 문자열, 같으면 먼저 들어온 행이 앞
+    seq_base: 병렬 파싱에서 범위마다 다른 시작 번호(바이트 오프셋)를 줘서 합칠 때도 파일 순서가 유지되게 함
+    """
+
+    def __init__(self, top_k: int = REPORT_TOP_K, seq_base: int = 0) -> None:
+        self.top_k = top_k
+        self.total = 0
+        self.danger_total = 0
+        self.event_counts: Counter = Counter()
+        self.keyword_counts: Counter = Counter()
+        self._seq = seq_base
+        self._heap: list[tuple] = []     # (key, -seq, row)
+        self._first: tuple | None = None  # (key, ts) 가장 오래된 행
+        self._last: tuple | None = None   # (key, ts) 가장 최신 행
+
+    def add(self, row: tuple[str, str, str], key=None) -> bool:
+        """행 하나를 반영. 위험 키워드가 있었으면 True."""
+        ts, ev, msg = row
+        if key is None:
+            key = ts
+        self.total += 1
+        self.event_counts[ev] += 1
+        if self._first is None or key < self._first[0]:
+            self._first = (key, ts)
+        if self._last is None or key > self._last[0]:
+            self._last = (key, ts)
+        seq = self._seq
+        self._seq += 1
+        hits = DANGER_MATCHER.find_all(msg)
+        if not hits:
+            return False
+        self.danger_total += 1
+        self.keyword_counts.update(hits)
+        self._push((key, -seq, row))
+        return True
+
+    def _push(self, entry: tuple) -> None:
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: 'ReportAccumulator') -> None:
+        """다른 누적기(다른 범위/워커)의 결과를 합침."""
+        self.total += other.total
+        self.danger_total += other.danger_total
+        self.event_counts.update(other.event_counts)
+        self.keyword_counts.update(other.keyword_counts)
+        for entry in other._heap:
+            self._push(entry)
+        if other._first is not None and (self._first is None or other._first[0] < self._first[0]):
+            self._first = other._first
+        if other._last is not None and (self._last is None or other._last[0] > self._last[0]):
+            self._last = other._last
+
+    def hits(self) -> list[tuple[str, str, str]]:
+        """남겨둔 위험 행, 최신순."""
+        return [row for _key, _seq, row in sorted(self._heap, reverse=True)]
+
+    def stats(self) -> dict:
+        hits = self.hits()
+        return {
+            'total': self.total,
+            'event_counts': self.event_counts,
+            'first_ts': self._first[1] if self._first else '',
+            'last_ts': self._last[1] if self._last else '',
+            'danger_hits': hits,
+            'danger_total': self.danger_total,
+            'keyword_counts': self.keyword_counts,
+            'last_abnormal': hits[0] if hits else None,
+        }
+
+    def to_dict(self) -> dict:
+        # --follow 체크포인트용(JSON으로 저장 가능한 값만)
+        return {
+            'top_k': self.top_k,
+            'total': self.total,
+            'danger_total': self.danger_total,
+            'event_counts': self.event_counts,
+            'keyword_counts': self.keyword_counts,
+            'seq': self._seq,
+            'heap': self._heap,
+            'first': self._first,
+            'last': self._last,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ReportAccumulator':
+        acc = cls(data['top_k'], data['seq'])
+        acc.total = data['total']
+        acc.danger_total = data['danger_total']
+        acc.event_counts = Counter(data['event_counts'])
+        acc.keyword_counts = Counter(data['keyword_counts'])
+        # JSON에서는 튜플이 리스트로 돌아오므로 다시 튜플로(힙 안에서 서로 비교해야 함)
+        acc._heap = [(key, seq, tuple(row)) for key, seq, row in data['heap']]
+        heapq.heapify(acc._heap)
+        acc._first = tuple(data['first']) if data['first'] else None
+        acc._last = tuple(data['last']) if data['last'] else None
+        return acc
+
+
 def build_stats(data_rows: list[tuple[str, str, str]]) -> dict:
-    events = [ev for _ts, ev, _msg in data_rows]
-    counts = Counter(events)
-    first_ts = data_rows[-1][0] if data_rows else ''
-    last_ts = data_rows[0][0] if data_rows else ''
-    danger_hits = [(ts, ev, msg) for ts, ev, msg in data_rows if detect_danger(msg)]
-    last_abnormal = next((r for r in data_rows if detect_danger(r[2])), None)
-    return {
-        'event_counts': counts,
-        'first_ts': first_ts,
-        'last_ts': last_ts,
-        'danger_hits': danger_hits,
-        'last_abnormal': last_abnormal,
-    }
+    # data_rows는 이미 최신순 정렬 -> 순서 자체를 key로 씀(타임스탬프 형식이 섞여 있어도 정렬 결과를 따름)
+    acc = ReportAccumulator()
+    for i, row in enumerate(data_rows):
+        acc.add(row, -i)
+    return acc.stats()
 
 
 def infer_cause(stats: dict) -> str:
     # 단순 규칙 기반 추론(로그가 부족하면 보수적 결론)
-    danger_msgs = [m for _t, _e, m in stats['danger_hits']]
-    text_blob = ' '.join(danger_msgs).lower()
+    # 메시지를 합치지 않고, build_stats가 세어 둔 키워드별 건수로 판단
+    seen = stats['keyword_counts']
 
-    if 'explosion' in text_blob or '폭발' in text_blob:
+    if seen['explosion'] or seen['폭발']:
         return '추정: 추진체/연료계 폭발 또는 압력계통 이상으로 인한 급격한 파손.'
-    if ('oxygen' in text_blob or 'o2' in text_blob or '산소' in text_blob) and ('누출' in text_blob or 'leak' in text_blob):
+    if (seen['oxygen'] or seen['o2'] or seen['산소']) and (seen['누출'] or seen['leak']):
         return '추정: 산소 계통(O2) 누출로 인한 산화성 환경 위험 증대.'
-    if 'high temperature' in text_blob or '고온' in text_blob:
+    if seen['high temperature'] or seen['고온']:
         return '추정: 열관리(냉각) 실패로 인한 온도 급상승.'
-    if 'leak' in text_blob or '누출' in text_blob:
+    if seen['leak'] or seen['누출']:
         return '추정: 유체/가스 계통 누출.'
-    if 'fire' in text_blob or '화재' in text_blob:
+    if seen['fire'] or seen['화재']:
         return '추정: 국부 화재 발생.'
     if stats['danger_hits']:
         return '추정: 위험 신호 다수 감지. 구체 원인 식별엔 추가 로그 필요.'
@@ -136,22 +491,27 @@ def infer_cause(stats: dict) -> str:
 
 
 def write_markdown_report(data_rows: list[tuple[str, str, str]]) -> None:
-    stats = build_stats(data_rows)
+    write_stats_report(build_stats(data_rows))
+
+
+def write_stats_report(stats: dict) -> None:
     cause = infer_cause(stats)
 
     def fmt_event_counts(c: Counter) -> str:
         if not c:
             return '- (없음)'
-        return '\n'.join(f'- {k}: {v}건' for k, v in c.most_common())
+        # 건수 내림차순, 같은 건수는 이벤트 이름순(병렬 파싱 결과와 순서가 같도록)
+        return '\n'.join(f'- {k}: {v}건' for k, v in sorted(c.items(), key=lambda kv: (-kv[1], kv[0])))
 
     def fmt_danger_hits(hits: list[tuple[str, str, str]]) -> str:
         if not hits:
             return '> 위험 키워드 포함 로그 없음'
         lines = []
-        for ts, ev, msg in hits[:30]:  # 리포트는 최대 30줄만
+        for ts, ev, msg in hits[:REPORT_TOP_K]:  # 리포트는 최대 REPORT_TOP_K줄만
             lines.append(f'- **{ts}** [{ev}] {msg}')
-        if len(hits) > 30:
-            lines.append(f'- ...외 {len(hits) - 30}건')
+        rest = stats.get('danger_total', len(hits)) - len(lines)
+        if rest > 0:
+            lines.append(f'- ...외 {rest}건')
         return '\n'.join(lines)
 
     md = []
@@ -162,7 +522,7 @@ def write_markdown_report(data_rows: list[tuple[str, str, str]]) -> None:
     md.append('')
     md.append('## 1. 개요')
     md.append(f'- 분석 대상 파일: `{LOG_FILE}`')
-    md.append(f'- 총 레코드 수(헤더 제외): {len(data_rows)}')
+    md.append(f'- 총 레코드 수(헤더 제외): {stats["total"]}')
     md.append(f'- 기간: {stats["first_ts"] or "-"} ~ {stats["last_ts"] or "-"}')
     md.append('')
     md.append('## 2. 이벤트 통계')
@@ -191,43 +551,61 @@ def write_markdown_report(data_rows: list[tuple[str, str, str]]) -> None:
         raise SystemExit(1)
 
 
-def prompt_search(json_path: str) -> None:
+def build_search_index(json_path: str, log_dict: dict[str, str]) -> None:
+    # JSON 옆에 검색 인덱스(.idx)를 만들어 둠 -> 검색할 때 JSON을 다시 읽지 않음
+    try:
+        build_index(index_path_for(json_path), json_path,
+                    log_dict.items(), parse_timestamps(list(log_dict.items())))
+    except OSError as e:
+        print(f'[알림] 검색 인덱스 저장 실패: {e}')
+
+
+def open_search_index(json_path: str) -> LogSearchIndex | None:
+    index_path = index_path_for(json_path)
+    idx = LogSearchIndex.open(index_path, json_path)
+    if idx is not None:
+        return idx
+
+    # 인덱스가 없거나 JSON이 바뀐 경우에만 JSON을 한 번 읽어서 다시 만듦
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
             log_dict: dict[str, str] = json.load(f)
     except FileNotFoundError:
         print(f'[알림] {json_path} 가 없어 검색을 건너뜁니다.')
-        return
+        return None
     except (json.JSONDecodeError, UnicodeDecodeError):
         print(f'[알림] {json_path} 가 올바른 UTF-8 JSON이 아닙니다.')
-        return
+        return None
+    build_search_index(json_path, log_dict)
+    return LogSearchIndex.open(index_path, json_path)
 
-    term = input('\n[검색] mission_computer_main.json 에서 찾을 문자열(엔터면 건너뜀): ').strip()
-    if not term:
-        print('[검색] 건너뜀')
+
+def prompt_search(json_path: str) -> None:
+    idx = open_search_index(json_path)
+    if idx is None:
         return
 
-    low_term = term.lower()
-    matches = [(ts, msg) for ts, msg in log_dict.items()
-               if low_term in ts.lower() or low_term in msg.lower()]
+    # 부분 문자열 검색(시각/메시지, 대소문자 무시) 또는 시간 범위 검색: '2023-08-27 11:00 ~ 2023-08-27 11:30'
+    with idx:
+        while True:
+            term = input('\n[검색] mission_computer_main.json 에서 찾을 문자열/시간 범위(엔터면 종료): ').strip()
+            if not term:
+                print('[검색] 종료')
+                return
 
-    # 시간 역순 정렬 후 출력
-    try:
-        matches.sort(key=lambda x: datetime.strptime(x[0], DT_FMT), reverse=True)
-    except ValueError:
-        matches.sort(key=lambda x: x[0], reverse=True)
+            matches = idx.search(term)   # 시간 역순
 
-    print('\n=== 검색 결과 ===')
-    if not matches:
-        print('(없음)')
-        return
-    for ts, msg in matches:
-        print(f'- {ts} :: {msg}')
+            print('\n=== 검색 결과 ===')
+            if not matches:
+                print('(없음)')
+                continue
+            for ts, msg in matches:
+                print(f'- {ts} :: {msg}')
 
 
-def main() -> None:
-    # 1) 로그 읽기
-    lines = read_lines(LOG_FILE)
+def main(workers: int | None = None) -> None:
+    # 1) 로그 읽기 + 파싱 (캐시가 있으면 파싱 생략)
+    lines, data_rows, stats = load_rows(LOG_FILE, workers)
 
     # 빈 파일 가드
     if not lines:
@@ -257,14 +635,6 @@ def main() -> None:
     for line in lines:
         print(line)
 
-    # 3) 파싱
-    data_rows: list[tuple[str, str, str]] = []
-    start_idx = 1 if lines and lines[0].lower().startswith('timestamp') else 0
-    for line in lines[start_idx:]:
-        parsed = parse_csv_line(line)
-        if parsed:
-            data_rows.append(parsed)
-
     # 과제 요건 리스트[(timestamp, message)]
     log_list: list[tuple[str, str]] = [(ts, msg) for ts, _ev, msg in data_rows]
 
@@ -300,9 +670,13 @@ def main() -> None:
     except OSError as e:
         print(f'[에러] JSON 저장 실패: {e}')
         raise SystemExit(1)
+    build_search_index(JSON_FILE, log_dict)
 
     # 3. 사고 원인 분석 보고서 작성 (Markdown)
-    write_markdown_report(data_rows)
+    if stats is not None:
+        write_stats_report(stats)      # 병렬 파싱에서 이미 합쳐 둔 통계 사용
+    else:
+        write_markdown_report(data_rows)
 
     # 4-1. 위험 키워드 필터 파일 저장
     write_danger_file(lines)
@@ -311,8 +685,168 @@ def main() -> None:
     prompt_search(JSON_FILE)
 
 
+# -------------------
+# --follow: 계속 늘어나는 로그에서 새로 붙은 줄만 읽어 누적 갱신
+# -------------------
+class FollowState:
+    """tail -f 방식 분석 상태. 바이트 오프셋 체크포인트와 누적 통계를 들고 있음.
+
+    통계(report)는 크기가 정해져 있지만 log_dict는 JSON 산출물 그 자체라서 서로 다른 타임스탬프마다
+    한 항목씩 계속 늘어난다(배치 모드의 mission_computer_main.json과 같은 크기). 그래서 메모리와
+    JSON 저장 비용은 로그 길이에 비례하고, 저장은 새 행이 들어온 틱에만 한다.
+    """
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.inode = 0
+        self.report = ReportAccumulator()                    # 위험 행은 최신 K개만 유지
+        self.log_dict: dict[str, str] = {}                   # 시간 오름차순으로 쌓고, 저장할 때 뒤집음
+
+    @classmethod
+    def load(cls, path: str) -> 'FollowState':
+        state = cls()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            state.offset = data['offset']
+            state.inode = data['inode']
+            state.report = ReportAccumulator.from_dict(data['report'])
+            with open(JSON_FILE, 'r', encoding='utf-8') as f:
+                state.log_dict = dict(reversed(list(json.load(f).items())))
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls()   # 체크포인트가 없거나 깨졌으면 처음부터
+        return state
+
+    def save(self, path: str) -> None:
+        data = {
+            'offset': self.offset,
+            'inode': self.inode,
+            'report': self.report.to_dict(),
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @property
+    def total(self) -> int:
+        return self.report.total
+
+    def stats(self) -> dict:
+        return self.report.stats()
+
+    def read_new_lines(self, path: str) -> tuple[list[str], bool]:
+        """체크포인트 이후 새로 붙은 '완성된' 줄만 읽음.
+
+        파일이 잘리거나(크기 < 오프셋) 다른 파일로 바뀌면(inode 변경) 처음부터 다시 읽는다.
+        두 번째 값은 이번에 파일 처음부터 읽었는지 여부.
+        한 번에 FOLLOW_CHUNK_BYTES씩 읽되, 그 안에 줄바꿈이 없으면(아주 긴 줄) 찾을 때까지 더 읽는다.
+        UTF-8이 아니면 배치 모드처럼 에러를 알리고 끝냄(오프셋은 그 앞에 그대로 남음).
+        """
+        st = os.stat(path)
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.__init__()
+            self.inode = st.st_ino
+        if st.st_size == self.offset:
+            return [], False
+        chunk = b''
+        end = 0
+        with open(path, 'rb') as f:
+            f.seek(self.offset)
+            while end == 0:
+                more = f.read(FOLLOW_CHUNK_BYTES)
+                if not more:
+                    return [], False          # 아직 쓰는 중인 마지막 줄은 다음 번에
+                chunk += more
+                end = chunk.rfind(b'\n') + 1
+        try:
+            text = chunk[:end].decode('utf-8')
+        except UnicodeDecodeError:
+            print(f'[에러] {path} 파일의 인코딩이 UTF-8이 아닙니다.')
+            raise SystemExit(1)
+        from_start = self.offset == 0
+        self.offset += end
+        lines = text.splitlines()
+        if from_start and lines and lines[0].lower().startswith('timestamp'):
+            lines = lines[1:]
+        return lines, from_start
+
+    def update(self, lines: list[str]) -> tuple[list[str], int]:
+        """새 줄을 반영하고 (위험 키워드가 걸린 원문 줄, 반영한 행 수)를 돌려줌."""
+        danger_lines: list[str] = []
+        rows = 0
+        for line in lines:
+            if DANGER_MATCHER.search(line):
+                danger_lines.append(line)
+            row = parse_csv_line(line)
+            if row is None:
+                continue
+            self.log_dict[row[0]] = row[2]      # 같은 시각이면 나중 행이 이김(배치 모드와 같음)
+            self.report.add(row)
+            rows += 1
+        return danger_lines, rows
+
+
+def follow(interval_sec: float) -> None:
+    state = FollowState.load(CHECKPOINT_FILE)
+    print(f'[follow] {LOG_FILE} 감시 시작 (오프셋 {state.offset}, {interval_sec}초 간격, Ctrl+C로 종료)')
+    first = True
+    try:
+        while True:
+            try:
+                lines, from_start = state.read_new_lines(LOG_FILE)
+            except FileNotFoundError:
+                lines, from_start = [], False
+            before_hits = state.report.danger_total
+            danger_lines, new_rows = state.update(lines)
+
+            try:
+                if danger_lines or from_start:
+                    # 처음부터 다시 읽었으면 이전 위험 로그를 덮어쓰고, 아니면 이어 붙임
+                    with open(DANGER_FILE, 'w' if from_start else 'a', encoding='utf-8') as f:
+                        for ln in danger_lines:
+                            f.write(ln + '\n')
+                if new_rows or from_start:
+                    with open(JSON_FILE, 'w', encoding='utf-8') as f:
+                        json.dump(dict(reversed(list(state.log_dict.items()))), f, ensure_ascii=False, indent=2)
+                    print(f'[follow] 새 레코드 {new_rows}줄 반영 (누적 {state.total}건)')
+            except OSError as e:
+                print(f'[에러] 산출물 저장 실패: {e}')
+                raise SystemExit(1)
+
+            # 보고서는 새 위험 신호가 들어왔을 때만 다시 씀(첫 회/처음부터 다시 읽은 경우는 항상)
+            if first or from_start or state.report.danger_total != before_hits:
+                write_stats_report(state.stats())
+            first = False
+            try:
+                state.save(CHECKPOINT_FILE)
+            except OSError as e:
+                print(f'[알림] 체크포인트 저장 실패: {e}')
+
+            # 한 번에 다 못 읽었으면(큰 파일) 쉬지 않고 이어서 읽음
+            if not lines:
+                time.sleep(interval_sec)
+    except KeyboardInterrupt:
+        print('[follow] 종료')
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 로그 분석')
+    parser.add_argument('--follow', action='store_true',
+                        help='로그에 새로 붙는 줄만 계속 읽어서 결과를 갱신')
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help='--follow 모드에서 확인 간격(초)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='파싱에 쓸 프로세스 수(기본: 큰 로그면 CPU 코어 수, 1이면 병렬 안 함)')
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    main()
+    args = parse_args()
+    if args.follow:
+        follow(args.interval)
+    else:
+        main(args.workers)
 
 
 
@@ -0,0 +1,305 @@
+# alert_rules.py
+# 센서 샘플이 들어올 때마다 바로 판정하는 경보 규칙 엔진
+# (3-1/main.py처럼 나중에 텍스트 로그에서 'oxygen' 같은 단어를 찾는 대신, 값 자체를 샘플마다 검사)
+#
+# 규칙 종류
+#   threshold: 값이 limit을 넘으면(op '>') / 밑돌면(op '<') 발령
+#   rate     : 분당 변화율이 limit을 넘으면/밑돌면 발령. 변화율은 최근 window초 샘플들의 최소제곱 기울기
+#              (직전 샘플 하나와 비교하면 센서 잡음만으로도 발령/해제가 반복됨)
+#   clear    : 히스테리시스. 발령 후에는 clear 값을 다시 넘어와야 해제(경계에서 깜빡이지 않게)
+# 경보는 발령/해제될 때만 한 줄씩 danger 로그 형식(시각,레벨,메시지)으로 남긴다.
+from __future__ import annotations
+import math
+from collections import deque
+from datetime import datetime
+from operator import gt, itemgetter, mul
+from typing import Iterable
+
+from sensor_log import BufferedLogWriter
+
+DANGER_LOG_PATH = 'danger_logs.log'
+LEVELS = ('INFO', 'WARNING', 'CRITICAL')
+KINDS = ('threshold', 'rate')
+DT_FMT = '%Y-%m-%d %H:%M:%S'
+RATE_WINDOW = 300.0               # rate 규칙 기본 윈도우(초)
+RATE_MIN_SPAN = 0.5               # 샘플들이 윈도우의 이 비율 이상을 덮어야 기울기를 판정에 씀
+
+
+class AlertRule:
+    """규칙 하나. label은 메시지 앞부분(3-1 위험 키워드가 들어가게 쓰면 그쪽 도구로도 잡힘)."""
+
+    def __init__(self, name: str, channel: str, op: str, limit: float, clear: float | None = None,
+                 kind: str = 'threshold', level: str = 'WARNING', label: str | None = None,
+                 window: float = RATE_WINDOW) -> None:
+        if op not in ('<', '>'):
+            raise ValueError(f"{name}: op must be '<' or '>'")
+        if kind not in KINDS:
+            raise ValueError(f'{name}: kind must be one of {KINDS}')
+        if level not in LEVELS:
+            raise ValueError(f'{name}: level must be one of {LEVELS}')
+        if clear is None:
+            clear = limit
+        if (op == '>' and clear > limit) or (op == '<' and clear < limit):
+            raise ValueError(f'{name}: clear must be on the safe side of limit')
+        if window <= 0:
+            raise ValueError(f'{name}: window must be positive')
+        self.name = name
+        self.channel = channel
+        self.op = op
+        self.limit = float(limit)
+        self.clear = float(clear)
+        self.kind = kind
+        self.level = level
+        self.label = label or name
+        self.window = float(window)       # rate 규칙만 사용
+
+    @property
+    def unit(self) -> str:
+        return '/min' if self.kind == 'rate' else ''
+
+    def describe(self, value: float) -> str:
+        unit = self.unit
+        return f'{self.label}: {value:g}{unit} {self.op} {self.limit:g}{unit}'
+
+
+def threshold(name: str, channel: str, op: str, limit: float, clear: float | None = None,
+              level: str = 'WARNING', label: str | None = None) -> AlertRule:
+    return AlertRule(name, channel, op, limit, clear, 'threshold', level, label)
+
+
+def rate(name: str, channel: str, op: str, per_minute: float, clear: float | None = None,
+         level: str = 'WARNING', label: str | None = None, window: float = RATE_WINDOW) -> AlertRule:
+    return AlertRule(name, channel, op, per_minute, clear, 'rate', level, label, window)
+
+
+class _Slope:
+    """최근 window초 (ts, value)의 최소제곱 기울기(초당). 합계를 들고 있어서 push/evict는 O(1).
+
+    시각은 origin 기준 상대값으로 더해 큰 epoch 제곱에서 정밀도를 잃지 않게 하고,
+    origin이 너무 오래되면 남은 샘플로 합계를 다시 계산한다.
+    """
+
+    __slots__ = ('window', 'min_span', 'samples', 'origin', 'st', 'sv', 'stt', 'stv')
+
+    def __init__(self, window: float, min_span: float = RATE_MIN_SPAN) -> None:
+        self.window = window
+        self.min_span = window * min_span
+        self.samples: deque[tuple[float, float]] = deque()
+        self.origin = 0.0
+        self.st = self.sv = self.stt = self.stv = 0.0
+
+    def _add(self, ts: float, v: float, sign: float) -> None:
+        t = ts - self.origin
+        self.st += sign * t
+        self.sv += sign * v
+        self.stt += sign * t * t
+        self.stv += sign * t * v
+
+    def _rebase(self) -> None:
+        self.origin = self.samples[0][0] if self.samples else 0.0
+        self.st = self.sv = self.stt = self.stv = 0.0
+        for ts, v in self.samples:
+            self._add(ts, v, 1.0)
+
+    def push(self, ts: float, v: float) -> float:
+        """샘플을 넣고 현재 기울기를 돌려줌(샘플이 윈도우를 충분히 덮지 못하면 NaN)."""
+        samples = self.samples
+        if samples and ts < samples[-1][0]:          # 시계가 뒤로 가면 처음부터
+            samples.clear()
+        if v == v:
+            if not samples:
+                self.origin = ts
+                self.st = self.sv = self.stt = self.stv = 0.0
+            samples.append((ts, v))
+            self._add(ts, v, 1.0)
+        cutoff = ts - self.window
+        while samples and samples[0][0] < cutoff:
+            old_ts, old_v = samples.popleft()
+            self._add(old_ts, old_v, -1.0)
+        if not samples:
+            return math.nan
+        if samples[0][0] - self.origin > 10 * self.window:
+            self._rebase()
+        n = len(samples)
+        if n < 3 or samples[-1][0] - samples[0][0] < self.min_span:
+            return math.nan
+        var = self.stt - self.st * self.st / n
+        if var <= 0:
+            return math.nan
+        return (self.stv - self.st * self.sv / n) / var
+
+
+# DummySensor 범위(산소 4~7%, CO2 0.02~0.1%, 내부 온도 18~30도)에 맞춘 기본 규칙
+DEFAULT_RULES = (
+    threshold('oxygen_low', 'mars_base_internal_oxygen', '<', 4.5, clear=4.7,
+              level='CRITICAL', label='Internal oxygen low'),
+    threshold('co2_high', 'mars_base_internal_co2', '>', 0.09, clear=0.085,
+              label='Internal CO2 high warning'),
+    threshold('temperature_high', 'mars_base_internal_temperature', '>', 29.0, clear=28.0,
+              label='Internal high temperature'),
+    rate('oxygen_drop', 'mars_base_internal_oxygen', '<', -1.0, clear=-0.5,
+         label='Internal oxygen dropping fast'),
+)
+
+
+class Alert:
+    """발령(raised=True) 또는 해제(raised=False) 한 건."""
+
+    __slots__ = ('ts', 'rule', 'value', 'raised')
+
+    def __init__(self, ts: float, rule: AlertRule, value: float, raised: bool) -> None:
+        self.ts = ts
+        self.rule = rule
+        self.value = value
+        self.raised = raised
+
+    @property
+    def level(self) -> str:
+        return self.rule.level if self.raised else 'INFO'
+
+    @property
+    def message(self) -> str:
+        if self.raised:
+            return self.rule.describe(self.value)
+        return f'{self.rule.label} cleared: {self.value:g}{self.rule.unit}'
+
+    def to_log_line(self) -> str:
+        # danger_logs.log / mission_computer_main.log와 같은 '시각,레벨,메시지'
+        return f'{datetime.fromtimestamp(self.ts).strftime(DT_FMT)},{self.level},{self.message}'
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            'ts': self.ts,
+            'rule': self.rule.name,
+            'channel': self.rule.channel,
+            'level': self.level,
+            'state': 'raised' if self.raised else 'cleared',
+            'value': self.value,
+            'message': self.message,
+        }
+
+
+def _picker(indices: list[int]) -> itemgetter:
+    # itemgetter는 인덱스가 하나면 튜플이 아니라 값 하나를 돌려주므로 두 번 넣어 튜플로 받음
+    # (뒤쪽은 규칙 수만큼만 zip되어 버려짐). lambda가 아니라서 pickle도 됨
+    return itemgetter(*indices, *indices[:1]) if len(indices) == 1 else itemgetter(*indices)
+
+
+class AlertEngine:
+    """규칙들을 미리 평탄한 배열로 컴파일해 두고 샘플마다 한 번에 비교.
+
+    - 비교값 벡터 = [채널 값들..., (채널, 윈도우)별 분당 변화율들...]
+    - 변화율은 윈도우 안 샘플들의 최소제곱 기울기(_Slope). 샘플이 윈도우의 절반을 덮기 전에는 NaN
+    - 규칙 i는 그 벡터의 index[i]번을 본다. '<' 규칙은 부호를 뒤집어 모두 '>' 비교로 통일
+      -> map(gt, ...) 한 번으로 전체 규칙 판정(규칙 수에 비례, 채널/규칙별 분기 없음)
+    - 값이 없거나(None) 변화율을 아직 모르면(NaN) 상태를 바꾸지 않음
+    log_path가 있으면 발령/해제를 그 파일에 바로(줄마다 flush) 남긴다.
+    """
+
+    def __init__(self, rules: Iterable[AlertRule] = DEFAULT_RULES, channels: Iterable[str] | None = None,
+                 log_path: str | None = DANGER_LOG_PATH) -> None:
+        self.rules = tuple(rules)
+        if channels is None:
+            channels = dict.fromkeys(r.channel for r in self.rules)
+        self.channels = tuple(channels)
+        n = len(self.channels)
+        pos = {c: i for i, c in enumerate(self.channels)}
+        missing = [r.channel for r in self.rules if r.channel not in pos]
+        if missing:
+            raise ValueError(f'unknown channels in rules: {missing}')
+        signs = [1.0 if r.op == '>' else -1.0 for r in self.rules]
+        self._signs = signs
+        self._limits = [s * r.limit for s, r in zip(signs, self.rules)]
+        self._clears = [s * r.clear for s, r in zip(signs, self.rules)]
+        rate_keys = list(dict.fromkeys((r.channel, r.window) for r in self.rules if r.kind == 'rate'))
+        rate_pos = {k: n + i for i, k in enumerate(rate_keys)}
+        self._rate_keys = rate_keys
+        self._rate_channels = [pos[c] for c, _w in rate_keys]
+        self._slopes = [_Slope(w) for _c, w in rate_keys]
+        index = [rate_pos[(r.channel, r.window)] if r.kind == 'rate' else pos[r.channel] for r in self.rules]
+        self._pick = _picker(index) if index else None
+        self.active = [False] * len(self.rules)
+        self.log_path = log_path
+        self._log: BufferedLogWriter | None = None
+
+    def evaluate(self, ts: float, env: dict[str, float | None]) -> list[Alert]:
+        """샘플 하나를 판정하고 상태가 바뀐 규칙만 Alert로 돌려줌."""
+        if not self.rules:
+            return []
+        get = env.get
+        values = [v if isinstance(v, (int, float)) else math.nan for v in map(get, self.channels)]
+        rates = [60.0 * s.push(ts, values[c]) for s, c in zip(self._slopes, self._rate_channels)]
+
+        picked = self._pick(values + rates)
+        signed = list(map(mul, self._signs, picked))
+        over_limit = map(gt, signed, self._limits)
+        over_clear = map(gt, signed, self._clears)
+        alerts: list[Alert] = []
+        active = self.active
+        for i, (a, lim, clr, v) in enumerate(zip(active, over_limit, over_clear, picked)):
+            if v != v:                                   # NaN: 판단 보류
+                continue
+            now = clr if a else lim                      # 발령 중이면 clear 기준, 아니면 limit 기준
+            if now != a:
+                active[i] = now
+                alerts.append(Alert(ts, self.rules[i], v, now))
+        if alerts and self.log_path:
+            self._write(alerts)
+        return alerts
+
+    def active_alerts(self) -> list[str]:
+        return [r.name for r, a in zip(self.rules, self.active) if a]
+
+    def reset(self) -> None:
+        self.active = [False] * len(self.rules)
+        self._slopes = [_Slope(w) for _c, w in self._rate_keys]
+
+    def _write(self, alerts: list[Alert]) -> None:
+        w = self._log
+        if w is None or w.closed:
+            # 경보는 드물고 중요하므로 모아 두지 않고 바로 씀(fsync는 수집 루프를 막으므로 OS에 맡김)
+            w = self._log = BufferedLogWriter(self.log_path, flush_bytes=0)
+        for alert in alerts:
+            w.write_line(alert.to_log_line())
+
+    def __getstate__(self) -> dict:
+        # 다른 프로세스로 넘길 때 열린 로그 파일은 빼고, 거기서 처음 경보가 날 때 새로 엶
+        state = self.__dict__.copy()
+        state['_log'] = None
+        return state
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def _check_rate_quiet(hours: float = 6.0, intervals: tuple[float, ...] = (1.0, 5.0)) -> None:
+    # 꾸준한(추세 없는) DummySensor 스트림에서는 rate 규칙이 한 번도 발령되지 않아야 함
+    # + 실제로 산소가 분당 2%씩 떨어지면 발령되어야 함
+    from mmc1 import DummySensor
+    sensor = DummySensor()
+    channel = 'mars_base_internal_oxygen'
+    for interval in intervals:
+        engine = AlertEngine([r for r in DEFAULT_RULES if r.kind == 'rate'], log_path=None)
+        ts = 0.0
+        raised = 0
+        for _ in range(int(hours * 3600 / interval)):
+            sensor.set_env()
+            ts += interval
+            raised += sum(a.raised for a in engine.evaluate(ts, sensor.get_env(log=False)))
+        assert raised == 0, f'interval {interval}s: rate rule raised {raised} times on a steady stream'
+
+        drop_at = ts
+        for _ in range(int(600 / interval)):
+            sensor.set_env()
+            ts += interval
+            env = dict(sensor.get_env(log=False))
+            env[channel] -= 2.0 * (ts - drop_at) / 60
+            raised += sum(a.raised for a in engine.evaluate(ts, env))
+        assert raised >= 1, f'interval {interval}s: rate rule missed a 2%/min drop'
+        print(f'interval {interval:g}s: steady {hours:g}h quiet, drop detected')
+
+
+if __name__ == '__main__':
+    _check_rate_quiet()
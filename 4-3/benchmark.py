@@ -0,0 +1,272 @@
+# benchmark.py
+# MissionComputer 데이터 경로(센서 -> 히스토리 -> 평균) 벤치마크
+# 사용법: python benchmark.py [-n 20000] [--variants direct,thread,process,scheduler] [--log] [--json]
+#
+# - 간격 0(쉬지 않고 반복), 출력은 버리는 sink, 시간은 가짜 시계(샘플마다 STEP초씩 흐름)
+#   -> 실제로 몇 시간 분량을 돌린 것처럼 1/5/15분 윈도우와 추세 기록이 채워지고 비워짐
+# - 변형:
+#     direct    : sensor_tick을 그냥 반복(기준선)
+#     thread    : mmc4의 멀티스레드 구성(센서 + info + load 스레드)
+#     process   : mmc4의 멀티프로세스 구성(센서 프로세스 + 공유 메모리 버스 reader 프로세스)
+#     scheduler : mmc3의 run_scheduled(asyncio 이벤트 루프 하나)
+# - 한 사이클 = sensor_tick + 5분 평균 계산. p50/p99는 사이클 하나의 지연
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable
+
+from mission_scheduler import MissionScheduler
+from mmc1 import DummySensor
+from mmc3 import MissionComputerV2 as MissionComputer
+from sensor_bus import SensorBus
+
+VARIANTS = ('direct', 'thread', 'process', 'scheduler')
+STEP = 1.0                      # 가짜 시계가 샘플마다 흐르는 시간(초)
+BACKGROUND_INTERVAL = 0.05      # thread/scheduler 변형에서 info/load를 돌리는 간격(실제 초)
+
+
+def null_sink(text: str) -> None:
+    """출력을 버림(json.dumps 비용은 그대로 측정됨)."""
+
+
+class FakeClock:
+    """부를 때마다 step초씩 흐르는 시계. now는 마지막으로 돌려준 시각."""
+
+    def __init__(self, start: float | None = None, step: float = STEP) -> None:
+        self.now = time.time() if start is None else start
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def _percentile(values: list[int], q: float) -> float:
+    # 정렬된 값에서 nearest-rank
+    if not values:
+        return 0.0
+    i = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[i]
+
+
+def _make_computer(log_sensor: bool, log_dir: str | None) -> MissionComputer:
+    sensor = DummySensor()
+    if log_sensor and log_dir:
+        sensor.LOG_PATH = os.path.join(log_dir, 'mission_env.log')
+    mc = MissionComputer(sensor)
+    mc.sink = null_sink
+    mc.clock = FakeClock()
+    mc._last_avg_print = mc.clock.now
+    return mc
+
+
+def _instrument(mc: MissionComputer, n: int, latencies: list[int], on_done: Callable[[], None]) -> None:
+    # sensor_tick을 인스턴스 속성으로 감싸서 사이클마다 지연을 재고, n번째에서 on_done 호출
+    tick = mc.sensor_tick
+    clock = mc.clock
+    perf = time.perf_counter_ns
+
+    def timed_tick(log_sensor: bool = True) -> dict[str, float | None]:
+        if len(latencies) >= n:
+            return mc.env_values
+        t0 = perf()
+        env = tick(log_sensor)
+        mc._compute_5min_avg(clock.now)
+        latencies.append(perf() - t0)
+        if len(latencies) >= n:
+            on_done()
+        return env
+
+    mc.sensor_tick = timed_tick
+
+
+def _result(variant: str, latencies: list[int], elapsed: float, **extra: object) -> dict[str, object]:
+    lat = sorted(latencies)
+    out = {
+        'variant': variant,
+        'samples': len(lat),
+        'seconds': round(elapsed, 4),
+        'samples_per_sec': round(len(lat) / elapsed, 1) if elapsed > 0 else 0.0,
+        'p50_us': round(_percentile(lat, 50) / 1000, 2),
+        'p99_us': round(_percentile(lat, 99) / 1000, 2),
+    }
+    out.update(extra)
+    return out
+
+
+def bench_direct(n: int, log_sensor: bool = False, log_dir: str | None = None) -> dict[str, object]:
+    mc = _make_computer(log_sensor, log_dir)
+    latencies: list[int] = []
+    _instrument(mc, n, latencies, lambda: None)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        mc.sensor_tick(log_sensor)
+    elapsed = time.perf_counter() - t0
+    mc.sensor.close_log()
+    return _result('direct', latencies, elapsed)
+
+
+def bench_thread(n: int, log_sensor: bool = False, log_dir: str | None = None) -> dict[str, object]:
+    mc = _make_computer(log_sensor, log_dir)
+    stop = threading.Event()
+    latencies: list[int] = []
+    _instrument(mc, n, latencies, stop.set)
+    threads = [
+        threading.Thread(target=mc.get_sensor_data, kwargs={
+            'interval_sec': 0, 'log_sensor': log_sensor, 'stop_event': stop, 'stop_word': None}),
+        threading.Thread(target=mc.get_mission_computer_info, kwargs={
+            'interval_sec': BACKGROUND_INTERVAL, 'stop_event': stop, 'stop_word': None}),
+        threading.Thread(target=mc.get_mission_computer_load, kwargs={
+            'interval_sec': BACKGROUND_INTERVAL, 'stop_event': stop, 'stop_word': None}),
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    stop.wait()
+    elapsed = time.perf_counter() - t0
+    for t in threads:
+        t.join()
+    mc.sensor.close_log()
+    return _result('thread', latencies, elapsed)
+
+
+def _process_sensor(n: int, log_sensor: bool, log_dir: str | None, bus: SensorBus,
+                    results: multiprocessing.Queue, stop: object) -> None:
+    mc = _make_computer(log_sensor, log_dir)
+    mc.bus = bus
+    latencies: list[int] = []
+    _instrument(mc, n, latencies, stop.set)
+    t0 = time.perf_counter()
+    mc.get_sensor_data(interval_sec=0, log_sensor=log_sensor, stop_event=stop, stop_word=None)
+    elapsed = time.perf_counter() - t0
+    mc.sensor.close_log()
+    bus.close()
+    results.put((latencies, elapsed))
+
+
+def _process_bus_reader(bus: SensorBus, results: multiprocessing.Queue, stop: object) -> None:
+    # 센서 프로세스가 쓰는 동안 계속 최신 값을 읽음(seqlock 경합 포함)
+    reads = 0
+    while not stop.is_set():
+        bus.read_latest()
+        reads += 1
+    bus.close()
+    results.put(reads)
+
+
+def bench_process(n: int, log_sensor: bool = False, log_dir: str | None = None) -> dict[str, object]:
+    channels = list(DummySensor().env_values)
+    bus = SensorBus.create(channels)
+    sensor_results: multiprocessing.Queue = multiprocessing.Queue()
+    reader_results: multiprocessing.Queue = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    procs = [
+        multiprocessing.Process(target=_process_sensor, args=(n, log_sensor, log_dir, bus, sensor_results, stop)),
+        multiprocessing.Process(target=_process_bus_reader, args=(bus, reader_results, stop)),
+    ]
+    try:
+        for p in procs:
+            p.start()
+        latencies, elapsed = sensor_results.get()   # 프로세스 기동 시간은 빼고 센서 루프 시간만
+        reads = reader_results.get()
+    finally:
+        stop.set()
+        for p in procs:
+            p.join(timeout=10)
+            if p.is_alive():
+                p.terminate()
+        bus.close()
+        bus.unlink()
+    return _result('process', latencies, elapsed, bus_reads=reads)
+
+
+def bench_scheduler(n: int, log_sensor: bool = False, log_dir: str | None = None) -> dict[str, object]:
+    mc = _make_computer(log_sensor, log_dir)
+    scheduler = MissionScheduler()
+    latencies: list[int] = []
+    _instrument(mc, n, latencies, scheduler.stop)
+    t0 = time.perf_counter()
+    mc.run_scheduled(sensor_interval=0, info_interval=BACKGROUND_INTERVAL, load_interval=BACKGROUND_INTERVAL,
+                     log_sensor=log_sensor, stop_word=None, scheduler=scheduler)
+    elapsed = time.perf_counter() - t0
+    mc.sensor.close_log()
+    return _result('scheduler', latencies, elapsed)
+
+
+def measure_memory(samples: int | None = None) -> dict[str, object]:
+    """MissionComputer 하나가 samples개를 받은 뒤 들고 있는 메모리(tracemalloc 기준).
+
+    기본은 추세 기록(HISTORY_CAPACITY)이 꽉 찰 때까지. 기록은 미리 할당된 링 버퍼라서
+    채우는 도중에는 샘플당 값이 크게 나오고, 꽉 찬 뒤가 실제 보유 비용이다.
+    """
+    if samples is None:
+        samples = MissionComputer.HISTORY_CAPACITY
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        mc = _make_computer(False, None)
+        for _ in range(samples):
+            mc.sensor_tick(False)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    retained = len(mc.trend_history)
+    return {
+        'samples': samples,
+        'retained': retained,
+        'bytes': used,
+        'bytes_per_retained_sample': round(used / retained, 1) if retained else 0.0,
+    }
+
+
+BENCHMARKS: dict[str, Callable[..., dict[str, object]]] = {
+    'direct': bench_direct,
+    'thread': bench_thread,
+    'process': bench_process,
+    'scheduler': bench_scheduler,
+}
+
+
+def run(n: int = 20000, variants: tuple[str, ...] = VARIANTS, log_sensor: bool = False,
+        memory: bool = True) -> dict[str, object]:
+    with tempfile.TemporaryDirectory() as log_dir:
+        results = [BENCHMARKS[v](n, log_sensor, log_dir) for v in variants]
+    return {'results': results, 'memory': measure_memory() if memory else None}
+
+
+def _print_report(report: dict[str, object]) -> None:
+    print(f"{'variant':<10} {'samples':>8} {'samples/s':>11} {'p50(us)':>9} {'p99(us)':>9}")
+    for r in report['results']:
+        print(f"{r['variant']:<10} {r['samples']:>8} {r['samples_per_sec']:>11,.1f} "
+              f"{r['p50_us']:>9.2f} {r['p99_us']:>9.2f}")
+    mem = report['memory']
+    if mem:
+        print(f"memory: {mem['bytes']:,} bytes / {mem['retained']:,} samples "
+              f"= {mem['bytes_per_retained_sample']} bytes per retained sample")
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    ap = argparse.ArgumentParser(description='MissionComputer 데이터 경로 벤치마크')
+    ap.add_argument('-n', '--samples', type=int, default=20000)
+    ap.add_argument('--variants', default=','.join(VARIANTS),
+                    help=f"쉼표로 구분: {','.join(VARIANTS)}")
+    ap.add_argument('--log', action='store_true', help='센서 로그 파일 쓰기도 포함(임시 디렉토리)')
+    ap.add_argument('--no-memory', action='store_true', help='메모리 측정 생략')
+    ap.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = ap.parse_args()
+    chosen = tuple(v.strip() for v in args.variants.split(',') if v.strip())
+    unknown = [v for v in chosen if v not in BENCHMARKS]
+    if unknown:
+        ap.error(f'unknown variants: {unknown}')
+    report = run(args.samples, chosen, args.log, not args.no_memory)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        _print_report(report)
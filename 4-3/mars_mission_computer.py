@@ -6,14 +6,44 @@ import platform
 import random
 import threading
 import time
-from collections import deque
 from datetime import datetime
+from typing import Callable
+
+from alert_rules import AlertEngine
+from mission_control import MissionControl
+from mission_scheduler import MissionScheduler
+from proc_load import shared_load_collector
+from sensor_binlog import BinaryLogWriter
+from sensor_bus import SensorBus
+from sensor_history import SensorHistory
+from sensor_log import BufferedLogWriter
+from sensor_synth import SensorBatch, SyntheticSensor
+from sensor_window import SlidingWindow
+from settings_cache import shared_settings
+from system_facts import StaticFacts
+from telemetry_sink import encode_json
 
 
 class DummySensor:
     LOG_PATH = 'mission_env.log'
+    LOG_HEADER = (
+        'datetime,'
+        'mars_base_internal_temperature,'
+        'mars_base_external_temperature,'
+        'mars_base_internal_humidity,'
+        'mars_base_external_illuminance,'
+        'mars_base_internal_co2,'
+        'mars_base_internal_oxygen'
+    )
+    LOG_FLUSH_BYTES = 64 * 1024      # 이만큼 쌓이면 한 번에 씀
+    LOG_FLUSH_INTERVAL = 1.0         # 또는 마지막으로 쓴 지 이만큼(초) 지났으면 씀
+    LOG_FSYNC = 'never'              # 'never' | 'flush' | 'always' (sensor_log.BufferedLogWriter 참고)
+    LOG_FORMAT = 'csv'               # 'csv' | 'binary' (binary면 BINARY_LOG_PATH에 sensor_binlog 형식으로)
+    BINARY_LOG_PATH = 'mission_env.mlog'
 
     def __init__(self) -> None:
+        self._log_writer: BufferedLogWriter | BinaryLogWriter | None = None
+        self._synth: SyntheticSensor | None = None   # generate_batch용(표를 한 번만 만들려고 재사용)
         self.env_values: dict[str, float | None] = {
             'mars_base_internal_temperature': None,
             'mars_base_external_temperature': None,
@@ -31,22 +61,26 @@ class DummySensor:
         self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 4)
         self.env_values['mars_base_internal_oxygen'] = round(random.uniform(4, 7), 2)
 
+    def generate_batch(self, n: int, seed: int | None = None, model: str = 'uniform',
+                       interval: float = 1.0, start_ts: float | None = None) -> SensorBatch:
+        """부하 테스트용: set_env를 n번 부르는 대신 n개 샘플을 열 단위로 한 번에 만듦.
+
+        model='walk'면 채널끼리 상관된 랜덤 워크. 재생은 sensor_synth.replay(batch, speed=...).
+        """
+        if self._synth is None or seed is not None or self._synth.model != model:
+            self._synth = SyntheticSensor(seed=seed, model=model)
+        return self._synth.generate(n, start_ts, interval)
+
     def get_env(self, *, log: bool = True) -> dict[str, float | None]:
         if log:
             self._log_env(self.env_values)
         return self.env_values
 
     def _log_env(self, env: dict[str, float | None]) -> None:
+        if self.LOG_FORMAT == 'binary':
+            self._get_log_writer().append(time.time(), env)
+            return
         ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        header = (
-            'datetime,'
-            'mars_base_internal_temperature,'
-            'mars_base_external_temperature,'
-            'mars_base_internal_humidity,'
-            'mars_base_external_illuminance,'
-            'mars_base_internal_co2,'
-            'mars_base_internal_oxygen'
-        )
         line = (
             f"{ts},"
             f"{env['mars_base_internal_temperature']},"
@@ -56,14 +90,54 @@ class DummySensor:
             f"{env['mars_base_internal_co2']},"
             f"{env['mars_base_internal_oxygen']}"
         )
-        file_exists = os.path.exists(self.LOG_PATH)
-        with open(self.LOG_PATH, mode='a', encoding='utf-8') as log_file:
-            if not file_exists:
-                log_file.write(header + '\n')
-            log_file.write(line + '\n')
+        self._get_log_writer().write_line(line)
+
+    def _get_log_writer(self) -> BufferedLogWriter | BinaryLogWriter:
+        # 처음 쓸 때 한 번만 열어 두고 계속 사용. fork된 자식 프로세스에서는 새로 엶
+        w = self._log_writer
+        if w is None or w.closed or w.pid != os.getpid():
+            if self.LOG_FORMAT == 'binary':
+                w = self._log_writer = BinaryLogWriter(
+                    self.BINARY_LOG_PATH,
+                    self.env_values,
+                    flush_interval=self.LOG_FLUSH_INTERVAL,
+                    fsync=self.LOG_FSYNC,
+                )
+                return w
+            w = self._log_writer = BufferedLogWriter(
+                self.LOG_PATH,
+                header=self.LOG_HEADER,
+                flush_bytes=self.LOG_FLUSH_BYTES,
+                flush_interval=self.LOG_FLUSH_INTERVAL,
+                fsync=self.LOG_FSYNC,
+            )
+        return w
+
+    def flush_log(self) -> None:
+        w = self._log_writer
+        if w is not None and w.pid == os.getpid():
+            w.flush()
+
+    def close_log(self) -> None:
+        w = self._log_writer
+        if w is not None and w.pid == os.getpid():
+            w.close()
+        self._log_writer = None
+
+    def __getstate__(self) -> dict:
+        # 열린 파일/락은 pickle 불가 -> 다른 프로세스로 넘길 때는 빼고, 거기서 새로 엶
+        state = self.__dict__.copy()
+        state['_log_writer'] = None
+        state['_synth'] = None
+        return state
+
 
 
 class MissionComputer:
+    AVG_WINDOWS = (60.0, 300.0, 900.0)   # 평균을 구할 수 있는 윈도우 길이(초)
+    HISTORY_CAPACITY = 6 * 60 * 60       # 추세 분석용 기록 샘플 수(1Hz면 6시간)
+    _system_facts: StaticFacts | None = None   # 정적 시스템 정보 캐시(클래스 = 프로세스당 하나)
+
     def __init__(self, sensor: DummySensor) -> None:
         self.sensor = sensor
         self.env_values: dict[str, float | None] = {
@@ -74,11 +148,19 @@ class MissionComputer:
             'mars_base_internal_co2': None,
             'mars_base_internal_oxygen': None,
         }
-        # 5분 슬라이딩 윈도우: 각 키별 (timestamp, value) = [float, float]    
-        self._history: dict[str, deque[tuple[float, float]]] = {
-            k: deque() for k in self.env_values.keys()               # .keys() = 딕셔너리 안에  들어있는 모든 KEY 를 모아서 보여줌.
+        # 슬라이딩 윈도우: 각 키별 시각/값 배열 + 1/5/15분 윈도우의 합계·개수·최소·최대
+        self._history: dict[str, SlidingWindow] = {
+            k: SlidingWindow(self.AVG_WINDOWS) for k in self.env_values.keys()   # .keys() = 딕셔너리 안에  들어있는 모든 KEY 를 모아서 보여줌.
         }
+        # 긴 기록(추세 분석용): 채널별 array('d') 링 버퍼, 샘플당 8바이트 * (채널 수 + 1)
+        self.trend_history = SensorHistory(list(self.env_values), self.HISTORY_CAPACITY)
         self._last_avg_print: float = time.time()                    # .time() = time.time() 지금 시각을 Epoch time으로 반환, 여기서 float은 타입힌트
+        self.bus: SensorBus | None = None      # 설정하면 sensor_tick마다 최신 값/기록을 공유 메모리에 올림
+        self.alerts: AlertEngine | None = None  # 설정하면 샘플마다 경보 규칙 판정(발령/해제는 danger 로그 + sink)
+        # 출력 대상과 시계. sink는 문자열 하나를 받는 함수(telemetry_sink.open_sink로 파일/소켓/메모리 배치 출력),
+        # 벤치마크/테스트에서는 버리는 sink와 가짜 시계로 바꿔 끼움(benchmark.py 참고)
+        self.sink: Callable[[str], object] = print
+        self.clock: Callable[[], float] = time.time
 
     # -------------------
     # 공개 API
@@ -94,30 +176,21 @@ class MissionComputer:
         try:
             if stop_word:
                 if stop_event is None:                       
-                    stop_event = threading.Event()                  # Event는 스레드 간 신호를 주고받는 도구. 스레드끼리 공유하는 깃발(flag) 역할. 여기선 stop_event = 스레드 간 "멈춰야한다"는 신호깃발
+                    stop_event = MissionControl()                   # Event처럼 쓰는 제어 채널(mission_control.py). Event는 스레드 간 신호를 주고받는 도구. 스레드끼리 공유하는 깃발(flag) 역할. 여기선 stop_event = 스레드 간 "멈춰야한다"는 신호깃발
                 self._start_input_stop_thread(stop_event, stop_word)
 
             while not self._should_stop(stop_event):
                 if self._key_pressed(stop_key):
                     break
 
-                self.sensor.set_env()
-                data = self.sensor.get_env(log=log_sensor)
-                self.env_values.update(data)
-                print(json.dumps(self.env_values, ensure_ascii=False))
-
-                now = time.time()
-                self._push_history(now, self.env_values)
-                if now - self._last_avg_print >= 300:
-                    avg = self._compute_5min_avg(now)
-                    print(json.dumps({'5min_avg': avg}, ensure_ascii=False))
-                    self._last_avg_print = now
-
-                if self._should_stop(stop_event):
+                self.sensor_tick(log_sensor)
+                if self._wait_next(stop_event, 'sensor', interval_sec):
                     break
-                time.sleep(interval_sec)
         except KeyboardInterrupt:
             print('System stoped....')
+        finally:
+            self.sensor.flush_log()   # 버퍼에 남은 센서 로그를 바로 씀
+            self._flush_sink()
 
     def get_mission_computer_info(
         self,
@@ -129,20 +202,15 @@ class MissionComputer:
         try:
             if stop_word:
                 if stop_event is None:
-                    stop_event = threading.Event()
+                    stop_event = MissionControl()
                 self._start_input_stop_thread(stop_event, stop_word)
 
             while not self._should_stop(stop_event):
                 if self._key_pressed(stop_key):
                     break
-                allowed = self._load_settings().get('info')
-                info = self._collect_system_info()
-                if allowed:
-                    info = {k: v for k, v in info.items() if k in allowed}
-                print(json.dumps(info, ensure_ascii=False))
-                if self._should_stop(stop_event):
+                self.info_tick()
+                if self._wait_next(stop_event, 'info', interval_sec):
                     break
-                time.sleep(interval_sec)
         except KeyboardInterrupt:
             print('System stoped....')
 
@@ -156,23 +224,83 @@ class MissionComputer:
         try:
             if stop_word:
                 if stop_event is None:
-                    stop_event = threading.Event()
+                    stop_event = MissionControl()
                 self._start_input_stop_thread(stop_event, stop_word)
 
             while not self._should_stop(stop_event):
                 if self._key_pressed(stop_key):
                     break
-                allowed = self._load_settings().get('load')
-                load = self._collect_load_info()
-                if allowed:
-                    load = {k: v for k, v in load.items() if k in allowed}
-                print(json.dumps(load, ensure_ascii=False))
-                if self._should_stop(stop_event):
+                self.load_tick()
+                if self._wait_next(stop_event, 'load', interval_sec):
                     break
-                time.sleep(interval_sec)
         except KeyboardInterrupt:
             print('System stoped....')
 
+    def sensor_tick(self, log_sensor: bool = True) -> dict[str, float | None]:
+        """센서 한 번 읽기: 출력, 히스토리 반영, 5분마다 평균 출력(스케줄러에서도 이것만 호출)."""
+        self.sensor.set_env()
+        data = self.sensor.get_env(log=log_sensor)
+        self.env_values.update(data)
+        self.sink(encode_json(self.env_values))
+
+        now = self.clock()
+        self._push_history(now, self.env_values)
+        if self.bus is not None:
+            self.bus.publish(now, self.env_values)   # 다른 프로세스가 공유 메모리에서 바로 읽음
+        if self.alerts is not None:
+            for alert in self.alerts.evaluate(now, self.env_values):
+                self.sink(encode_json({'alert': alert.to_dict()}))
+        if now - self._last_avg_print >= 300:
+            avg = self._compute_5min_avg(now)
+            self.sink(encode_json({'5min_avg': avg}))
+            self._last_avg_print = now
+        return self.env_values
+
+    def info_tick(self) -> dict[str, str | int | float]:
+        """시스템 정보 한 번 수집해서 setting.txt 기준으로 걸러 출력."""
+        allowed = self._load_settings().get('info')
+        info = self._collect_system_info()
+        if allowed:
+            info = {k: v for k, v in info.items() if k in allowed}
+        self.sink(encode_json(info))
+        return info
+
+    def load_tick(self) -> dict[str, float | str | list[float]]:
+        """부하 한 번 수집해서 setting.txt 기준으로 걸러 출력."""
+        allowed = self._load_settings().get('load')
+        load = self._collect_load_info()
+        if allowed:
+            load = {k: v for k, v in load.items() if k in allowed}
+        self.sink(encode_json(load))
+        return load
+
+    def run_scheduled(
+        self,
+        sensor_interval: float = 5,
+        info_interval: float = 20,
+        load_interval: float = 20,
+        log_sensor: bool = True,
+        stop_word: str | None = 'q',
+        duration: float | None = None,
+        scheduler: MissionScheduler | None = None,
+    ) -> MissionScheduler:
+        """세 수집 작업을 스레드 없이 이벤트 루프 하나에서 각자 주기로 실행.
+
+        간격이 0이면 쉬지 않고 연달아 실행. scheduler를 넘기면 그 스케줄러에 작업을 추가해서 돌림
+        (밖에서 stop()하거나 clock을 바꿀 때).
+        """
+        if scheduler is None:
+            scheduler = MissionScheduler()
+        scheduler.add('sensor', sensor_interval, lambda: self.sensor_tick(log_sensor))
+        scheduler.add('info', info_interval, self.info_tick)
+        scheduler.add('load', load_interval, self.load_tick)
+        try:
+            scheduler.run(duration, stop_word)
+        finally:
+            self.sensor.flush_log()
+            self._flush_sink()
+        return scheduler
+
     # -------------------
     # 내부 유틸
     # -------------------
@@ -188,6 +316,25 @@ class MissionComputer:
                 return False
         return False
 
+    def _flush_sink(self) -> None:
+        flush = getattr(self.sink, 'flush', None)   # print에는 없음, telemetry_sink의 sink들은 있음
+        if callable(flush):
+            flush()
+
+    @staticmethod
+    def _wait_next(flag: object | None, name: str, interval_sec: float) -> bool:
+        """다음 틱까지 대기. 그 사이 정지 신호가 오면 바로 깨어나 True(자다 깨서 확인하는 폴링 없음).
+
+        MissionControl이면 일시정지/간격 변경도 반영, Event류면 wait(timeout), 없으면 그냥 sleep.
+        """
+        if isinstance(flag, MissionControl):
+            return flag.sleep(name, interval_sec)
+        wait = getattr(flag, 'wait', None)
+        if callable(wait):
+            return bool(wait(interval_sec))
+        time.sleep(interval_sec)
+        return False
+
     @staticmethod
     def _key_pressed(stop_key: str) -> bool:
         # msvcrt 없이 크로스플랫폼 유지: 입력 스레드 방식만 사용
@@ -196,6 +343,8 @@ class MissionComputer:
     @staticmethod
     def _start_input_stop_thread(stop_event: threading.Event, stop_word: str = 'q') -> threading.Thread:
         """콘솔에서 'q' 또는 'quit' 입력 시 stop_event.set()"""
+        if isinstance(stop_event, MissionControl):
+            return stop_event.start_console()   # q 외에 pause/resume/interval 명령도 받음
         def _wait_input() -> None:
             try:
                 while not stop_event.is_set():
@@ -215,42 +364,58 @@ class MissionComputer:
         return t
 
     def _push_history(self, now: float, env: dict[str, float | None]) -> None:
-        cutoff = now - 300.0
-        for k, dq in self._history.items():
+        for k, win in self._history.items():
             v = env.get(k)
             if isinstance(v, (int, float)):
-                dq.append((now, float(v)))
-            while dq and dq[0][0] < cutoff:
-                dq.popleft()
-
-    def _compute_5min_(self, now: float) -> dict[str, float | None]:
-        cutoff = now - 300.0
-        result: dict[str, float | None] = {}
-        for k, dq in self._history.items():
-            while dq and dq[0][0] < cutoff:
-                dq.popleft()
-            if dq:
-                s = sum(v for _, v in dq)
-                result[k] = round(s / len(dq), 3)
-            else:
-                result[k] = None
-        return result
+                win.push(now, float(v))
+            win.evict(now)
+        self.trend_history.push(now, env)
+
+    def get_trend(self, key: str, window_sec: float | None = 3600.0) -> dict[str, float | None]:
+        """key 항목의 최근 window_sec초 추세(평균, 중앙값, 95퍼센타일, 분당 변화율)."""
+        return self.trend_history.trend(key, window_sec)
+
+    def _compute_window_avg(self, now: float, window: float) -> dict[str, float | None]:
+        # 윈도우마다 합계/개수를 계속 들고 있어서 다시 더하지 않음
+        out: dict[str, float | None] = {}
+        for k, win in self._history.items():
+            avg = win.mean(window, now)
+            out[k] = round(avg, 3) if avg is not None else None
+        return out
+
+    def _compute_5min_avg(self, now: float) -> dict[str, float | None]:
+        return self._compute_window_avg(now, 300.0)
 
     # -------------------
     # 시스템 정보/부하 수집(표준 라이브러리만)
     # -------------------
     def _collect_system_info(self) -> dict[str, str | int | float]:
+        # 실행 중에는 바뀌지 않는 값이라 프로세스에서 처음 한 번만 조사(이후 틱은 캐시 복사만)
         try:
-            metrics = {
-                'os': platform.system(),
-                'os_version': platform.version(),
-                'cpu_model': platform.processor() or platform.machine(),
-                'cpu_core_count': os.cpu_count() or 0,
-                'memory_total_gb': self._get_total_memory_gb(),
-            }
+            return self._system_facts_cache().get()
         except Exception as exc:
-            metrics = {'error': f'system info unavailable: {exc}'}
-        return metrics
+            return {'error': f'system info unavailable: {exc}'}
+
+    def refresh_system_info(self) -> dict[str, str | int | float]:
+        """CPU/메모리 핫플러그 등으로 값이 바뀌었을 때 다시 조사해서 캐시 갱신."""
+        return self._system_facts_cache().refresh()
+
+    @classmethod
+    def _system_facts_cache(cls) -> StaticFacts:
+        facts = cls._system_facts
+        if facts is None:
+            facts = cls._system_facts = StaticFacts(cls._probe_system_info)
+        return facts
+
+    @classmethod
+    def _probe_system_info(cls) -> dict[str, str | int | float]:
+        return {
+            'os': platform.system(),
+            'os_version': platform.version(),
+            'cpu_model': platform.processor() or platform.machine(),
+            'cpu_core_count': os.cpu_count() or 0,
+            'memory_total_gb': cls._get_total_memory_gb(),
+        }
 
     @staticmethod
     def _get_total_memory_gb() -> float | str:
@@ -290,8 +455,15 @@ class MissionComputer:
         return 'unknown'
 
     @staticmethod
-    def _collect_load_info() -> dict[str, float | str]:
-        # psutil 없이: getloadavg 기반 CPU 근사치, 메모리%는 알 수 없으면 'unknown'
+    def _collect_load_info() -> dict[str, float | str | list[float]]:
+        # 리눅스: /proc에서 직전 호출 이후 실제 CPU 사용률(전체/코어별), 메모리%, 프로세스 RSS
+        collector = shared_load_collector()
+        if collector is not None:
+            try:
+                return collector.sample()
+            except OSError:
+                pass
+        # 그 밖(/proc 없음): psutil 없이 getloadavg 기반 CPU 근사치, 메모리%는 알 수 없으면 'unknown'
         load: dict[str, float | str] = {
             'cpu_usage_percent': 'unknown',
             'memory_usage_percent': 'unknown'
@@ -309,25 +481,14 @@ class MissionComputer:
     # setting.txt 필터링
     # -------------------
     @staticmethod
-    def _load_settings(path: str = 'setting.txt') -> dict[str, set[str]]:
+    def _load_settings(path: str = 'setting.txt') -> dict[str, frozenset[str]]:
         """예:
         info=os,os_version,cpu_model,cpu_core_count,memory_total_gb
         load=cpu_usage_percent,memory_usage_percent
+
+        파일이 바뀌었을 때만 다시 파싱하는 공유 캐시(settings_cache)를 씀 -> 루프마다 파일을 열지 않음
         """
-        result: dict[str, set[str]] = {}
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    s = line.strip()
-                    if not s or s.startswith('#'):
-                        continue
-                    if s.startswith('info='):
-                        result['info'] = set(x.strip() for x in s[5:].split(',') if x.strip())
-                    elif s.startswith('load='):
-                        result['load'] = set(x.strip() for x in s[5:].split(',') if x.strip())
-        except FileNotFoundError:
-            pass
-        return result
+        return shared_settings(path).get()
 
 
 # -------------------
@@ -341,7 +502,8 @@ def _run_load_process(mc: MissionComputer, stop_event: object) -> None:
     mc.get_mission_computer_load(interval_sec=20, stop_event=stop_event, stop_word=None)
 
 
-def _run_sensor_process(mc: MissionComputer, stop_event: object) -> None:
+def _run_sensor_process(mc: MissionComputer, stop_event: object, bus: SensorBus | None = None) -> None:
+    mc.bus = bus
     mc.get_sensor_data(interval_sec=5, log_sensor=True, stop_event=stop_event, stop_word=None)
 
 
@@ -355,6 +517,7 @@ if __name__ == '__main__':
 
     print("\n[MissionComputer streaming] type 'q'/'quit' or Ctrl+C to stop")
     RunComputer = MissionComputer(ds)
+    RunComputer.alerts = AlertEngine()   # 산소/CO2/온도 경보를 danger_logs.log에 바로 기록
     RunComputer.get_sensor_data(interval_sec=5, log_sensor=True, stop_word='q')
 
     print("\n[MissionComputer system info] type 'q'/'quit' or Ctrl+C to stop")
@@ -363,3 +526,6 @@ if __name__ == '__main__':
     print("\n[MissionComputer load info] type 'q'/'quit' or Ctrl+C to stop")
     RunComputer.get_mission_computer_load(interval_sec=20, stop_word='q')
 
+    print("\n[MissionComputer scheduler] sensor/info/load on one event loop, type 'q'/'quit' or Ctrl+C to stop")
+    RunComputer.run_scheduled(sensor_interval=5, info_interval=20, load_interval=20, stop_word='q')
+
@@ -0,0 +1,176 @@
+# mission_control.py
+# 수집 루프들이 같이 보는 제어 채널: 정지 / 일시정지 / 간격 변경
+# (루프마다 sleep 후 플래그를 확인하던 방식 대신, 조건 변수에서 기다리다가 신호가 오면 바로 깸)
+from __future__ import annotations
+import math
+import threading
+import time
+from typing import Any
+
+DEFAULT_NAMES = ('sensor', 'info', 'load')
+_STOPPED = 0
+_FIELDS = 1                       # 상태 배열: [정지, 일시정지 * n, 간격 * n(NaN = 루프 기본값)]
+
+
+class MissionControl:
+    """여러 루프(스레드 또는 프로세스)가 공유하는 제어 채널.
+
+    threading.Event / multiprocessing.Event 자리에 그대로 넘길 수 있다(set/is_set/wait).
+    - stop(): 모든 루프가 대기 중이어도 바로 깨어나 끝남
+    - pause(name) / resume(name): name=None이면 전부
+    - set_interval(name, sec): 대기 중인 루프도 새 간격으로 다시 계산
+    프로세스 사이에서 쓰려면 for_processes()로 만들어서 Process 인자로 넘긴다.
+    """
+
+    def __init__(self, names: tuple[str, ...] = DEFAULT_NAMES, ctx: Any = None) -> None:
+        self.names = tuple(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        size = _FIELDS + 2 * len(self.names)
+        if ctx is None:
+            self._cond = threading.Condition()
+            self._state: Any = [0.0] * size
+        else:
+            self._cond = ctx.Condition()
+            self._state = ctx.RawArray('d', size)     # 잠금은 _cond가 담당
+        for i in range(len(self.names)):
+            self._state[self._interval_slot(i)] = math.nan
+
+    @classmethod
+    def for_processes(cls, names: tuple[str, ...] = DEFAULT_NAMES, ctx: Any = None) -> MissionControl:
+        if ctx is None:
+            import multiprocessing
+            ctx = multiprocessing.get_context()
+        return cls(names, ctx)
+
+    def _pause_slot(self, i: int) -> int:
+        return _FIELDS + i
+
+    def _interval_slot(self, i: int) -> int:
+        return _FIELDS + len(self.names) + i
+
+    def _targets(self, name: str | None) -> list[int]:
+        if name is None:
+            return list(range(len(self.names)))
+        if name not in self._index:
+            raise KeyError(f'unknown loop name: {name!r} (known: {self.names})')
+        return [self._index[name]]
+
+    # -------------------
+    # 제어(어느 스레드/프로세스에서나)
+    # -------------------
+    def stop(self) -> None:
+        with self._cond:
+            self._state[_STOPPED] = 1.0
+            self._cond.notify_all()
+
+    set = stop                        # Event 호환
+
+    def pause(self, name: str | None = None) -> None:
+        with self._cond:
+            for i in self._targets(name):
+                self._state[self._pause_slot(i)] = 1.0
+            self._cond.notify_all()
+
+    def resume(self, name: str | None = None) -> None:
+        with self._cond:
+            for i in self._targets(name):
+                self._state[self._pause_slot(i)] = 0.0
+            self._cond.notify_all()
+
+    def set_interval(self, name: str, interval_sec: float | None) -> None:
+        """None이면 루프 기본 간격으로 되돌림."""
+        if interval_sec is not None and interval_sec < 0:
+            raise ValueError('interval must not be negative')
+        with self._cond:
+            for i in self._targets(name):
+                self._state[self._interval_slot(i)] = math.nan if interval_sec is None else float(interval_sec)
+            self._cond.notify_all()
+
+    # -------------------
+    # 조회
+    # -------------------
+    def is_set(self) -> bool:
+        return self._state[_STOPPED] != 0.0
+
+    def is_paused(self, name: str) -> bool:
+        i = self._index.get(name)
+        return i is not None and self._state[self._pause_slot(i)] != 0.0
+
+    def interval(self, name: str, default: float) -> float:
+        i = self._index.get(name)
+        if i is None:
+            return default
+        v = self._state[self._interval_slot(i)]
+        return default if v != v else v
+
+    # -------------------
+    # 루프 쪽에서 기다리기
+    # -------------------
+    def wait(self, timeout: float | None = None) -> bool:
+        """정지될 때까지(최대 timeout초) 기다림. Event.wait과 같음."""
+        with self._cond:
+            return self._cond.wait_for(self.is_set, timeout)
+
+    def sleep(self, name: str, interval_sec: float) -> bool:
+        """name 루프의 다음 틱까지 대기. 정지면 바로 True.
+
+        대기 중에 간격이 바뀌면 대기 시작 시점 기준으로 다시 계산하고,
+        일시정지 중이면 풀릴 때까지 기다렸다가 바로 다음 틱을 돈다.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while not self.is_set():
+                if self.is_paused(name):
+                    self._cond.wait()
+                    if not self.is_paused(name):
+                        return self.is_set()
+                    continue
+                remaining = start + self.interval(name, interval_sec) - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    # -------------------
+    # 콘솔 명령
+    # -------------------
+    def handle_command(self, text: str) -> bool:
+        """q|quit, p|pause [이름], r|resume [이름], i|interval 이름 초. 알아들었으면 True."""
+        parts = text.strip().lower().split()
+        if not parts:
+            return False
+        cmd, args = parts[0], parts[1:]
+        try:
+            if cmd in ('q', 'quit') and not args:
+                self.stop()
+            elif cmd in ('p', 'pause') and len(args) <= 1:
+                self.pause(args[0] if args else None)
+            elif cmd in ('r', 'resume') and len(args) <= 1:
+                self.resume(args[0] if args else None)
+            elif cmd in ('i', 'interval') and len(args) == 2:
+                self.set_interval(args[0], float(args[1]))
+            else:
+                return False
+        except (KeyError, ValueError) as exc:
+            print(f'[control] {exc}')
+            return False
+        return True
+
+    def start_console(self) -> threading.Thread:
+        """콘솔 입력을 읽어 handle_command로 넘기는 스레드 하나(루프마다 input 스레드를 따로 두지 않음)."""
+        def _read_commands() -> None:
+            try:
+                while not self.is_set():
+                    try:
+                        text = input()
+                    except EOFError:
+                        break
+                    if self.handle_command(text) and self.is_set():
+                        print('System stoped....')
+                        break
+            except Exception:
+                pass
+
+        t = threading.Thread(target=_read_commands, name='ControlConsoleThread', daemon=True)
+        t.start()
+        return t
@@ -0,0 +1,150 @@
+# mission_scheduler.py
+# 주기 작업(센서 수집, 시스템 정보, 부하 등)을 이벤트 루프 하나에서 돌리는 asyncio 스케줄러
+# (루프마다 스레드 + time.sleep 하던 방식을 대체)
+from __future__ import annotations
+import asyncio
+import inspect
+import math
+import threading
+import time
+from typing import Any, Callable
+
+
+class PeriodicTask:
+    """주기 작업 하나. 실행 시각은 start + k * interval로 고정(실행 시간이 쌓여 밀리지 않음).
+
+    interval=0이면 쉬지 않고 연달아 실행(다른 작업에 차례는 넘겨 줌) - 벤치마크용.
+    """
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], Any],
+                 start_delay: float = 0.0, in_thread: bool = False) -> None:
+        if interval < 0:
+            raise ValueError(f'{name}: interval must not be negative')
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self.start_delay = start_delay
+        self.in_thread = in_thread        # 오래 막히는 함수면 스레드 풀에서 실행
+        self.runs = 0
+        self.missed = 0                   # 이전 실행이 길어서 건너뛴 틱 수
+        self.errors = 0
+
+
+class MissionScheduler:
+    """등록된 PeriodicTask들을 asyncio 태스크로 돌린다.
+
+    - stop()은 대기 중인 작업을 바로 깨워서 끝냄(실행 중인 틱은 끝까지 수행)
+    - 다른 스레드(입력 대기 등)에서는 stop_threadsafe()
+    - clock은 time.monotonic 기본, 테스트/벤치마크에서는 바꿔 끼울 수 있음
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.tasks: list[PeriodicTask] = []
+        self._stop: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_requested = False      # 루프가 뜨기 전에 stop()이 불린 경우
+
+    def add(self, name: str, interval: float, fn: Callable[[], Any],
+            start_delay: float = 0.0, in_thread: bool = False) -> PeriodicTask:
+        task = PeriodicTask(name, interval, fn, start_delay, in_thread)
+        self.tasks.append(task)
+        return task
+
+    def stop(self) -> None:
+        self._stop_requested = True
+        if self._stop is not None:
+            self._stop.set()
+
+    def stop_threadsafe(self) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.stop)
+        else:
+            self._stop_requested = True
+
+    async def _sleep_until(self, deadline: float) -> bool:
+        # deadline까지 기다림. 그 사이 stop()이 불리면 바로 True
+        delay = deadline - self.clock()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(0)        # 밀려 있어도 다른 작업/stop에 차례를 넘김
+        return self._stop.is_set()
+
+    async def _run_task(self, task: PeriodicTask, start: float) -> None:
+        tick = 0
+        first = start + task.start_delay
+        while not await self._sleep_until(first + tick * task.interval):
+            try:
+                if task.in_thread:
+                    result = await asyncio.to_thread(task.fn)
+                else:
+                    result = task.fn()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                task.errors += 1
+                print(f'[scheduler] {task.name} 오류: {exc}')
+            task.runs += 1
+            tick += 1
+            if not task.interval:
+                continue
+            # 실행이 다음 틱 시각을 넘겼으면 밀린 틱은 건너뛰고 다음 정시 틱으로
+            behind = math.floor((self.clock() - first) / task.interval) + 1
+            if behind > tick:
+                task.missed += behind - tick
+                tick = behind
+
+    async def run_async(self, duration: float | None = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if self._stop_requested:
+            self._stop.set()
+        start = self.clock()
+        jobs = [asyncio.create_task(self._run_task(t, start), name=t.name) for t in self.tasks]
+        if duration is not None:
+            jobs.append(asyncio.create_task(self._stop_after(start + duration)))
+        try:
+            await asyncio.gather(*jobs)
+        finally:
+            self.stop()
+            for j in jobs:
+                j.cancel()
+            self._loop = None
+            self._stop_requested = False
+
+    async def _stop_after(self, deadline: float) -> None:
+        if not await self._sleep_until(deadline):
+            self.stop()
+
+    def run(self, duration: float | None = None, stop_word: str | None = None) -> None:
+        """블로킹 실행. stop_word가 있으면 콘솔에서 'q'/'quit' 입력 시 종료, Ctrl+C도 종료."""
+        if stop_word:
+            self._start_input_stop_thread()
+        try:
+            asyncio.run(self.run_async(duration))
+        except KeyboardInterrupt:
+            print('System stoped....')
+
+    def _start_input_stop_thread(self) -> threading.Thread:
+        def _wait_input() -> None:
+            try:
+                while True:
+                    try:
+                        text = input().strip().lower()
+                    except EOFError:
+                        break
+                    if text in ('q', 'quit'):
+                        print('System stoped....')
+                        self.stop_threadsafe()
+                        break
+            except Exception:
+                pass
+
+        t = threading.Thread(target=_wait_input, name='InputStopThread', daemon=True)
+        t.start()
+        return t
@@ -1,12 +1,31 @@
 # mmc1.py
 from __future__ import annotations
-import os, random, json
+import os, random, json, time
 from datetime import datetime
+from sensor_binlog import BinaryLogWriter  # 같은 디렉토리
+from sensor_log import BufferedLogWriter  # 같은 디렉토리
+from sensor_synth import SensorBatch, SyntheticSensor  # 같은 디렉토리
 
 class DummySensor:
     LOG_PATH = 'mission_env.log'
+    LOG_HEADER = (
+        'datetime,'
+        'mars_base_internal_temperature,'
+        'mars_base_external_temperature,'
+        'mars_base_internal_humidity,'
+        'mars_base_external_illuminance,'
+        'mars_base_internal_co2,'
+        'mars_base_internal_oxygen'
+    )
+    LOG_FLUSH_BYTES = 64 * 1024      # 이만큼 쌓이면 한 번에 씀
+    LOG_FLUSH_INTERVAL = 1.0         # 또는 마지막으로 쓴 지 이만큼(초) 지났으면 씀
+    LOG_FSYNC = 'never'              # 'never' | 'flush' | 'always' (sensor_log.BufferedLogWriter 참고)
+    LOG_FORMAT = 'csv'               # 'csv' | 'binary' (binary면 BINARY_LOG_PATH에 sensor_binlog 형식으로)
+    BINARY_LOG_PATH = 'mission_env.mlog'
 
     def __init__(self) -> None:
+        self._log_writer: BufferedLogWriter | BinaryLogWriter | None = None
+        self._synth: SyntheticSensor | None = None   # generate_batch용(표를 한 번만 만들려고 재사용)
         self.env_values: dict[str, float | None] = {
             'mars_base_internal_temperature': None,
             'mars_base_external_temperature': None,
@@ -24,22 +43,26 @@ class DummySensor:
         self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 4)
         self.env_values['mars_base_internal_oxygen'] = round(random.uniform(4, 7), 2)
 
+    def generate_batch(self, n: int, seed: int | None = None, model: str = 'uniform',
+                       interval: float = 1.0, start_ts: float | None = None) -> SensorBatch:
+        """부하 테스트용: set_env를 n번 부르는 대신 n개 샘플을 열 단위로 한 번에 만듦.
+
+        model='walk'면 채널끼리 상관된 랜덤 워크. 재생은 sensor_synth.replay(batch, speed=...).
+        """
+        if self._synth is None or seed is not None or self._synth.model != model:
+            self._synth = SyntheticSensor(seed=seed, model=model)
+        return self._synth.generate(n, start_ts, interval)
+
     def get_env(self, *, log: bool = True) -> dict[str, float | None]:
         if log:
             self._log_env(self.env_values)
         return self.env_values
 
     def _log_env(self, env: dict[str, float | None]) -> None:
+        if self.LOG_FORMAT == 'binary':
+            self._get_log_writer().append(time.time(), env)
+            return
         ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        header = (
-            'datetime,'
-            'mars_base_internal_temperature,'
-            'mars_base_external_temperature,'
-            'mars_base_internal_humidity,'
-            'mars_base_external_illuminance,'
-            'mars_base_internal_co2,'
-            'mars_base_internal_oxygen'
-        )
         line = (
             f"{ts},"
             f"{env['mars_base_internal_temperature']},"
@@ -49,11 +72,47 @@ class DummySensor:
             f"{env['mars_base_internal_co2']},"
             f"{env['mars_base_internal_oxygen']}"
         )
-        file_exists = os.path.exists(self.LOG_PATH)
-        with open(self.LOG_PATH, 'a', encoding='utf-8') as f:
-            if not file_exists:
-                f.write(header + '\n')
-            f.write(line + '\n')
+        self._get_log_writer().write_line(line)
+
+    def _get_log_writer(self) -> BufferedLogWriter | BinaryLogWriter:
+        # 처음 쓸 때 한 번만 열어 두고 계속 사용. fork된 자식 프로세스에서는 새로 엶
+        w = self._log_writer
+        if w is None or w.closed or w.pid != os.getpid():
+            if self.LOG_FORMAT == 'binary':
+                w = self._log_writer = BinaryLogWriter(
+                    self.BINARY_LOG_PATH,
+                    self.env_values,
+                    flush_interval=self.LOG_FLUSH_INTERVAL,
+                    fsync=self.LOG_FSYNC,
+                )
+                return w
+            w = self._log_writer = BufferedLogWriter(
+                self.LOG_PATH,
+                header=self.LOG_HEADER,
+                flush_bytes=self.LOG_FLUSH_BYTES,
+                flush_interval=self.LOG_FLUSH_INTERVAL,
+                fsync=self.LOG_FSYNC,
+            )
+        return w
+
+    def flush_log(self) -> None:
+        w = self._log_writer
+        if w is not None and w.pid == os.getpid():
+            w.flush()
+
+    def close_log(self) -> None:
+        w = self._log_writer
+        if w is not None and w.pid == os.getpid():
+            w.close()
+        self._log_writer = None
+
+    def __getstate__(self) -> dict:
+        # 열린 파일/락은 pickle 불가 -> 다른 프로세스로 넘길 때는 빼고, 거기서 새로 엶
+        state = self.__dict__.copy()
+        state['_log_writer'] = None
+        state['_synth'] = None
+        return state
+
 
 if __name__ == '__main__':
     ds = DummySensor()
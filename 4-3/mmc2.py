@@ -1,16 +1,33 @@
 ﻿# mmc2.py
 from __future__ import annotations
-import json, time, threading
-from collections import deque
-from typing import Iterable  # 표준 타입 표기는 유지하지만 typing의 제네릭은 안 씀
+import time, threading
+from typing import Callable, Iterable  # 표준 타입 표기는 유지하지만 typing의 제네릭은 안 씀
+from alert_rules import AlertEngine
 from mmc1 import DummySensor  # 같은 디렉토리에 있다고 가정
+from mission_control import MissionControl
+from sensor_bus import SensorBus
+from sensor_history import SensorHistory
+from sensor_window import SlidingWindow
+from telemetry_sink import encode_json
 
 class MissionComputer:
+    AVG_WINDOWS = (60.0, 300.0, 900.0)   # 평균을 구할 수 있는 윈도우 길이(초)
+    HISTORY_CAPACITY = 6 * 60 * 60       # 추세 분석용 기록 샘플 수(1Hz면 6시간)
+
     def __init__(self, sensor: DummySensor) -> None:
         self.sensor = sensor
         self.env_values: dict[str, float | None] = {k: None for k in sensor.env_values.keys()}
-        self._history: dict[str, deque[tuple[float, float]]] = {k: deque() for k in self.env_values}
+        # 키별 슬라이딩 윈도우(1/5/15분을 한 저장소로 동시에 집계)
+        self._history: dict[str, SlidingWindow] = {k: SlidingWindow(self.AVG_WINDOWS) for k in self.env_values}
+        # 긴 기록(추세 분석용): 채널별 array('d') 링 버퍼, 샘플당 8바이트 * (채널 수 + 1)
+        self.trend_history = SensorHistory(list(self.env_values), self.HISTORY_CAPACITY)
         self._last_avg_print: float = time.time()
+        self.bus: SensorBus | None = None      # 설정하면 sensor_tick마다 최신 값/기록을 공유 메모리에 올림
+        self.alerts: AlertEngine | None = None  # 설정하면 샘플마다 경보 규칙 판정(발령/해제는 danger 로그 + sink)
+        # 출력 대상과 시계. sink는 문자열 하나를 받는 함수(telemetry_sink.open_sink로 파일/소켓/메모리 배치 출력),
+        # 벤치마크/테스트에서는 버리는 sink와 가짜 시계로 바꿔 끼움(benchmark.py 참고)
+        self.sink: Callable[[str], object] = print
+        self.clock: Callable[[], float] = time.time
 
     def get_sensor_data(
         self,
@@ -22,31 +39,44 @@ class MissionComputer:
         try:
             if stop_word:
                 if stop_event is None:
-                    stop_event = threading.Event()
+                    stop_event = MissionControl()
                 self._start_input_stop_thread(stop_event, stop_word)
 
             while not self._should_stop(stop_event):
-                self.sensor.set_env()
-                data = self.sensor.get_env(log=log_sensor)
-                self.env_values.update(data)
-                print(json.dumps(self.env_values, ensure_ascii=False))
-
-                now = time.time()
-                self._push_history(now, self.env_values)
-
-                if now - self._last_avg_print >= 300:
-                    avg = self._compute_5min_avg(now)
-                    print(json.dumps({'5min_avg': avg}, ensure_ascii=False))
-                    self._last_avg_print = now
-
-                if self._should_stop(stop_event):
+                self.sensor_tick(log_sensor)
+                if self._wait_next(stop_event, 'sensor', interval_sec):
                     break
-                time.sleep(interval_sec)
         except KeyboardInterrupt:
             print('System stoped....')
+        finally:
+            self.sensor.flush_log()   # 버퍼에 남은 센서 로그를 바로 씀
+            self._flush_sink()
+
+    def sensor_tick(self, log_sensor: bool = True) -> dict[str, float | None]:
+        """센서 한 번 읽기: 출력, 히스토리 반영, 5분마다 평균 출력(스케줄러에서도 이것만 호출)."""
+        self.sensor.set_env()
+        data = self.sensor.get_env(log=log_sensor)
+        self.env_values.update(data)
+        self.sink(encode_json(self.env_values))
+
+        now = self.clock()
+        self._push_history(now, self.env_values)
+        if self.bus is not None:
+            self.bus.publish(now, self.env_values)   # 다른 프로세스가 공유 메모리에서 바로 읽음
+        if self.alerts is not None:
+            for alert in self.alerts.evaluate(now, self.env_values):
+                self.sink(encode_json({'alert': alert.to_dict()}))
+
+        if now - self._last_avg_print >= 300:
+            avg = self._compute_5min_avg(now)
+            self.sink(encode_json({'5min_avg': avg}))
+            self._last_avg_print = now
+        return self.env_values
 
     @staticmethod
     def _start_input_stop_thread(stop_event: threading.Event, stop_word: str = 'q') -> threading.Thread:
+        if isinstance(stop_event, MissionControl):
+            return stop_event.start_console()   # q 외에 pause/resume/interval 명령도 받음
         def _wait_input() -> None:
             try:
                 while not stop_event.is_set():
@@ -64,6 +94,25 @@ class MissionComputer:
         t.start()
         return t
 
+    def _flush_sink(self) -> None:
+        flush = getattr(self.sink, 'flush', None)   # print에는 없음, telemetry_sink의 sink들은 있음
+        if callable(flush):
+            flush()
+
+    @staticmethod
+    def _wait_next(flag: object | None, name: str, interval_sec: float) -> bool:
+        """다음 틱까지 대기. 그 사이 정지 신호가 오면 바로 깨어나 True(자다 깨서 확인하는 폴링 없음).
+
+        MissionControl이면 일시정지/간격 변경도 반영, Event류면 wait(timeout), 없으면 그냥 sleep.
+        """
+        if isinstance(flag, MissionControl):
+            return flag.sleep(name, interval_sec)
+        wait = getattr(flag, 'wait', None)
+        if callable(wait):
+            return bool(wait(interval_sec))
+        time.sleep(interval_sec)
+        return False
+
     @staticmethod
     def _should_stop(flag: object | None) -> bool:
         if flag is None:
@@ -72,28 +121,30 @@ class MissionComputer:
         return bool(callable(fn) and fn())
 
     def _push_history(self, now: float, env: dict[str, float | None]) -> None:
-        cutoff = now - 300.0
-        for k, dq in self._history.items():
+        for k, win in self._history.items():
             v = env.get(k)
             if isinstance(v, (int, float)):
-                dq.append((now, float(v)))
-            while dq and dq[0][0] < cutoff:
-                dq.popleft()
+                win.push(now, float(v))
+            win.evict(now)
+        self.trend_history.push(now, env)
 
-    def _compute_5min_avg(self, now: float) -> dict[str, float | None]:
-        cutoff = now - 300.0
+    def get_trend(self, key: str, window_sec: float | None = 3600.0) -> dict[str, float | None]:
+        """key 항목의 최근 window_sec초 추세(평균, 중앙값, 95퍼센타일, 분당 변화율)."""
+        return self.trend_history.trend(key, window_sec)
+
+    def _compute_window_avg(self, now: float, window: float) -> dict[str, float | None]:
+        # 윈도우마다 합계/개수를 계속 들고 있어서 다시 더하지 않음
         out: dict[str, float | None] = {}
-        for k, dq in self._history.items():
-            while dq and dq[0][0] < cutoff:
-                dq.popleft()
-            if dq:
-                s = sum(v for _, v in dq)
-                out[k] = round(s / len(dq), 3)
-            else:
-                out[k] = None
+        for k, win in self._history.items():
+            avg = win.mean(window, now)
+            out[k] = round(avg, 3) if avg is not None else None
         return out
 
+    def _compute_5min_avg(self, now: float) -> dict[str, float | None]:
+        return self._compute_window_avg(now, 300.0)
+
 if __name__ == '__main__':
     ds = DummySensor()
     mc = MissionComputer(ds)
+    mc.alerts = AlertEngine()   # 산소/CO2/온도 경보를 danger_logs.log에 바로 기록
     mc.get_sensor_data(interval_sec=5, log_sensor=True, stop_word='q')
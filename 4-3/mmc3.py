@@ -1,10 +1,18 @@
 ﻿# mmc3.py
 from __future__ import annotations
-import os, platform, json, time, threading
+import os, platform
 from mmc1 import DummySensor
 from mmc2 import MissionComputer  # 히스토리/평균 로직 재사용
+from mission_control import MissionControl
+from mission_scheduler import MissionScheduler
+from proc_load import shared_load_collector
+from settings_cache import shared_settings
+from system_facts import StaticFacts
+from telemetry_sink import encode_json
 
 class MissionComputerV2(MissionComputer):
+    _system_facts: StaticFacts | None = None   # 정적 시스템 정보 캐시(클래스 = 프로세스당 하나)
+
     def get_mission_computer_info(
         self,
         interval_sec: int = 20,
@@ -14,17 +22,12 @@ class MissionComputerV2(MissionComputer):
         try:
             if stop_word:
                 if stop_event is None:
-                    stop_event = threading.Event()
+                    stop_event = MissionControl()
                 self._start_input_stop_thread(stop_event, stop_word)
             while not self._should_stop(stop_event):
-                allowed = self._load_settings().get('info')
-                info = self._collect_system_info()
-                if allowed:
-                    info = {k: v for k, v in info.items() if k in allowed}
-                print(json.dumps(info, ensure_ascii=False))
-                if self._should_stop(stop_event):
+                self.info_tick()
+                if self._wait_next(stop_event, 'info', interval_sec):
                     break
-                time.sleep(interval_sec)
         except KeyboardInterrupt:
             print('System stoped....')
 
@@ -37,32 +40,88 @@ class MissionComputerV2(MissionComputer):
         try:
             if stop_word:
                 if stop_event is None:
-                    stop_event = threading.Event()
+                    stop_event = MissionControl()
                 self._start_input_stop_thread(stop_event, stop_word)
             while not self._should_stop(stop_event):
-                allowed = self._load_settings().get('load')
-                load = self._collect_load_info()
-                if allowed:
-                    load = {k: v for k, v in load.items() if k in allowed}
-                print(json.dumps(load, ensure_ascii=False))
-                if self._should_stop(stop_event):
+                self.load_tick()
+                if self._wait_next(stop_event, 'load', interval_sec):
                     break
-                time.sleep(interval_sec)
         except KeyboardInterrupt:
             print('System stoped....')
 
+    def info_tick(self) -> dict[str, str | int | float]:
+        """시스템 정보 한 번 수집해서 setting.txt 기준으로 걸러 출력."""
+        allowed = self._load_settings().get('info')
+        info = self._collect_system_info()
+        if allowed:
+            info = {k: v for k, v in info.items() if k in allowed}
+        self.sink(encode_json(info))
+        return info
+
+    def load_tick(self) -> dict[str, float | str | list[float]]:
+        """부하 한 번 수집해서 setting.txt 기준으로 걸러 출력."""
+        allowed = self._load_settings().get('load')
+        load = self._collect_load_info()
+        if allowed:
+            load = {k: v for k, v in load.items() if k in allowed}
+        self.sink(encode_json(load))
+        return load
+
+    def run_scheduled(
+        self,
+        sensor_interval: float = 5,
+        info_interval: float = 20,
+        load_interval: float = 20,
+        log_sensor: bool = True,
+        stop_word: str | None = 'q',
+        duration: float | None = None,
+        scheduler: MissionScheduler | None = None,
+    ) -> MissionScheduler:
+        """세 수집 작업을 스레드 없이 이벤트 루프 하나에서 각자 주기로 실행.
+
+        간격이 0이면 쉬지 않고 연달아 실행. scheduler를 넘기면 그 스케줄러에 작업을 추가해서 돌림
+        (밖에서 stop()하거나 clock을 바꿀 때).
+        """
+        if scheduler is None:
+            scheduler = MissionScheduler()
+        scheduler.add('sensor', sensor_interval, lambda: self.sensor_tick(log_sensor))
+        scheduler.add('info', info_interval, self.info_tick)
+        scheduler.add('load', load_interval, self.load_tick)
+        try:
+            scheduler.run(duration, stop_word)
+        finally:
+            self.sensor.flush_log()
+            self._flush_sink()
+        return scheduler
+
     def _collect_system_info(self) -> dict[str, str | int | float]:
+        # 실행 중에는 바뀌지 않는 값이라 프로세스에서 처음 한 번만 조사(이후 틱은 캐시 복사만)
         try:
-            return {
-                'os': platform.system(),
-                'os_version': platform.version(),
-                'cpu_model': platform.processor() or platform.machine(),
-                'cpu_core_count': os.cpu_count() or 0,
-                'memory_total_gb': self._get_total_memory_gb(),
-            }
+            return self._system_facts_cache().get()
         except Exception as exc:
             return {'error': f'system info unavailable: {exc}'}
 
+    def refresh_system_info(self) -> dict[str, str | int | float]:
+        """CPU/메모리 핫플러그 등으로 값이 바뀌었을 때 다시 조사해서 캐시 갱신."""
+        return self._system_facts_cache().refresh()
+
+    @classmethod
+    def _system_facts_cache(cls) -> StaticFacts:
+        facts = cls._system_facts
+        if facts is None:
+            facts = cls._system_facts = StaticFacts(cls._probe_system_info)
+        return facts
+
+    @classmethod
+    def _probe_system_info(cls) -> dict[str, str | int | float]:
+        return {
+            'os': platform.system(),
+            'os_version': platform.version(),
+            'cpu_model': platform.processor() or platform.machine(),
+            'cpu_core_count': os.cpu_count() or 0,
+            'memory_total_gb': cls._get_total_memory_gb(),
+        }
+
     @staticmethod
     def _get_total_memory_gb() -> float | str:
         if hasattr(os, 'sysconf'):
@@ -97,7 +156,14 @@ class MissionComputerV2(MissionComputer):
         return 'unknown'
 
     @staticmethod
-    def _collect_load_info() -> dict[str, float | str]:
+    def _collect_load_info() -> dict[str, float | str | list[float]]:
+        # 리눅스: /proc에서 직전 호출 이후 실제 CPU 사용률(전체/코어별), 메모리%, 프로세스 RSS
+        collector = shared_load_collector()
+        if collector is not None:
+            try:
+                return collector.sample()
+            except OSError:
+                pass
         load: dict[str, float | str] = {'cpu_usage_percent': 'unknown', 'memory_usage_percent': 'unknown'}
         if hasattr(os, 'getloadavg'):
             try:
@@ -109,21 +175,14 @@ class MissionComputerV2(MissionComputer):
         return load
 
     @staticmethod
-    def _load_settings(path: str = 'setting.txt') -> dict[str, set[str]]:
-        result: dict[str, set[str]] = {}
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    s = line.strip()
-                    if not s or s.startswith('#'):
-                        continue
-                    if s.startswith('info='):
-                        result['info'] = set(x.strip() for x in s[5:].split(',') if x.strip())
-                    elif s.startswith('load='):
-                        result['load'] = set(x.strip() for x in s[5:].split(',') if x.strip())
-        except FileNotFoundError:
-            pass
-        return result
+    def _load_settings(path: str = 'setting.txt') -> dict[str, frozenset[str]]:
+        """예:
+        info=os,os_version,cpu_model,cpu_core_count,memory_total_gb
+        load=cpu_usage_percent,memory_usage_percent
+
+        파일이 바뀌었을 때만 다시 파싱하는 공유 캐시(settings_cache)를 씀 -> 루프마다 파일을 열지 않음
+        """
+        return shared_settings(path).get()
 
 if __name__ == '__main__':
     ds = DummySensor()
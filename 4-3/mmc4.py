@@ -1,8 +1,10 @@
 ﻿# mmc4.py
 from __future__ import annotations
-import json, time, threading, multiprocessing
+import json, threading, multiprocessing
 from mmc1 import DummySensor
 from mmc3 import MissionComputerV2 as MissionComputer  # 모든 기능 포함 버전 사용
+from mission_control import MissionControl
+from sensor_bus import SensorBus
 
 def _run_info_process(mc: MissionComputer, stop_event: object) -> None:
     mc.get_mission_computer_info(interval_sec=20, stop_event=stop_event, stop_word=None)
@@ -10,9 +12,22 @@ def _run_info_process(mc: MissionComputer, stop_event: object) -> None:
 def _run_load_process(mc: MissionComputer, stop_event: object) -> None:
     mc.get_mission_computer_load(interval_sec=20, stop_event=stop_event, stop_word=None)
 
-def _run_sensor_process(mc: MissionComputer, stop_event: object) -> None:
+def _run_sensor_process(mc: MissionComputer, stop_event: object, bus: SensorBus | None = None) -> None:
+    mc.bus = bus   # 이 프로세스가 버스의 유일한 writer
     mc.get_sensor_data(interval_sec=5, log_sensor=True, stop_event=stop_event, stop_word=None)
 
+def _run_bus_reader_process(bus: SensorBus, stop_event: object, interval_sec: float = 5) -> None:
+    # 센서 프로세스가 올린 값을 공유 메모리에서 바로 읽음(pickle/Queue 없음)
+    while not stop_event.is_set():
+        latest = bus.read_latest()
+        if latest is not None:
+            ts, env = latest
+            history = bus.read_history()
+            print(json.dumps({'bus_latest': env, 'bus_history_len': len(history)}, ensure_ascii=False))
+        if MissionComputer._wait_next(stop_event, 'bus', interval_sec):
+            break
+    bus.close()
+
 if __name__ == '__main__':
     multiprocessing.freeze_support()
 
@@ -30,75 +45,57 @@ if __name__ == '__main__':
     mc.get_mission_computer_load(interval_sec=20, stop_word='q')
 
     # 2) 멀티스레드 데모
-    print("\n[Multi-thread demo] type 'q'/'quit' to stop all threads")
-    thr_stop = threading.Event()
+    print("\n[Multi-thread demo] 'q' stop | 'p [sensor|info|load]' pause | 'r [...]' resume | 'i <name> <sec>' interval")
+    # 세 스레드가 같이 보는 제어 채널 하나 + 입력 스레드 하나(스레드마다 input()을 따로 두지 않음)
+    thr_ctl = MissionControl()
     mc_thr = MissionComputer(DummySensor())
     threads = [
-        threading.Thread(target=mc_thr.get_sensor_data, kwargs={'interval_sec': 5, 'log_sensor': False, 'stop_event': thr_stop, 'stop_word': 'q'}),
-        threading.Thread(target=mc_thr.get_mission_computer_info, kwargs={'interval_sec': 20, 'stop_event': thr_stop, 'stop_word': 'q'}),
-        threading.Thread(target=mc_thr.get_mission_computer_load, kwargs={'interval_sec': 20, 'stop_event': thr_stop, 'stop_word': 'q'}),
+        threading.Thread(target=mc_thr.get_sensor_data, kwargs={'interval_sec': 5, 'log_sensor': False, 'stop_event': thr_ctl, 'stop_word': None}),
+        threading.Thread(target=mc_thr.get_mission_computer_info, kwargs={'interval_sec': 20, 'stop_event': thr_ctl, 'stop_word': None}),
+        threading.Thread(target=mc_thr.get_mission_computer_load, kwargs={'interval_sec': 20, 'stop_event': thr_ctl, 'stop_word': None}),
     ]
-    # 입력 스레드 (공유) — 'q'/'quit'으로 모두 종료
-    def _input_stop_threads() -> None:
-        try:
-            while any(t.is_alive() for t in threads):
-                try:
-                    text = input().strip().lower()
-                except EOFError:
-                    break
-                if text in ('q', 'quit'):
-                    print('System stoped....')
-                    thr_stop.set()
-                    break
-        except Exception:
-            pass
     for t in threads: t.start()
-    kb_t = threading.Thread(target=_input_stop_threads, daemon=True); kb_t.start()
+    thr_ctl.start_console()
     try:
-        while any(t.is_alive() for t in threads):
-            time.sleep(1)
+        thr_ctl.wait()     # 정지 신호가 오면 바로 깨어남(1초마다 확인하지 않음)
     except KeyboardInterrupt:
-        print('System stoped....'); thr_stop.set()
+        print('System stoped....')
     finally:
-        thr_stop.set()
+        thr_ctl.stop()
         for t in threads: t.join()
 
     # 3) 멀티프로세스 데모
-    print("\n[Multi-process demo] Ctrl+C or type 'q'/'quit' to stop all processes")
+    print("\n[Multi-process demo] 'q' stop | 'p [name]' pause | 'r [name]' resume | 'i <name> <sec>' interval (name: sensor/info/load/bus)")
     m1, m2, m3 = MissionComputer(DummySensor()), MissionComputer(DummySensor()), MissionComputer(DummySensor())
-    pevents = [multiprocessing.Event() for _ in range(3)]
+    # 센서 프로세스가 쓰고 다른 프로세스가 읽는 공유 메모리 버스(만든 쪽인 여기서 마지막에 unlink)
+    bus = SensorBus.create(list(m3.env_values))
+    # 네 프로세스가 공유하는 제어 채널 하나(정지/일시정지/간격 변경)
+    proc_ctl = MissionControl.for_processes(('sensor', 'info', 'load', 'bus'))
     procs = [
-        multiprocessing.Process(target=_run_info_process, args=(m1, pevents[0])),
-        multiprocessing.Process(target=_run_load_process, args=(m2, pevents[1])),
-        multiprocessing.Process(target=_run_sensor_process, args=(m3, pevents[2])),
+        multiprocessing.Process(target=_run_info_process, args=(m1, proc_ctl)),
+        multiprocessing.Process(target=_run_load_process, args=(m2, proc_ctl)),
+        multiprocessing.Process(target=_run_sensor_process, args=(m3, proc_ctl, bus)),
+        multiprocessing.Process(target=_run_bus_reader_process, args=(bus, proc_ctl)),
     ]
-    def _input_stop_processes() -> None:
-        try:
-            while any(p.is_alive() for p in procs):
-                try:
-                    text = input().strip().lower()
-                except EOFError:
-                    break
-                if text in ('q', 'quit'):
-                    print('System stoped....')
-                    for e in pevents: e.set()
-                    break
-        except Exception:
-            pass
     for p in procs: p.start()
-    kb_p = threading.Thread(target=_input_stop_processes, daemon=True); kb_p.start()
+    proc_ctl.start_console()
     try:
-        while any(p.is_alive() for p in procs):
-            time.sleep(1)
+        proc_ctl.wait()
     except KeyboardInterrupt:
         print('System stoped....')
-        for e in pevents: e.set()
     finally:
-        for e in pevents: e.set()
+        proc_ctl.stop()
         for p in procs:
             p.join(timeout=5)
             if p.is_alive():
                 p.terminate()
+        bus.close()
+        bus.unlink()
+
+    # 4) asyncio 스케줄러 데모: 스레드/프로세스 없이 이벤트 루프 하나에서 세 작업을 각자 주기로 실행
+    print("\n[Scheduler demo] type 'q'/'quit' or Ctrl+C to stop")
+    mc_sched = MissionComputer(DummySensor())
+    mc_sched.run_scheduled(sensor_interval=5, info_interval=20, load_interval=20, stop_word='q')
 
 
 
@@ -0,0 +1,71 @@
+# mmc5.py
+from __future__ import annotations
+from typing import Any
+from mmc1 import DummySensor
+from mmc3 import MissionComputerV2 as MissionComputer  # info/load/스케줄러 재사용
+from sensor_registry import DEFAULT_HISTORY, SensorEntry, SensorRegistry
+from telemetry_sink import encode_json
+
+class MultiSensorComputer(MissionComputer):
+    """거주 모듈 여러 개의 센서를 한 프로세스에서 모아 보는 MissionComputer.
+
+    sensor 자리에는 registry를 둬서 부모의 get_sensor_data/run_scheduled가 그대로 동작한다.
+    센서별 기록은 registry가 갖고, 부모의 윈도우/추세 기록(_history, trend_history)에는 틱마다
+    채널별 전체 평균을 넣는다(채널 목록은 생성할 때 등록된 센서 기준).
+    출력은 틱마다 채널별 요약 한 줄(EMIT_READINGS=True면 센서마다 한 줄씩 추가)과 5분마다 전체 평균.
+    """
+    EMIT_READINGS = False
+
+    def __init__(self, sensors: dict[str, Any] | None = None, workers: int = 4,
+                 history_capacity: int = DEFAULT_HISTORY) -> None:
+        self.registry = SensorRegistry(workers, history_capacity)
+        for sensor_id, sensor in (sensors or {}).items():
+            self.add_sensor(sensor_id, sensor)
+        super().__init__(self.registry)
+        self.env_values: dict[str, dict[str, float | None]] = {}   # sensor_id -> 최신 값
+
+    def add_sensor(self, sensor_id: str, sensor: Any, channels: list[str] | None = None,
+                   log: bool = False) -> SensorEntry:
+        return self.registry.register(sensor_id, sensor, channels, log)
+
+    def remove_sensor(self, sensor_id: str) -> None:
+        self.registry.unregister(sensor_id)
+
+    def sensor_tick(self, log_sensor: bool = True) -> dict[str, dict[str, float | None]]:
+        """모든 센서를 한 번 읽어 센서별 기록에 넣고 요약 출력. 로그 여부는 add_sensor(log=)에서 정함."""
+        now = self.clock()
+        readings = self.registry.poll(now)
+        self.env_values = readings
+        if self.EMIT_READINGS:
+            for sensor_id, env in readings.items():
+                self.sink(encode_json({'sensor': sensor_id, 'values': env}))
+        summary = self.registry.summary()
+        self.sink(encode_json({'sensors': len(readings), 'summary': summary}))
+        self._push_history(now, {k: s['mean'] for k, s in summary.items()})
+
+        if now - self._last_avg_print >= 300:
+            self.sink(encode_json({'5min_avg': self._compute_5min_avg(now)}))
+            self._last_avg_print = now
+        return readings
+
+    def get_trend(self, key: str, window_sec: float | None = 3600.0) -> dict[str, float | None]:
+        """key = '센서id/채널'이면 그 센서 기록, '채널'만 주면 전체 평균 기록에서 최근 window_sec초 추세."""
+        sensor_id, _, channel = key.rpartition('/')
+        if not sensor_id:
+            return super().get_trend(channel, window_sec)
+        return self.registry.history(sensor_id).trend(channel, window_sec)
+
+    def close(self) -> None:
+        self.registry.close()
+
+
+if __name__ == '__main__':
+    # 거주 모듈 200개를 1초마다 읽음(센서마다 스레드 없이 작업 스레드 4개)
+    modules = {f'module-{i:03d}': DummySensor() for i in range(200)}
+    msc = MultiSensorComputer(modules, workers=4)
+    print("\n[Multi-sensor stream] type 'q'/'quit' or Ctrl+C to stop")
+    try:
+        msc.run_scheduled(sensor_interval=1, info_interval=20, load_interval=20, log_sensor=False, stop_word='q')
+        print(encode_json({'module-000 oxygen trend': msc.get_trend('module-000/mars_base_internal_oxygen', 60)}))
+    finally:
+        msc.close()
@@ -0,0 +1,125 @@
+# proc_load.py
+# 리눅스 /proc에서 CPU/메모리/프로세스 RSS를 읽는 부하 수집기
+# 파일은 한 번만 열어 두고 os.pread로 처음부터 다시 읽음(샘플마다 open/close 없음)
+from __future__ import annotations
+import os
+import threading
+
+PROC_ROOT = '/proc'
+READ_SIZE = 64 * 1024
+
+
+def _pread_all(fd: int) -> bytes:
+    # /proc 파일은 크기가 0으로 보이므로 다 읽힐 때까지 늘려 가며 읽음
+    size = READ_SIZE
+    while True:
+        data = os.pread(fd, size, 0)
+        if len(data) < size:
+            return data
+        size *= 2
+
+
+def _kb_field(data: bytes, key: bytes) -> int | None:
+    # 'MemTotal:       16318480 kB' 같은 줄에서 숫자(kB)만
+    i = data.find(key)
+    if i < 0:
+        return None
+    j = data.find(b'\n', i)
+    parts = data[i + len(key):j if j >= 0 else None].split()
+    return int(parts[0]) if parts else None
+
+
+def _cpu_times(data: bytes) -> list[tuple[int, int]]:
+    # /proc/stat의 'cpu', 'cpu0', 'cpu1', ... 줄 -> (전체, 유휴) jiffies
+    # 전체 = user..steal (guest는 user에 이미 포함), 유휴 = idle + iowait
+    out = []
+    for line in data.split(b'\n'):
+        if not line.startswith(b'cpu'):
+            break
+        f = line.split()
+        v = [int(x) for x in f[1:9]]
+        out.append((sum(v), v[3] + v[4]))
+    return out
+
+
+class ProcLoadCollector:
+    """/proc 기반 부하 수집기. sample()은 직전 sample() 이후의 CPU 사용률을 준다(첫 호출은 부팅 이후 평균).
+
+    - cpu_usage_percent: 전체 CPU 사용률
+    - cpu_per_core_percent: 코어별 사용률 리스트
+    - memory_usage_percent: (MemTotal - MemAvailable) / MemTotal
+    - process_rss_mb: 이 프로세스의 RSS
+    fork된 자식에서는 /proc/self가 부모를 가리키던 핸들이므로 shared_load_collector()가 새로 만든다.
+    """
+
+    def __init__(self, proc_root: str = PROC_ROOT) -> None:
+        self.pid = os.getpid()
+        self._fds: list[int] = []
+        try:
+            self._stat = self._open(os.path.join(proc_root, 'stat'))
+            self._meminfo = self._open(os.path.join(proc_root, 'meminfo'))
+            self._status = self._open(os.path.join(proc_root, 'self', 'status'))
+        except OSError:
+            self.close()
+            raise
+        self._lock = threading.Lock()
+        self._prev: list[tuple[int, int]] | None = None
+
+    def _open(self, path: str) -> int:
+        fd = os.open(path, os.O_RDONLY)
+        self._fds.append(fd)
+        return fd
+
+    @staticmethod
+    def available(proc_root: str = PROC_ROOT) -> bool:
+        return hasattr(os, 'pread') and os.path.exists(os.path.join(proc_root, 'stat'))
+
+    def sample(self) -> dict[str, float | list[float] | str]:
+        with self._lock:
+            cur = _cpu_times(_pread_all(self._stat))
+            prev, self._prev = self._prev or [(0, 0)] * len(cur), cur
+        usage = []
+        for (total, idle), (p_total, p_idle) in zip(cur, prev):
+            d_total = total - p_total
+            usage.append(round((d_total - (idle - p_idle)) / d_total * 100, 2) if d_total > 0 else 0.0)
+
+        mem = _pread_all(self._meminfo)
+        mem_total = _kb_field(mem, b'MemTotal:')
+        mem_avail = _kb_field(mem, b'MemAvailable:')
+        rss = _kb_field(_pread_all(self._status), b'VmRSS:')
+        return {
+            'cpu_usage_percent': usage[0] if usage else 'unknown',
+            'cpu_per_core_percent': usage[1:],
+            'memory_usage_percent': (round((mem_total - mem_avail) / mem_total * 100, 2)
+                                     if mem_total and mem_avail is not None else 'unknown'),
+            'process_rss_mb': round(rss / 1024, 2) if rss is not None else 'unknown',
+        }
+
+    def close(self) -> None:
+        for fd in self._fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+
+
+_shared: ProcLoadCollector | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_load_collector() -> ProcLoadCollector | None:
+    """프로세스마다 하나씩 쓰는 수집기. /proc이 없으면(리눅스가 아니면) None."""
+    global _shared
+    c = _shared
+    if c is not None and c.pid == os.getpid():
+        return c
+    if not ProcLoadCollector.available():
+        return None
+    with _shared_lock:
+        if _shared is None or _shared.pid != os.getpid():
+            try:
+                _shared = ProcLoadCollector()
+            except OSError:
+                return None
+        return _shared
@@ -0,0 +1,408 @@
+# sensor_binlog.py
+# mission_env.log(CSV) 대신 쓸 수 있는 고정 폭 바이너리 센서 로그
+# 레코드 = ts int64(밀리초) + 채널마다 float32. 텍스트 변환/파싱 없이 mmap으로 바로 잘라 읽음
+#
+# 파일 구성(리틀엔디언):
+#   헤더[magic 8 | version u16 | 채널 수 u16 | 블록당 레코드 수 u32] | 채널 이름(UTF-8, '\n' 구분, NAMES_SIZE 바이트)
+#   | 블록 0[블록 헤더 | 레코드 * block_records] | 블록 1[...] | ...
+# 블록 헤더 = [magic 4 | 레코드 수 u32 | flags u32 | 최소 ts i64 | 최대 ts i64]
+# 시간 범위 조회는 블록 헤더로 겹치는 블록만 고르고, 블록 안에서는 bisect.
+# 레코드는 뒤에만 붙이고(append-only), 블록 헤더만 제자리에서 갱신한다.
+from __future__ import annotations
+import atexit
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Iterable
+
+from sensor_synth import SensorBatch
+
+MAGIC = b'MCBLOG01'
+VERSION = 1
+FILE_HEADER = struct.Struct('<8sHHI')
+NAMES_SIZE = 1024
+DATA_OFFSET = FILE_HEADER.size + NAMES_SIZE
+BLOCK_MAGIC = b'BLK0'
+BLOCK = struct.Struct('<4sIIxxxxqq')
+FLAG_SORTED = 1                   # 블록 안 ts가 오름차순(bisect 가능)
+TS_SCALE = 1000                   # ts 단위: 밀리초
+DEFAULT_BLOCK_RECORDS = 4096
+FSYNC_POLICIES = ('never', 'flush', 'always')
+_SWAP = sys.byteorder != 'little'
+
+
+class _Layout:
+    """레코드 번호 <-> 파일 위치 계산(쓰기/읽기 공용)."""
+
+    def __init__(self, n_channels: int, block_records: int) -> None:
+        self.n = n_channels
+        # 8바이트 배수로 맞춰서 array('q')/array('f')로 한 번에 읽고 step 슬라이스로 열을 뽑을 수 있게 함
+        raw = 8 + 4 * n_channels
+        self.pad = -raw % 8
+        self.record = struct.Struct(f'<q{n_channels}f{self.pad}x')
+        self.block_records = block_records
+        self.block_size = BLOCK.size + block_records * self.record.size
+
+    def block_offset(self, b: int) -> int:
+        return DATA_OFFSET + b * self.block_size
+
+    def record_offset(self, i: int) -> int:
+        b, k = divmod(i, self.block_records)
+        return self.block_offset(b) + BLOCK.size + k * self.record.size
+
+    def end_offset(self, count: int) -> int:
+        # 레코드 count개를 쓴 뒤의 파일 끝
+        if count == 0:
+            return DATA_OFFSET
+        return self.record_offset(count - 1) + self.record.size
+
+    def count_for_size(self, size: int) -> int:
+        # 파일 크기로 본 완전한 레코드 수(쓰다 만 꼬리는 버림)
+        if size <= DATA_OFFSET:
+            return 0
+        blocks, rem = divmod(size - DATA_OFFSET, self.block_size)
+        tail = max(0, rem - BLOCK.size) // self.record.size
+        return blocks * self.block_records + tail
+
+    def decode(self, data: bytes) -> tuple[array, list[array]]:
+        # 레코드 여러 개 -> (ts 열, 채널별 열). 파이썬 루프 없이 step 슬라이스로 분리
+        ts = array('q')
+        ts.frombytes(data)
+        vals = array('f')
+        vals.frombytes(data)
+        if _SWAP:
+            ts.byteswap()
+            vals.byteswap()
+        q_step = self.record.size // 8
+        f_step = self.record.size // 4
+        return ts[::q_step], [vals[2 + c::f_step] for c in range(self.n)]
+
+
+def _read_header(data: bytes, path: str) -> tuple[tuple[str, ...], int]:
+    magic, version, n, block_records = FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path}: 바이너리 센서 로그가 아닙니다.')
+    names = data[FILE_HEADER.size:DATA_OFFSET].rstrip(b'\0').decode('utf-8')
+    channels = tuple(names.split('\n')) if names else ()
+    if len(channels) != n or block_records <= 0:
+        raise ValueError(f'{path}: 헤더가 손상되었습니다.')
+    return channels, block_records
+
+
+def _pwrite_all(fd: int, data: bytes | memoryview, offset: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+class BinaryLogWriter:
+    """바이너리 센서 로그 writer. BufferedLogWriter와 같은 방식으로 모았다가 한 번에 씀.
+
+    - flush_records개 이상 쌓이거나, 마지막 flush 후 flush_interval초가 지나면 flush
+    - 기존 파일이면 채널 구성이 같아야 하고, 쓰다 만 꼬리 레코드는 잘라내고 이어 씀
+    - 값이 None이면 NaN으로 저장
+    """
+
+    def __init__(
+        self,
+        path: str,
+        channels: Iterable[str],
+        block_records: int = DEFAULT_BLOCK_RECORDS,
+        flush_records: int = 256,
+        flush_interval: float = 1.0,
+        fsync: str = 'never',
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'fsync must be one of {FSYNC_POLICIES}: {fsync!r}')
+        channels = tuple(channels)
+        names = '\n'.join(channels).encode('utf-8')
+        if len(names) > NAMES_SIZE:
+            raise ValueError('channel names are too long')
+        if block_records <= 0:
+            raise ValueError('block_records must be positive')
+        self.path = path
+        self.channels = channels
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)   # O_APPEND 없이 pwrite로 위치 지정
+        try:
+            size = os.fstat(self._fd).st_size
+            if size == 0:
+                header = FILE_HEADER.pack(MAGIC, VERSION, len(channels), block_records)
+                _pwrite_all(self._fd, header + names.ljust(NAMES_SIZE, b'\0'), 0)
+            else:
+                found, block_records = _read_header(os.pread(self._fd, DATA_OFFSET, 0), path)
+                if found != channels:
+                    raise ValueError(f'{path}: 채널 구성이 다릅니다: {found}')
+            self._layout = _Layout(len(channels), block_records)
+            self.count = self._layout.count_for_size(size)
+            self._end = self._layout.end_offset(self.count)
+            if size > self._end:
+                os.ftruncate(self._fd, self._end)
+            self._load_last_block()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._closed = False
+        self._buf = bytearray()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+
+    def _load_last_block(self) -> None:
+        # 마지막 블록 상태(최소/최대 ts, 정렬 여부)를 레코드에서 다시 계산 -> 헤더가 늦게 갱신됐어도 복구
+        self._block = -1
+        self._min = self._max = self._last_ts = 0
+        self._sorted = True
+        if self.count == 0:
+            return
+        layout = self._layout
+        b = (self.count - 1) // layout.block_records
+        first = b * layout.block_records
+        start = layout.record_offset(first)
+        ts, _cols = layout.decode(os.pread(self._fd, self._end - start, start))
+        self._block = b
+        self._min, self._max, self._last_ts = min(ts), max(ts), ts[-1]
+        self._sorted = all(x <= y for x, y in zip(ts, ts[1:]))
+        _pwrite_all(self._fd, self._block_header(), layout.block_offset(b))
+
+    def _block_header(self) -> bytes:
+        n = self.count - self._block * self._layout.block_records
+        return BLOCK.pack(BLOCK_MAGIC, n, FLAG_SORTED if self._sorted else 0, self._min, self._max)
+
+    def _store_block_header(self) -> None:
+        # 블록 헤더가 아직 버퍼에 있으면 버퍼를 고치고, 이미 파일에 있으면 제자리에 씀
+        offset = self._layout.block_offset(self._block)
+        header = self._block_header()
+        if offset >= self._end:
+            pos = offset - self._end
+            self._buf[pos:pos + BLOCK.size] = header
+        else:
+            _pwrite_all(self._fd, header, offset)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def append(self, ts: float, env: dict[str, float | None]) -> None:
+        """ts는 epoch 초. env에 없는 채널도 NaN."""
+        ts_ms = round(ts * TS_SCALE)
+        record = self._layout.record.pack(ts_ms, *(float(v) if isinstance(v, (int, float)) else math.nan
+                                                   for v in map(env.get, self.channels)))
+        with self._lock:
+            if self._closed:
+                raise ValueError(f'{self.path}: writer가 이미 닫혔습니다.')
+            block_records = self._layout.block_records
+            if self.count % block_records == 0:         # 새 블록 시작: 헤더 자리부터
+                if self._block >= 0:
+                    self._store_block_header()
+                self._block = self.count // block_records
+                self._min = self._max = ts_ms
+                self._sorted = True
+                self._buf += BLOCK.pack(BLOCK_MAGIC, 0, FLAG_SORTED, ts_ms, ts_ms)
+            else:
+                if ts_ms < self._last_ts:
+                    self._sorted = False
+                self._min = min(self._min, ts_ms)
+                self._max = max(self._max, ts_ms)
+            self._last_ts = ts_ms
+            self._buf += record
+            self.count += 1
+            self._pending += 1
+            if (self.fsync == 'always' or self._pending >= self.flush_records
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._buf:
+            self._store_block_header()
+            _pwrite_all(self._fd, self._buf, self._end)
+            self._end += len(self._buf)
+            self._buf.clear()
+            self._pending = 0
+            if self.fsync != 'never':
+                os.fsync(self._fd)
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                if os.getpid() == self.pid:
+                    self._flush_locked()
+            finally:
+                self._closed = True
+                os.close(self._fd)
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> BinaryLogWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class BinaryLogReader:
+    """바이너리 센서 로그를 mmap으로 열어 읽기. 결과는 SensorBatch(ts는 초, 값은 float32를 넓힌 값).
+
+    쓰는 중인 파일도 읽을 수 있다. 늘어난 부분은 refresh() 후에 보임.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._f = open(path, 'rb')
+        try:
+            self.channels, block_records = _read_header(self._f.read(DATA_OFFSET), path)
+        except BaseException:
+            self._f.close()
+            raise
+        self._layout = _Layout(len(self.channels), block_records)
+        self._mm: mmap.mmap | None = None
+        self._size = -1
+        self.count = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        size = os.fstat(self._f.fileno()).st_size
+        if size != self._size:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._size = size
+            self.count = self._layout.count_for_size(size)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _read(self, first: int, last: int) -> tuple[array, list[array]]:
+        # 레코드 [first, last) - 같은 블록 안이어야 함
+        start = self._layout.record_offset(first)
+        return self._layout.decode(self._mm[start:start + (last - first) * self._layout.record.size])
+
+    def blocks(self) -> list[tuple[int, int, bool, int, int]]:
+        """블록마다 (첫 레코드 번호, 레코드 수, 정렬 여부, 최소 ts, 최대 ts) - ts는 밀리초."""
+        layout = self._layout
+        out = []
+        for first in range(0, self.count, layout.block_records):
+            n = min(layout.block_records, self.count - first)
+            _magic, _n, flags, lo, hi = BLOCK.unpack_from(self._mm, layout.block_offset(first // layout.block_records))
+            out.append((first, n, bool(flags & FLAG_SORTED), lo, hi))
+        return out
+
+    def range(self, start: float | None = None, end: float | None = None) -> SensorBatch:
+        """start <= ts < end(epoch 초)인 레코드. 둘 다 None이면 전부."""
+        lo = -math.inf if start is None else round(start * TS_SCALE)
+        hi = math.inf if end is None else round(end * TS_SCALE)
+        ts_parts: list[array] = []
+        col_parts: list[list[array]] = []
+        blocks = self.blocks()
+        for i, (first, n, is_sorted, b_min, b_max) in enumerate(blocks):
+            last_block = i == len(blocks) - 1     # 쓰는 중일 수 있어 헤더 값을 믿지 않음
+            if not last_block and (b_max < lo or b_min >= hi):
+                continue
+            ts, cols = self._read(first, first + n)
+            if is_sorted and not last_block:
+                a, b = bisect_left(ts, lo), bisect_left(ts, hi)
+                if a == b:
+                    continue
+                ts, cols = ts[a:b], [c[a:b] for c in cols]
+            else:
+                keep = [lo <= t < hi for t in ts]
+                if not all(keep):
+                    ts = array('q', compress(ts, keep))
+                    cols = [array('f', compress(c, keep)) for c in cols]
+            if ts:
+                ts_parts.append(ts)
+                col_parts.append(cols)
+        return self._batch(ts_parts, col_parts)
+
+    def tail(self, n: int) -> SensorBatch:
+        """마지막 n개 레코드(파일에 쓴 순서)."""
+        layout = self._layout
+        ts_parts: list[array] = []
+        col_parts: list[list[array]] = []
+        i = self.count
+        stop = max(0, self.count - n)
+        while i > stop:
+            first = max(stop, (i - 1) // layout.block_records * layout.block_records)
+            ts, cols = self._read(first, i)
+            ts_parts.insert(0, ts)
+            col_parts.insert(0, cols)
+            i = first
+        return self._batch(ts_parts, col_parts)
+
+    def _batch(self, ts_parts: list[array], col_parts: list[list[array]]) -> SensorBatch:
+        ts = array('d')
+        for part in ts_parts:
+            ts.extend(map(TS_SCALE.__rtruediv__, part))
+        columns = {}
+        for c, name in enumerate(self.channels):
+            col = array('d')
+            for cols in col_parts:
+                col.fromlist(cols[c].tolist())   # float32 -> float64
+            columns[name] = col
+        return SensorBatch(ts, columns)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self) -> BinaryLogReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def convert_csv(csv_path: str, bin_path: str, block_records: int = DEFAULT_BLOCK_RECORDS) -> int:
+    """기존 mission_env.log(CSV)를 바이너리 로그로 옮김. 옮긴 레코드 수를 돌려준다."""
+    from datetime import datetime
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        header = f.readline().strip()
+        # 예전 헤더는 'datetime' 뒤 쉼표가 빠져 있어서 채널 이름만 따로 찾음
+        channels = [h for h in header.replace('datetime', '', 1).split(',') if h]
+        count = 0
+        with BinaryLogWriter(bin_path, channels, block_records=block_records,
+                             flush_records=block_records) as w:
+            for line in f:
+                parts = line.rstrip('\n').split(',')
+                try:
+                    ts = datetime.strptime(parts[0], '%Y-%m-%d %H:%M:%S').timestamp()
+                except ValueError:
+                    continue
+                env = {}
+                for name, text in zip(channels, parts[1:]):
+                    try:
+                        env[name] = float(text)
+                    except ValueError:
+                        env[name] = None     # 'None' 등
+                w.append(ts, env)
+                count += 1
+    return count
+
+
+if __name__ == '__main__':
+    # 사용법: python sensor_binlog.py mission_env.log mission_env.mlog
+    src, dst = sys.argv[1:3]
+    n = convert_csv(src, dst)
+    print(f'{n}건 변환: {os.path.getsize(src):,} bytes -> {os.path.getsize(dst):,} bytes')
@@ -0,0 +1,168 @@
+# sensor_bus.py
+# 센서 프로세스가 최신 값과 최근 기록을 공유 메모리에 올리고, 다른 프로세스들이 바로 읽는 버스
+# (pickle/Queue 없이 읽기 = 공유 메모리에서 바이트 복사 + struct 해석)
+#
+# 메모리 구성(리틀엔디언):
+#   헤더[magic 8 | seq u64 | 채널 수 u32 | 기록 용량 u32 | 누적 샘플 수 u64]
+#   | 채널 이름(UTF-8, '\n' 구분, NAMES_SIZE 바이트)
+#   | 최신 샘플[ts f64 + 값 f64 * n] | 기록 링 버퍼[(ts f64 + 값 f64 * n) * 용량]
+#
+# seqlock: 쓰는 쪽은 seq를 홀수로 만든 뒤 쓰고, 다 쓰면 짝수로 만든다.
+# 읽는 쪽은 seq가 짝수이고 복사 전후로 같을 때만 그 복사본을 믿는다. 쓰는 프로세스는 하나여야 함.
+from __future__ import annotations
+import math
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+
+MAGIC = b'MCBUS001'
+HEADER = struct.Struct('<8sQIIQ')
+SEQ = struct.Struct('<Q')
+SEQ_OFFSET = 8
+COUNT_OFFSET = 24
+NAMES_SIZE = 1024
+DEFAULT_CAPACITY = 60              # 5초 간격이면 5분 분량
+READ_SPINS = 1000                  # 쓰는 중이면 이만큼 다시 시도(넘으면 잠깐 양보)
+
+
+def _open_shm(name: str) -> shared_memory.SharedMemory:
+    # 3.13+는 붙기만 하는 쪽이 resource_tracker에 등록하지 않게 함(자식 종료 시 지워지는 문제)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SensorBus:
+    """공유 메모리 센서 버스. create()로 만든 프로세스가 unlink() 책임을 진다."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self.owner = owner
+        buf = shm.buf
+        magic, _seq, n, capacity, _count = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            shm.close()
+            raise ValueError(f'{shm.name}: 센서 버스가 아닙니다.')
+        names = bytes(buf[HEADER.size:HEADER.size + NAMES_SIZE]).rstrip(b'\0').decode('utf-8')
+        self.channels = tuple(names.split('\n')) if names else ()
+        if len(self.channels) != n:
+            shm.close()
+            raise ValueError(f'{shm.name}: 채널 정보가 맞지 않습니다.')
+        self.capacity = capacity
+        self._row = struct.Struct(f'<{n + 1}d')
+        self._latest_off = HEADER.size + NAMES_SIZE
+        self._ring_off = self._latest_off + self._row.size
+
+    @staticmethod
+    def size_for(n_channels: int, capacity: int) -> int:
+        return HEADER.size + NAMES_SIZE + (capacity + 1) * (n_channels + 1) * 8
+
+    @classmethod
+    def create(cls, channels: list[str] | tuple[str, ...], capacity: int = DEFAULT_CAPACITY,
+               name: str | None = None) -> SensorBus:
+        names = '\n'.join(channels).encode('utf-8')
+        if len(names) > NAMES_SIZE:
+            raise ValueError('channel names are too long')
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls.size_for(len(channels), capacity))
+        shm.buf[:shm.size] = bytes(shm.size)
+        HEADER.pack_into(shm.buf, 0, MAGIC, 0, len(channels), capacity, 0)
+        shm.buf[HEADER.size:HEADER.size + len(names)] = names
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SensorBus:
+        return cls(_open_shm(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __reduce__(self):
+        # 다른 프로세스로 넘기면 그쪽에서 이름으로 다시 붙음(메모리 내용은 복사하지 않음)
+        return (SensorBus.attach, (self.name,))
+
+    # -------------------
+    # 쓰기(프로세스 하나만)
+    # -------------------
+    def publish(self, ts: float, env: dict[str, float | None]) -> None:
+        """최신 샘플을 갱신하고 기록 링 버퍼에도 추가."""
+        row = self._row.pack(ts, *(float(v) if isinstance(v, (int, float)) else math.nan
+                                   for v in map(env.get, self.channels)))
+        buf = self._shm.buf
+        seq = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+        if seq & 1:
+            seq += 1                  # 이전 writer가 쓰다가 죽은 경우
+        count = SEQ.unpack_from(buf, COUNT_OFFSET)[0]
+        SEQ.pack_into(buf, SEQ_OFFSET, seq + 1)            # 홀수: 쓰는 중
+        buf[self._latest_off:self._latest_off + self._row.size] = row
+        slot = self._ring_off + (count % self.capacity) * self._row.size
+        buf[slot:slot + self._row.size] = row
+        SEQ.pack_into(buf, COUNT_OFFSET, count + 1)
+        SEQ.pack_into(buf, SEQ_OFFSET, seq + 2)            # 짝수: 다 씀
+
+    # -------------------
+    # 읽기(여러 프로세스 동시에 가능)
+    # -------------------
+    def _snapshot(self, start: int, end: int) -> tuple[int, bytes]:
+        # seqlock으로 [start, end) 바이트와 그때의 누적 샘플 수를 일관되게 복사
+        buf = self._shm.buf
+        spins = 0
+        while True:
+            before = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+            if not before & 1:
+                count = SEQ.unpack_from(buf, COUNT_OFFSET)[0]
+                data = bytes(buf[start:end])
+                if SEQ.unpack_from(buf, SEQ_OFFSET)[0] == before:
+                    return count, data
+            spins += 1
+            if spins >= READ_SPINS:
+                time.sleep(0)
+                spins = 0
+
+    def _decode(self, row: tuple[float, ...]) -> tuple[float, dict[str, float | None]]:
+        ts, *values = row
+        return ts, {c: (None if v != v else v) for c, v in zip(self.channels, values)}
+
+    def read_latest(self) -> tuple[float, dict[str, float | None]] | None:
+        """(ts, env) 또는 아직 아무것도 안 올라왔으면 None."""
+        count, data = self._snapshot(self._latest_off, self._latest_off + self._row.size)
+        if count == 0:
+            return None
+        return self._decode(self._row.unpack(data))
+
+    def read_history(self, last_n: int | None = None) -> list[tuple[float, dict[str, float | None]]]:
+        """링 버퍼에 남아 있는 샘플(오래된 것부터). last_n이면 최근 last_n개만."""
+        end = self._ring_off + self.capacity * self._row.size
+        count, data = self._snapshot(self._ring_off, end)
+        n = min(count, self.capacity)
+        if last_n is not None:
+            n = min(n, last_n)
+        size = self._row.size
+        out = []
+        for i in range(count - n, count):
+            slot = (i % self.capacity) * size
+            out.append(self._decode(self._row.unpack_from(data, slot)))
+        return out
+
+    def count(self) -> int:
+        return SEQ.unpack_from(self._shm.buf, COUNT_OFFSET)[0]
+
+    def close(self) -> None:
+        self._shm.close()
+
+    def unlink(self) -> None:
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> SensorBus:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
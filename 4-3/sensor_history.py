@@ -0,0 +1,128 @@
+# sensor_history.py
+# 긴 시간(수 시간 분량)의 센서 기록을 미리 잡아 둔 array('d') 링 버퍼에 보관
+# 샘플 하나 = 시각 8바이트 + 채널마다 8바이트 (튜플/float 객체를 만들지 않음)
+from __future__ import annotations
+import bisect
+import math
+from array import array
+
+DEFAULT_CAPACITY = 6 * 60 * 60     # 1Hz 기준 6시간
+
+
+class _TimeView:
+    # 링 버퍼의 시각 열을 '오래된 것부터' 순서의 시퀀스처럼 보이게 함 -> bisect로 윈도우 시작 찾기
+    def __init__(self, history: SensorHistory) -> None:
+        self.h = history
+
+    def __len__(self) -> int:
+        return len(self.h)
+
+    def __getitem__(self, i: int) -> float:
+        return self.h._times[self.h._physical(i)]
+
+
+class SensorHistory:
+    """채널 여러 개를 같은 시각 축으로 저장하는 고정 크기 링 버퍼.
+
+    용량을 넘으면 가장 오래된 샘플부터 덮어쓴다. 채널마다 array('d') 하나씩이라
+    윈도우 조회는 배열 슬라이스(최대 두 조각)로 한 번에 꺼낸다.
+    값이 없는(None) 채널은 NaN으로 저장하고 통계에서는 뺀다.
+    """
+
+    def __init__(self, channels: list[str] | tuple[str, ...], capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._cols = {c: array('d', bytes(8 * capacity)) for c in self.channels}
+        self._n = 0                 # 지금까지 들어온 샘플 수(덮어쓴 것 포함)
+
+    def __len__(self) -> int:
+        return min(self._n, self.capacity)
+
+    def _physical(self, i: int) -> int:
+        # 논리 번호(0 = 남아 있는 것 중 가장 오래된 샘플) -> 배열 위치
+        return (self._n - len(self) + i) % self.capacity
+
+    def push(self, ts: float, env: dict[str, float | None]) -> None:
+        """시각 ts의 샘플 하나. 시각은 이전 샘플보다 작으면 안 됨."""
+        pos = self._n % self.capacity
+        self._times[pos] = ts
+        for c, col in self._cols.items():
+            v = env.get(c)
+            col[pos] = float(v) if isinstance(v, (int, float)) else math.nan
+        self._n += 1
+
+    def _slices(self, start: int) -> list[tuple[int, int]]:
+        # 논리 구간 [start, len)을 배열 위치 구간 최대 두 개로
+        count = len(self) - start
+        if count <= 0:
+            return []
+        a = self._physical(start)
+        if a + count <= self.capacity:
+            return [(a, a + count)]
+        return [(a, self.capacity), (0, a + count - self.capacity)]
+
+    def _start(self, window: float | None, now: float | None) -> int:
+        if window is None or not len(self):
+            return 0
+        if now is None:
+            now = self._times[self._physical(len(self) - 1)]
+        return bisect.bisect_left(_TimeView(self), now - window)
+
+    def window(self, channel: str, window: float | None = None,
+               now: float | None = None) -> tuple[array, array]:
+        """[now - window, now] 구간의 (시각, 값) 배열. window=None이면 남아 있는 전체."""
+        col = self._cols[channel]
+        ts, vs = array('d'), array('d')
+        for a, b in self._slices(self._start(window, now)):
+            ts += self._times[a:b]
+            vs += col[a:b]
+        return ts, vs
+
+    def _values(self, channel: str, window: float | None, now: float | None) -> list[float]:
+        _ts, vs = self.window(channel, window, now)
+        return [v for v in vs if v == v]          # NaN 제외
+
+    def mean(self, channel: str, window: float | None = None, now: float | None = None) -> float | None:
+        vs = self._values(channel, window, now)
+        return math.fsum(vs) / len(vs) if vs else None
+
+    def percentile(self, channel: str, q: float, window: float | None = None,
+                   now: float | None = None) -> float | None:
+        """q: 0~100. 두 값 사이는 선형 보간."""
+        if not 0 <= q <= 100:
+            raise ValueError('q must be between 0 and 100')
+        vs = sorted(self._values(channel, window, now))
+        if not vs:
+            return None
+        pos = (len(vs) - 1) * q / 100
+        lo = math.floor(pos)
+        hi = min(lo + 1, len(vs) - 1)
+        return vs[lo] + (vs[hi] - vs[lo]) * (pos - lo)
+
+    def rate_of_change(self, channel: str, window: float | None = None,
+                       now: float | None = None) -> float | None:
+        """구간 안 값의 초당 변화율(최소제곱 직선의 기울기). 샘플이 2개 미만이면 None."""
+        ts, vs = self.window(channel, window, now)
+        pts = [(t, v) for t, v in zip(ts, vs) if v == v]
+        if len(pts) < 2:
+            return None
+        t0 = pts[0][0]                            # 큰 epoch 값에서 생기는 오차를 줄이려고 원점 이동
+        n = len(pts)
+        mean_t = math.fsum(t - t0 for t, _ in pts) / n
+        mean_v = math.fsum(v for _, v in pts) / n
+        cov = math.fsum((t - t0 - mean_t) * (v - mean_v) for t, v in pts)
+        var = math.fsum((t - t0 - mean_t) ** 2 for t, _ in pts)
+        return cov / var if var else None
+
+    def trend(self, channel: str, window: float | None = None,
+              now: float | None = None) -> dict[str, float | None]:
+        rate = self.rate_of_change(channel, window, now)
+        return {
+            'mean': self.mean(channel, window, now),
+            'p50': self.percentile(channel, 50, window, now),
+            'p95': self.percentile(channel, 95, window, now),
+            'rate_per_min': rate * 60 if rate is not None else None,
+        }
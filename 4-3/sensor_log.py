@@ -0,0 +1,94 @@
+# sensor_log.py
+# 센서 로그를 한 번 열어 둔 파일에 모아서 쓰는 writer
+# (매 샘플마다 exists 확인 + open/write/close 하던 것을 대체)
+from __future__ import annotations
+import atexit
+import os
+import threading
+import time
+
+FSYNC_POLICIES = ('never', 'flush', 'always')
+
+
+class BufferedLogWriter:
+    """줄 단위 로그를 메모리에 모았다가 한 번의 write로 내보낸다.
+
+    - flush_bytes 이상 쌓이거나, 마지막 flush 후 flush_interval초가 지나면 flush
+      (시간 조건은 다음 write_line 때 확인 -> 별도 스레드 없음)
+    - fsync: 'never'(OS에 맡김), 'flush'(flush할 때마다), 'always'(줄마다 flush + fsync)
+    - 파일이 비어 있으면 처음 열 때 header를 한 번 씀
+    - 프로그램 종료 시(atexit) 남은 내용을 쓰고 닫음
+    """
+
+    def __init__(
+        self,
+        path: str,
+        header: str | None = None,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        fsync: str = 'never',
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'fsync must be one of {FSYNC_POLICIES}: {fsync!r}')
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.pid = os.getpid()             # fork된 자식은 부모 writer를 쓰면 안 됨(버퍼가 복사돼 있음)
+        self._lock = threading.Lock()
+        self._buf: list[bytes] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+        self._f = open(path, 'ab', buffering=0)   # 버퍼는 직접 관리 -> flush 한 번 = write 한 번
+        if header is not None and self._f.tell() == 0:
+            self._f.write(header.encode('utf-8') + b'\n')
+        atexit.register(self.close)
+
+    @property
+    def closed(self) -> bool:
+        return self._f.closed
+
+    def write_line(self, line: str) -> None:
+        data = line.encode('utf-8') + b'\n'
+        with self._lock:
+            if self._f.closed:
+                raise ValueError(f'{self.path}: writer가 이미 닫혔습니다.')
+            self._buf.append(data)
+            self._size += len(data)
+            if (self.fsync == 'always' or self._size >= self.flush_bytes
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._f.closed:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._buf:
+            data = b''.join(self._buf)
+            self._buf.clear()
+            self._size = 0
+            view = memoryview(data)
+            while view:                    # buffering=0이라 일부만 써질 수 있음
+                view = view[self._f.write(view):]
+            if self.fsync != 'never':
+                os.fsync(self._f.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f.closed:
+                return
+            try:
+                if os.getpid() == self.pid:
+                    self._flush_locked()
+            finally:
+                self._f.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> BufferedLogWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
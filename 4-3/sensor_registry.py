@@ -0,0 +1,180 @@
+# sensor_registry.py
+# 센서(거주 모듈) 여러 개를 등록해 두고 한 번에 읽어 센서별 기록에 쌓는 레지스트리
+# (센서마다 스레드를 두지 않고, 정해진 수의 작업 스레드가 센서 묶음을 나눠 읽음)
+from __future__ import annotations
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from sensor_history import SensorHistory
+
+DEFAULT_HISTORY = 60 * 60          # 센서마다 보관할 샘플 수(1Hz면 1시간)
+
+
+class SensorEntry:
+    """등록된 센서 하나: 읽기 함수, 채널 목록, 센서별 기록."""
+
+    __slots__ = ('sensor_id', 'sensor', 'channels', 'history', 'latest', 'errors', '_read')
+
+    def __init__(self, sensor_id: str, sensor: Any, channels: tuple[str, ...],
+                 read: Callable[[], dict[str, float | None]], capacity: int) -> None:
+        self.sensor_id = sensor_id
+        self.sensor = sensor
+        self.channels = channels
+        self.history = SensorHistory(channels, capacity)
+        self.latest: dict[str, float | None] | None = None
+        self.errors = 0
+        self._read = read
+
+
+def _make_reader(sensor: Any, log: bool) -> Callable[[], dict[str, float | None]]:
+    # DummySensor처럼 set_env/get_env가 있으면 그걸로, 아니면 호출하면 dict를 주는 함수로 봄
+    if hasattr(sensor, 'set_env') and hasattr(sensor, 'get_env'):
+        def read() -> dict[str, float | None]:
+            sensor.set_env()
+            return dict(sensor.get_env(log=log))
+        return read
+    if callable(sensor):
+        return lambda: dict(sensor())
+    raise TypeError('sensor must have set_env()/get_env() or be callable')
+
+
+def _read_batch(entries: list[SensorEntry]) -> list[dict[str, float | None] | None]:
+    # 작업 스레드 하나가 맡은 센서 묶음을 차례로 읽음. 실패한 센서는 None
+    out: list[dict[str, float | None] | None] = []
+    for e in entries:
+        try:
+            out.append(e._read())
+        except Exception:
+            e.errors += 1
+            out.append(None)
+    return out
+
+
+class SensorRegistry:
+    """센서 N개 레지스트리.
+
+    - register(): 센서마다 채널 구성이 달라도 됨(기본은 sensor.env_values의 키)
+    - poll(ts): 센서들을 workers개 묶음으로 나눠 스레드 풀에서 읽고, 결과는 호출한 스레드에서
+      센서별 SensorHistory(채널별 array('d') 열)에 넣음 -> 기록에는 잠금이 필요 없음
+    - workers<=1이면 풀 없이 호출한 스레드에서 바로 읽음(순수 계산형 센서는 GIL 때문에 이쪽이 빠름,
+      장치/네트워크를 기다리는 센서는 풀이 대기 시간을 겹쳐 줌)
+    """
+
+    def __init__(self, workers: int = 4, history_capacity: int = DEFAULT_HISTORY) -> None:
+        self.workers = workers
+        self.history_capacity = history_capacity
+        self._entries: dict[str, SensorEntry] = {}
+        self._lock = threading.Lock()              # 등록/해제와 poll이 겹칠 때 목록만 보호
+        self._pool: ThreadPoolExecutor | None = None
+
+    # -------------------
+    # 등록
+    # -------------------
+    def register(self, sensor_id: str, sensor: Any, channels: list[str] | tuple[str, ...] | None = None,
+                 log: bool = False) -> SensorEntry:
+        """같은 id가 있으면 교체(기록도 새로 시작). log=True면 DummySensor 로그도 씀."""
+        read = _make_reader(sensor, log)
+        if channels is None:
+            env = getattr(sensor, 'env_values', None)
+            channels = tuple(env) if isinstance(env, dict) else tuple(read())
+        entry = SensorEntry(sensor_id, sensor, tuple(channels), read, self.history_capacity)
+        with self._lock:
+            self._entries[sensor_id] = entry
+        return entry
+
+    def unregister(self, sensor_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(sensor_id, None)
+        if entry is not None:
+            close_log = getattr(entry.sensor, 'close_log', None)
+            if callable(close_log):
+                close_log()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, sensor_id: object) -> bool:
+        return sensor_id in self._entries
+
+    def ids(self) -> list[str]:
+        return list(self._entries)
+
+    def entry(self, sensor_id: str) -> SensorEntry:
+        return self._entries[sensor_id]
+
+    @property
+    def env_values(self) -> dict[str, float | None]:
+        """등록된 센서들의 채널 합집합(DummySensor.env_values처럼 채널 -> None). MissionComputer가 채널 목록으로 씀."""
+        return dict.fromkeys(c for e in list(self._entries.values()) for c in e.channels)
+
+    # -------------------
+    # 읽기
+    # -------------------
+    def _batches(self, entries: list[SensorEntry]) -> list[list[SensorEntry]]:
+        n = max(1, min(self.workers, len(entries)))
+        size = math.ceil(len(entries) / n)
+        return [entries[i:i + size] for i in range(0, len(entries), size)]
+
+    def poll(self, ts: float) -> dict[str, dict[str, float | None]]:
+        """모든 센서를 한 번씩 읽어 기록에 넣고 {sensor_id: 값}을 돌려줌(읽기 실패한 센서는 빠짐)."""
+        with self._lock:
+            entries = list(self._entries.values())
+        if not entries:
+            return {}
+        batches = self._batches(entries)
+        if self.workers <= 1 or len(batches) == 1:
+            results = [_read_batch(b) for b in batches]
+        else:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='SensorPoll')
+            results = list(self._pool.map(_read_batch, batches))
+        readings: dict[str, dict[str, float | None]] = {}
+        for batch, envs in zip(batches, results):
+            for e, env in zip(batch, envs):
+                if env is None:
+                    continue
+                e.history.push(ts, env)
+                e.latest = env
+                readings[e.sensor_id] = env
+        return readings
+
+    # -------------------
+    # 조회
+    # -------------------
+    def latest(self, sensor_id: str) -> dict[str, float | None] | None:
+        return self._entries[sensor_id].latest
+
+    def history(self, sensor_id: str) -> SensorHistory:
+        return self._entries[sensor_id].history
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """채널별로 모든 센서의 최신 값을 모은 개수/최소/평균/최대(채널 구성이 다른 센서도 같이)."""
+        acc: dict[str, list[float]] = {}
+        for e in list(self._entries.values()):
+            if e.latest is None:
+                continue
+            for k, v in e.latest.items():
+                if isinstance(v, (int, float)) and v == v:
+                    acc.setdefault(k, []).append(float(v))
+        return {
+            k: {'count': len(vs), 'min': min(vs), 'mean': round(math.fsum(vs) / len(vs), 4), 'max': max(vs)}
+            for k, vs in acc.items()
+        }
+
+    # -------------------
+    # 정리(MissionComputer가 sensor 자리에 이 객체를 두고 flush_log를 부름)
+    # -------------------
+    def flush_log(self) -> None:
+        for e in list(self._entries.values()):
+            flush = getattr(e.sensor, 'flush_log', None)
+            if callable(flush):
+                flush()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for sensor_id in self.ids():
+            self.unregister(sensor_id)
@@ -0,0 +1,138 @@
+# sensor_synth.py
+# 부하 테스트용 가짜 센서 데이터를 한 번에 N개씩 만드는 생성기
+# (DummySensor.set_env처럼 샘플마다 random.uniform/round 6번 + dict 하나를 만들지 않음)
+from __future__ import annotations
+import math
+import random
+import time
+from array import array
+from itertools import accumulate, repeat
+from operator import add
+from statistics import NormalDist
+from typing import Callable, Iterator
+
+# DummySensor.set_env와 같은 범위/소수 자릿수
+SENSOR_RANGES: dict[str, tuple[float, float, int]] = {
+    'mars_base_internal_temperature': (18, 30, 2),
+    'mars_base_external_temperature': (0, 21, 2),
+    'mars_base_internal_humidity': (50, 60, 2),
+    'mars_base_external_illuminance': (500, 715, 2),
+    'mars_base_internal_co2': (0.02, 0.1, 4),
+    'mars_base_internal_oxygen': (4, 7, 2),
+}
+LEVELS = 1 << 16      # 난수 2바이트 -> 표 한 칸. 범위를 65536단계로 나눔(자릿수 반올림보다 촘촘함)
+MODELS = ('uniform', 'walk')
+
+
+class SensorBatch:
+    """열(column) 단위로 담은 샘플 묶음. ts와 채널별 값이 모두 array('d')."""
+
+    def __init__(self, ts: array, columns: dict[str, array]) -> None:
+        self.ts = ts
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def row(self, i: int) -> dict[str, float]:
+        return {k: col[i] for k, col in self.columns.items()}
+
+    def rows(self) -> Iterator[tuple[float, dict[str, float]]]:
+        keys = list(self.columns)
+        for ts, values in zip(self.ts, zip(*self.columns.values())):
+            yield ts, dict(zip(keys, values))
+
+
+class SyntheticSensor:
+    """시드 고정이 가능한 배치 생성기.
+
+    - model='uniform': set_env와 같은 분포(채널마다 독립 균등분포)
+    - model='walk': 채널끼리 상관된 랜덤 워크. 한 걸음 = 범위 * step 정도,
+      모든 채널이 같은 잡음을 correlation 비율만큼 공유(채널 간 걸음의 상관계수 = correlation²).
+      범위 밖으로 나가면 반사
+    난수는 randbytes로 한꺼번에 만든 뒤 미리 계산한 표를 찾아 바꾸므로 파이썬 루프가 거의 없다.
+    """
+
+    def __init__(self, seed: int | None = None, model: str = 'uniform', step: float = 0.02,
+                 correlation: float = 0.5, ranges: dict[str, tuple[float, float, int]] | None = None) -> None:
+        if model not in MODELS:
+            raise ValueError(f'model must be one of {MODELS}: {model!r}')
+        if not 0 <= correlation <= 1:
+            raise ValueError('correlation must be between 0 and 1')
+        self.rng = random.Random(seed)
+        self.model = model
+        self.step = step
+        self.correlation = correlation
+        self.ranges = dict(ranges or SENSOR_RANGES)
+        self._state = {k: (lo + hi) / 2 for k, (lo, hi, _nd) in self.ranges.items()}   # walk 현재 위치
+        # 표는 list로 둠(찾을 때 float 객체를 새로 만들지 않아서 array보다 빠름)
+        self._uniform_tables = {
+            k: [round(lo + (hi - lo) * (i + 0.5) / LEVELS, nd) for i in range(LEVELS)]
+            for k, (lo, hi, nd) in self.ranges.items()
+        }
+        normal = NormalDist()
+        self._normal = [normal.inv_cdf((i + 0.5) / LEVELS) for i in range(LEVELS)]
+
+    def _raw(self, n: int) -> array:
+        raw = array('H')
+        raw.frombytes(self.rng.randbytes(2 * n))
+        return raw
+
+    def _noise(self, n: int, scale: float) -> Iterator[float]:
+        table = [v * scale for v in self._normal]
+        return map(table.__getitem__, self._raw(n))
+
+    def generate(self, n: int, start_ts: float | None = None, interval: float = 1.0) -> SensorBatch:
+        """n개 샘플. ts는 start_ts(기본: 지금)부터 interval초 간격."""
+        if start_ts is None:
+            start_ts = time.time()
+        ts = array('d', accumulate(repeat(interval, n - 1), initial=start_ts)) if n else array('d')
+        if self.model == 'uniform':
+            columns = {k: array('d', map(table.__getitem__, self._raw(n)))
+                       for k, table in self._uniform_tables.items()}
+        else:
+            columns = self._walk(n)
+        return SensorBatch(ts, columns)
+
+    def _walk(self, n: int) -> dict[str, array]:
+        rho = self.correlation
+        common = array('d', self._noise(n, rho))
+        own_scale = math.sqrt(1 - rho * rho)
+        columns = {}
+        for k, (lo, hi, nd) in self.ranges.items():
+            span = hi - lo
+            period = 2 * span
+
+            def reflect(x: float, d: float, lo: float = lo, span: float = span, period: float = period) -> float:
+                # 한 걸음 간 뒤 범위 밖이면 경계에서 되돌림(접는 방식과 달리 이동 방향이 유지돼 상관관계가 남음)
+                y = (x + d - lo) % period
+                return lo + (period - y if y > span else y)
+
+            size = span * self.step
+            steps = map(add, self._noise(n, own_scale * size), map(size.__mul__, common))
+            walk = accumulate(steps, reflect, initial=self._state[k])
+            next(walk)                       # initial 값(직전 배치의 마지막 위치)은 빼고
+            col = array('d', walk)
+            if col:
+                self._state[k] = col[-1]
+            columns[k] = array('d', map(round, col, repeat(nd)))
+        return columns
+
+
+def replay(batch: SensorBatch, speed: float | None = 60.0,
+           clock: Callable[[], float] = time.monotonic,
+           sleep: Callable[[float], None] = time.sleep) -> Iterator[tuple[float, dict[str, float]]]:
+    """배치를 speed배 빠른 시간으로 흘려보냄(speed=None이면 기다리지 않고 최대 속도).
+
+    기준은 시작 시각 + (ts - 첫 ts) / speed 라서 처리 시간이 걸려도 밀리지 않는다.
+    """
+    if not len(batch):
+        return
+    t0 = batch.ts[0]
+    start = clock()
+    for ts, env in batch.rows():
+        if speed:
+            delay = start + (ts - t0) / speed - clock()
+            if delay > 0:
+                sleep(delay)
+        yield ts, env
@@ -0,0 +1,126 @@
+# sensor_window.py
+# 센서 값 하나에 대한 시간 슬라이딩 윈도우 집계(평균/최소/최대/개수)
+# 여러 길이의 윈도우(예: 1분/5분/15분)가 샘플 저장소 하나를 같이 씀
+from __future__ import annotations
+from array import array
+from collections import deque
+
+DEFAULT_WINDOWS = (60.0, 300.0, 900.0)
+
+
+class _Window:
+    # 윈도우 하나의 상태. head는 이 윈도우에 들어 있는 가장 오래된 샘플의 절대 번호
+    __slots__ = ('length', 'head', 'total', 'count', 'mins', 'maxs')
+
+    def __init__(self, length: float) -> None:
+        self.length = length
+        self.head = 0
+        self.total = 0.0
+        self.count = 0
+        self.mins: deque[int] = deque()   # 값이 증가하는 순서의 샘플 번호 -> 맨 앞이 최소
+        self.maxs: deque[int] = deque()   # 값이 감소하는 순서의 샘플 번호 -> 맨 앞이 최대
+
+
+class SlidingWindow:
+    """시간순으로 들어오는 (ts, value)를 여러 윈도우 길이로 동시에 집계한다.
+
+    - 샘플은 array('d') 두 개(시각, 값)에만 저장(샘플마다 튜플을 만들지 않음)
+    - 윈도우마다 running sum/count를 들고 있어서 평균은 O(1)
+    - 최소/최대는 단조 deque로 유지 -> push/evict 모두 amortized O(1)
+    - 가장 긴 윈도우에서도 빠진 샘플은 배열 앞쪽에서 몰아서 지움
+    윈도우 범위는 [now - length, now] (기존 5분 평균과 같은 기준).
+    """
+
+    def __init__(self, windows: tuple[float, ...] = DEFAULT_WINDOWS) -> None:
+        if not windows:
+            raise ValueError('windows must not be empty')
+        self._times = array('d')
+        self._values = array('d')
+        self._base = 0      # _times[0]의 절대 샘플 번호
+        self._windows = {float(w): _Window(float(w)) for w in windows}
+
+    @property
+    def windows(self) -> tuple[float, ...]:
+        return tuple(self._windows)
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def push(self, ts: float, value: float) -> None:
+        i = self._base + len(self._times)
+        self._times.append(ts)
+        self._values.append(value)
+        values, base = self._values, self._base
+        for w in self._windows.values():
+            w.total += value
+            w.count += 1
+            while w.mins and values[w.mins[-1] - base] >= value:
+                w.mins.pop()
+            w.mins.append(i)
+            while w.maxs and values[w.maxs[-1] - base] <= value:
+                w.maxs.pop()
+            w.maxs.append(i)
+
+    def evict(self, now: float) -> None:
+        """now 기준으로 각 윈도우에서 벗어난 샘플을 뺀다."""
+        times, values, base = self._times, self._values, self._base
+        end = base + len(times)
+        for w in self._windows.values():
+            cutoff = now - w.length
+            while w.head < end and times[w.head - base] < cutoff:
+                w.total -= values[w.head - base]
+                w.count -= 1
+                w.head += 1
+            if w.count == 0:
+                w.total = 0.0                 # 부동소수 오차가 남지 않게
+            while w.mins and w.mins[0] < w.head:
+                w.mins.popleft()
+            while w.maxs and w.maxs[0] < w.head:
+                w.maxs.popleft()
+        self._compact()
+
+    def _compact(self) -> None:
+        # 모든 윈도우에서 빠진 앞부분이 절반 이상이면 배열에서 지움(amortized O(1))
+        drop = min(w.head for w in self._windows.values()) - self._base
+        if drop and drop * 2 >= len(self._times):
+            del self._times[:drop]
+            del self._values[:drop]
+            self._base += drop
+            # 더하고 빼기를 오래 반복하면 오차가 쌓이므로 이때 합계를 다시 계산
+            for w in self._windows.values():
+                start = w.head - self._base
+                w.total = sum(self._values[start:])
+
+    def _window(self, window: float, now: float | None) -> _Window:
+        try:
+            w = self._windows[float(window)]
+        except KeyError:
+            raise KeyError(f'unknown window: {window} (have {self.windows})') from None
+        if now is not None:
+            self.evict(now)
+        return w
+
+    def count(self, window: float, now: float | None = None) -> int:
+        return self._window(window, now).count
+
+    def mean(self, window: float, now: float | None = None) -> float | None:
+        w = self._window(window, now)
+        return w.total / w.count if w.count else None
+
+    def minimum(self, window: float, now: float | None = None) -> float | None:
+        w = self._window(window, now)
+        return self._values[w.mins[0] - self._base] if w.mins else None
+
+    def maximum(self, window: float, now: float | None = None) -> float | None:
+        w = self._window(window, now)
+        return self._values[w.maxs[0] - self._base] if w.maxs else None
+
+    def summary(self, window: float, now: float | None = None) -> dict[str, float | int | None]:
+        if now is not None:
+            self.evict(now)
+        return {
+            'mean': self.mean(window),
+            'min': self.minimum(window),
+            'max': self.maximum(window),
+            'count': self.count(window),
+        }
@@ -0,0 +1,95 @@
+# settings_cache.py
+# setting.txt를 한 번 파싱해 두고, 파일이 바뀌었을 때만 다시 읽는 캐시
+# (info/load 루프가 돌 때마다 파일을 열어 파싱하던 것을 대체)
+from __future__ import annotations
+import os
+import threading
+import time
+from typing import Callable
+
+SETTINGS_GROUPS = ('info', 'load')
+
+
+def parse_settings(text: str) -> dict[str, frozenset[str]]:
+    """예:
+    info=os,os_version,cpu_model,cpu_core_count,memory_total_gb
+    load=cpu_usage_percent,memory_usage_percent
+    """
+    result: dict[str, frozenset[str]] = {}
+    for line in text.splitlines():
+        s = line.strip().lstrip('\ufeff')   # 메모장 등에서 저장한 BOM
+        if not s or s.startswith('#'):
+            continue
+        for group in SETTINGS_GROUPS:
+            if s.startswith(group + '='):
+                result[group] = frozenset(x.strip() for x in s[len(group) + 1:].split(',') if x.strip())
+    return result
+
+
+class SettingsCache:
+    """setting.txt 파싱 결과 캐시.
+
+    get()은 마지막 확인 후 check_interval초가 지나지 않았으면 파일을 건드리지 않고 바로 돌려준다.
+    그 뒤에는 stat 한 번으로 (inode, mtime, 크기)를 비교해서 바뀐 경우에만 다시 읽는다.
+    파일이 없으면 빈 설정(= 모든 항목 출력).
+    결과는 frozenset이라 여러 수집기가 같은 객체를 그대로 나눠 써도 된다.
+    """
+
+    def __init__(self, path: str = 'setting.txt', check_interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.path = path
+        self.check_interval = check_interval
+        self.clock = clock
+        self.reloads = 0                      # 실제로 파일을 다시 읽은 횟수
+        self._lock = threading.Lock()
+        self._key: tuple[int, int, int] | None = None
+        self._settings: dict[str, frozenset[str]] = {}
+        self._checked_at: float | None = None
+
+    def get(self) -> dict[str, frozenset[str]]:
+        now = self.clock()
+        checked = self._checked_at
+        if checked is not None and now - checked < self.check_interval:
+            return self._settings
+        with self._lock:
+            if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                self._refresh()
+                self._checked_at = now
+            return self._settings
+
+    def invalidate(self) -> None:
+        """다음 get()에서 바로 파일을 확인하게 함."""
+        self._checked_at = None
+
+    def _refresh(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._key = None
+            self._settings = {}
+            return
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._key:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                settings = parse_settings(f.read())
+        except FileNotFoundError:
+            key, settings = None, {}
+        self._key = key
+        self._settings = settings
+        self.reloads += 1
+
+
+_shared: dict[str, SettingsCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_settings(path: str = 'setting.txt') -> SettingsCache:
+    """같은 파일에 대한 캐시는 프로세스 안에서 하나만 만들어 모든 수집기가 같이 씀."""
+    key = os.path.abspath(path)
+    cache = _shared.get(key)
+    if cache is None:
+        with _shared_lock:
+            cache = _shared.setdefault(key, SettingsCache(key))
+    return cache
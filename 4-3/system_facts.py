@@ -0,0 +1,67 @@
+# system_facts.py
+# OS 이름/버전, CPU 모델, 코어 수, 전체 메모리처럼 실행 중에는 바뀌지 않는 값을 한 번만 조사해 두는 캐시
+# (info 루프가 돌 때마다 platform.* 를 다시 부르던 것을 대체. platform.processor()는 서브프로세스를 띄우기도 함)
+from __future__ import annotations
+import threading
+import time
+from typing import Callable
+
+Facts = dict[str, str | int | float]
+
+
+class StaticFacts:
+    """probe()를 처음 get()할 때 한 번만 실행하고 그 결과를 계속 돌려준다.
+
+    - refresh(): 지금 다시 조사(CPU/메모리 핫플러그 등)
+    - max_age: 지정하면 그 초가 지난 뒤 get()에서 자동으로 다시 조사
+    - probe가 예외를 던지면 캐시하지 않고 그대로 올려보냄(다음 get()에서 다시 시도)
+    get()은 복사본을 돌려주므로 호출한 쪽이 고쳐도 캐시는 그대로다.
+    """
+
+    def __init__(self, probe: Callable[[], Facts], max_age: float | None = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.probe = probe
+        self.max_age = max_age
+        self.clock = clock
+        self.probes = 0                     # 실제로 조사한 횟수
+        self._lock = threading.Lock()
+        self._facts: Facts | None = None
+        self._probed_at = 0.0
+
+    def _fresh(self) -> bool:
+        return self._facts is not None and (
+            self.max_age is None or self.clock() - self._probed_at < self.max_age)
+
+    def get(self) -> Facts:
+        facts = self._facts                       # 한 번만 읽음(그 사이 invalidate()가 None으로 바꿔도 안전)
+        if facts is None or not self._fresh():
+            with self._lock:
+                facts = self._facts if self._fresh() else self._probe_locked()
+        return dict(facts)
+
+    def refresh(self) -> Facts:
+        with self._lock:
+            return dict(self._probe_locked())
+
+    def invalidate(self) -> None:
+        """다음 get()에서 다시 조사하게 함."""
+        with self._lock:
+            self._facts = None
+
+    def prefetch(self) -> threading.Thread:
+        """시작할 때 백그라운드에서 미리 조사해 두기(첫 get()이 기다리지 않게)."""
+        def _run() -> None:
+            try:
+                self.get()
+            except Exception:
+                pass
+        t = threading.Thread(target=_run, name='SystemFactsProbe', daemon=True)
+        t.start()
+        return t
+
+    def _probe_locked(self) -> Facts:
+        facts = dict(self.probe())
+        self._facts = facts
+        self._probed_at = self.clock()
+        self.probes += 1
+        return facts
@@ -0,0 +1,278 @@
+# telemetry_sink.py
+# MissionComputer 출력(JSON 한 줄씩)을 받는 sink들
+# MissionComputer.sink에는 문자열 하나를 받는 함수면 무엇이든 넣을 수 있다(기본 print).
+# 여기 sink들은 write_batch(lines)로 여러 줄을 한 번에 내보내고, BatchingSink로 감싸면
+# 수집 루프는 큐에 넣기만 하고 실제 출력은 백그라운드 스레드가 모아서 한다.
+#
+#   mc.sink = open_sink('stdout')                  # 표준 출력(배치)
+#   mc.sink = open_sink('jsonl:telemetry.jsonl')   # JSON Lines 파일
+#   mc.sink = open_sink('udp:127.0.0.1:9999')      # UDP 데이터그램(줄 여러 개를 한 패킷에)
+#   mc.sink = open_sink('unix:/tmp/mc.sock')       # 유닉스 도메인 데이터그램 소켓
+#   mc.sink = open_sink('memory')                  # 같은 프로세스의 소비자가 get()으로 꺼냄
+from __future__ import annotations
+import abc
+import atexit
+import json
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, TextIO
+
+from sensor_log import BufferedLogWriter
+
+# 미리 만들어 둔 인코더: json.dumps(obj, ensure_ascii=False)와 같은 출력이지만
+# 호출마다 JSONEncoder를 새로 만들지 않아서 훨씬 빠름
+encode_json: Callable[[object], str] = json.JSONEncoder(ensure_ascii=False).encode
+
+MAX_DATAGRAM = 60 * 1024          # UDP 한 패킷에 담을 최대 바이트(64KB 한도보다 약간 작게)
+
+
+class TelemetrySink(abc.ABC):
+    """sink 기본형. sink(line)은 write_batch([line])과 같음.
+
+    write_batch를 구현하지 않은 sink는 만들 때 바로 TypeError(BatchingSink 스레드 안에서 묻히지 않게).
+    """
+
+    def __call__(self, line: str) -> None:
+        self.write_batch([line])
+
+    @abc.abstractmethod
+    def write_batch(self, lines: list[str]) -> None:
+        ...
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> TelemetrySink:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class StdoutSink(TelemetrySink):
+    """줄들을 합쳐서 write 한 번으로 출력(stream 기본값은 sys.stdout)."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+
+    def write_batch(self, lines: list[str]) -> None:
+        if lines:
+            stream = self.stream or sys.stdout
+            stream.write('\n'.join(lines) + '\n')
+
+    def flush(self) -> None:
+        (self.stream or sys.stdout).flush()
+
+
+class JsonLinesSink(TelemetrySink):
+    """JSON Lines 파일. 버퍼링/fsync는 센서 로그와 같은 BufferedLogWriter에 맡김."""
+
+    def __init__(self, path: str, flush_bytes: int = 64 * 1024, flush_interval: float = 1.0,
+                 fsync: str = 'never') -> None:
+        self.path = path
+        self._writer = BufferedLogWriter(path, flush_bytes=flush_bytes,
+                                         flush_interval=flush_interval, fsync=fsync)
+
+    def write_batch(self, lines: list[str]) -> None:
+        if lines:
+            self._writer.write_line('\n'.join(lines))
+
+    def flush(self) -> None:
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class DatagramSink(TelemetrySink):
+    """UDP 또는 유닉스 도메인 데이터그램. 줄들을 '\\n'으로 이어 MAX_DATAGRAM 이하 패킷으로 보냄.
+
+    소켓은 논블로킹: 받는 쪽이 없거나 버퍼가 차면 그 패킷은 버리고 dropped에 센다.
+    """
+
+    def __init__(self, address: tuple[str, int] | str) -> None:
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.address = address
+        self.sent = 0
+        self.dropped = 0
+        self._sock = socket.socket(family, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def write_batch(self, lines: list[str]) -> None:
+        packet: list[bytes] = []
+        size = 0
+        for line in lines:
+            data = line.encode('utf-8')
+            if packet and size + len(data) + 1 > MAX_DATAGRAM:
+                self._send(packet)
+                packet, size = [], 0
+            packet.append(data)
+            size += len(data) + 1
+        if packet:
+            self._send(packet)
+
+    def _send(self, packet: list[bytes]) -> None:
+        try:
+            self._sock.sendto(b'\n'.join(packet), self.address)
+            self.sent += len(packet)
+        except OSError:                 # BlockingIOError, ConnectionRefusedError, 소켓 파일 없음 등
+            self.dropped += len(packet)
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+class QueueSink(TelemetrySink):
+    """메모리 큐. 같은 프로세스의 소비자가 get()/drain()으로 꺼냄.
+
+    maxlen을 넘으면 가장 오래된 줄부터 버림(쓰는 쪽이 절대 막히지 않게).
+    """
+
+    def __init__(self, maxlen: int = 10000) -> None:
+        self._items: deque[str] = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+
+    def write_batch(self, lines: list[str]) -> None:
+        with self._cond:
+            self._items.extend(lines)
+            self._cond.notify_all()
+
+    def get(self, timeout: float | None = None) -> str | None:
+        """한 줄 꺼냄. timeout 안에 없으면 None."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    def drain(self) -> list[str]:
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class BatchingSink(TelemetrySink):
+    """다른 sink 앞에 붙이는 마이크로 배치 + 백그라운드 flusher.
+
+    - sink(line)은 deque에 넣고 끝(수집 루프를 막지 않음)
+    - max_batch줄이 모이거나 첫 줄이 들어온 뒤 max_delay초가 지나면 flusher 스레드가 target.write_batch
+    - 밀린 줄이 max_pending을 넘으면 오래된 것부터 버리고 dropped에 셈
+    - 프로그램 종료 시(atexit) 남은 줄을 내보내고 닫음
+    """
+
+    def __init__(self, target: TelemetrySink, max_batch: int = 256, max_delay: float = 0.2,
+                 max_pending: int = 100000) -> None:
+        self.target = target
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.errors = 0
+        self._pending: deque[str] = deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._first_at: float | None = None
+        self._thread = threading.Thread(target=self._run, name='TelemetryFlusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __call__(self, line: str) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            pending = self._pending
+            if len(pending) >= self.max_pending:
+                pending.popleft()
+                self.dropped += 1
+            pending.append(line)
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+                self._cond.notify()
+            elif len(pending) >= self.max_batch:
+                self._cond.notify()
+
+    def write_batch(self, lines: list[str]) -> None:
+        for line in lines:
+            self(line)
+
+    def _take(self) -> list[str]:
+        batch = list(self._pending)
+        self._pending.clear()
+        self._first_at = None
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._first_at is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._first_at + self.max_delay - time.monotonic()
+                    if len(self._pending) >= self.max_batch or remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                closed = self._closed
+            self._write_pending()
+            if closed:
+                return
+
+    def _write_pending(self) -> None:
+        # 꺼내기와 쓰기를 _write_lock 안에서 같이 해서 flush()와 순서가 뒤바뀌지 않게 함
+        with self._write_lock:
+            with self._cond:
+                batch = self._take()
+            if batch:
+                try:
+                    self.target.write_batch(batch)
+                except Exception as exc:
+                    self.errors += 1
+                    print(f'[telemetry] {type(self.target).__name__} 오류: {exc}', file=sys.stderr)
+
+    def flush(self) -> None:
+        """지금까지 들어온 줄을 바로 내보냄(호출한 스레드에서)."""
+        self._write_pending()
+        self.target.flush()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.target.close()
+        atexit.unregister(self.close)
+
+
+def open_sink(spec: str, batch: bool = True, **batch_options: float) -> TelemetrySink:
+    """'stdout' | 'jsonl:경로' | 'udp:호스트:포트' | 'unix:경로' | 'memory'
+
+    batch=True면 BatchingSink로 감쌈(memory는 이미 논블로킹이라 감싸지 않음).
+    """
+    kind, _, rest = spec.partition(':')
+    if kind == 'stdout':
+        sink: TelemetrySink = StdoutSink()
+    elif kind == 'jsonl' and rest:
+        sink = JsonLinesSink(rest)
+    elif kind == 'udp' and rest:
+        host, _, port = rest.rpartition(':')
+        sink = DatagramSink((host or '127.0.0.1', int(port)))
+    elif kind == 'unix' and rest:
+        sink = DatagramSink(rest)
+    elif kind == 'memory':
+        return QueueSink()
+    else:
+        raise ValueError(f'unknown sink spec: {spec!r}')
+    return BatchingSink(sink, **batch_options) if batch else sink
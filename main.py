@@ -1,22 +1,119 @@
-from typing import List, Tuple
+import abc
+import json
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from tempfile import SpooledTemporaryFile
+from typing import Iterable, Iterator, List, Tuple
+
+from log_cache import ColumnCacheWriter, ColumnChunk, load_cache
 
 LOG_FILE = 'mission_computer_main.log'
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024   # 이보다 큰 로그만 여러 프로세스로 나눠 파싱
+PARALLEL_CHUNK_BYTES = 8 * 1024 * 1024  # 워커 하나가 한 번에 맡는 바이트 범위
+CACHE_KIND = 'rows'                     # 파싱된 행만 캐시(원문 줄 복원은 보장 안 함, log_cache 참고)
+
+Row = Tuple[str, str, str]
+
+def _parse_line(line: str) -> Row | None:
+    parts = line.strip().split(',', 2)
+    if len(parts) != 3:
+        return None
+    ts, event, msg = (p.strip() for p in parts)
+    return ts, event, msg
+
+def split_ranges(path: str, start: int, parts: int) -> list[tuple[int, int]]:
+    # [start, 파일 끝)을 비슷한 크기로 나눔. 경계는 항상 줄 바로 뒤
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(max(start + (size - start) * i // parts, bounds[-1]))
+            f.readline()                  # 걸친 줄은 앞 범위에 포함
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+def _parse_range(path: str, start: int, end: int) -> tuple[List[Row], ColumnChunk]:
+    # 워커 프로세스에서 실행: 범위 하나를 파싱하고 캐시용 열 조각도 같이 만듦
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # 텍스트 모드로 읽을 때와 같은 줄바꿈 처리('\r\n', '\r' -> '\n')
+    text = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    rows: List[Row] = []
+    chunk = ColumnChunk()
+    for line in text.split('\n'):
+        row = _parse_line(line)
+        if row is not None:
+            rows.append(row)
+            chunk.add(*row)
+    return rows, chunk
+
+def _iter_log_parallel(path: str, start: int, workers: int,
+                       writer: ColumnCacheWriter) -> Iterator[Row]:
+    # 범위를 워커들에 나눠 주고, 결과는 파일 순서대로 넘겨줌
+    # 동시에 떠 있는 범위는 workers * 2개까지만 -> 메모리는 로그 크기가 아니라 범위 크기에 비례
+    size = os.path.getsize(path)
+    ranges = iter(split_ranges(path, start, max(workers, size // PARALLEL_CHUNK_BYTES + 1)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for rng in ranges:
+            pending.append(pool.submit(_parse_range, path, *rng))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            rows, chunk = pending.popleft().result()
+            rng = next(ranges, None)
+            if rng is not None:
+                pending.append(pool.submit(_parse_range, path, *rng))
+            writer.add_chunk(chunk)
+            yield from rows
+
+def iter_log(path: str = LOG_FILE, workers: int | None = None) -> Iterator[Row]:
+    # 한 줄씩 읽어서 바로 (ts, event, msg)를 넘겨줌 -> 파일 크기와 상관없이 메모리 일정
+    # 로그 옆에 유효한 열 캐시(.rows.colcache)가 있으면 텍스트 파싱 없이 캐시에서 꺼냄
+    # workers: None이면 큰 로그(PARALLEL_MIN_BYTES 이상)일 때만 CPU 수만큼 프로세스 사용
+    cache = load_cache(path, CACHE_KIND)
+    if cache is not None:
+        with cache:
+            print("헤더 내용:", cache.header.strip())
+            yield from cache
+        return
 
-def load_log(path: str = LOG_FILE) -> List[Tuple[str, str, str]]:
-    rows: List[Tuple[str, str, str]] = []
+    writer = None
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            header = f.readline()
+        writer = ColumnCacheWriter(path, CACHE_KIND)
+        if workers is None:
+            workers = (os.cpu_count() or 1) if os.path.getsize(path) >= PARALLEL_MIN_BYTES else 1
+        if workers > 1:
+            with open(path, 'rb') as f:
+                header = f.readline().decode('utf-8')
+                start = f.tell()
             print("헤더 내용:", header.strip())
             if not header:
-                return rows
-            for line in f:
-                parts = line.strip().split(',', 2)
-                if len(parts) != 3:
-                    continue
-                ts, event, msg = (p.strip() for p in parts)
-                rows.append((ts, event, msg))
-                print(rows)
+                return
+            yield from _iter_log_parallel(path, start, workers, writer)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                header = f.readline()
+                print("헤더 내용:", header.strip())
+                if not header:
+                    return
+                for line in f:
+                    row = _parse_line(line)
+                    if row is None:
+                        continue
+                    writer.add(*row)
+                    yield row
+        # 끝까지 다 읽었을 때만 캐시를 남김
+        writer.commit(header.rstrip('\r\n'))
 
     except FileNotFoundError:
         print('파일없음', path)
@@ -24,19 +121,213 @@ def load_log(path: str = LOG_FILE) -> List[Tuple[str, str, str]]:
         print('인코딩오류', path)
     except OSError as e:
         print('파일오류', path, e)
-    return rows
+    finally:
+        if writer is not None:
+            writer.discard()
 
-def print_log(rows: List[Tuple[str, str, str]]) -> None:
-    if not rows:
-        print('로그가 없습니다.')
-        return
-    print("Timestamp, Event, Message")
+def load_log(path: str = LOG_FILE, workers: int | None = None) -> List[Row]:
+    return list(iter_log(path, workers))
+
+
+# -------------------
+# 싱크 파이프라인: 모든 행을 한 번만 읽고, 등록된 싱크 전부에 흘려보냄
+# -------------------
+class RowSink(abc.ABC):
+    @abc.abstractmethod
+    def feed(self, row: Row) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class LogPipeline:
+    def __init__(self) -> None:
+        self.sinks: list[RowSink] = []
+
+    def add(self, sink: RowSink) -> RowSink:
+        self.sinks.append(sink)
+        return sink
+
+    def run(self, rows: Iterable[Row]) -> int:
+        feeds = [s.feed for s in self.sinks]
+        count = 0
+        for row in rows:
+            for feed in feeds:
+                feed(row)
+            count += 1
+        for s in self.sinks:
+            s.close()
+        return count
+
+
+def compile_keywords(words: list[str], ignore_case: bool = False) -> re.Pattern:
+    # 키워드 목록을 정규식 하나로 컴파일 -> 메시지당 한 번만 스캔
+    # (긴 키워드를 먼저 둬야 겹치는 경우 긴 쪽이 잡힘)
+    ordered = sorted(words, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(w) for w in ordered), re.IGNORECASE if ignore_case else 0)
+
+
+def _row_matches(row: Row, k: str) -> bool:
+    ts, event, msg = row
+    return (k in ts.lower()) or (k in event.lower()) or (k in msg.lower())
+
+
+class SearchPrintSink(RowSink):
+    # 검색결과는 바로 출력하고, 역순출력용으로 걸린 행만 모아둠
+    def __init__(self, keyword: str | None) -> None:
+        self.keyword = keyword.lower() if keyword else ''
+        self.matched: list[Row] = []
+
+    def feed(self, row: Row) -> None:
+        if self.keyword and not _row_matches(row, self.keyword):
+            return
+        if not self.matched:
+            print('====검색결과===')
+            print("Timestamp, Event, Message")
+        ts, event, msg = row
+        print(f"{ts}, {event}, {msg}")
+        self.matched.append(row)
+
+    def close(self) -> None:
+        if not self.matched:
+            print('====검색결과===')
+            print('로그가 없습니다.')
+        print('====역순출력===')
+        print_log(reversed(self.matched))
+
+
+class JsonSink(RowSink):
+    # 행이 들어오는 대로 JSON에 바로 씀(전체 dict를 메모리에 만들지 않음) -> 파일 순서(시간순)로 저장
+    def __init__(self, path: str = "mission_computer_main.json", compact: bool = False,
+                 keep_duplicates: bool = False, json_lines: bool = False) -> None:
+        self.path = path
+        try:
+            self.writer = JsonStreamWriter(path, compact=compact, keep_duplicates=keep_duplicates,
+                                           json_lines=json_lines)
+        except OSError as e:
+            print(f"파일 저장 오류: {e}")
+            self.writer = None
+
+    def feed(self, row: Row) -> None:
+        if self.writer is not None:
+            self.writer.write(*row)
+
+    def close(self) -> None:
+        if self.writer is None:
+            return
+        try:
+            self.writer.close()
+            print(f"JSON 파일로 저장됨: {self.path}")
+        except OSError as e:
+            print(f"파일 저장 오류: {e}")
+
+
+class DangerLogSink(RowSink):
+    def __init__(self, path: str = 'danger_logs.log') -> None:
+        self.path = path
+        self.danger_kw = ['explosion', 'unstable', 'leak', 'overheat', 'Oxygen']
+        self.pattern = compile_keywords(self.danger_kw)
+        try:
+            self.f = open(path, 'w', encoding='utf-8')
+        except OSError as e:
+            print(f"파일 저장 오류: {e}")
+            self.f = None
+
+    def feed(self, row: Row) -> None:
+        if self.f is None:
+            return
+        ts, event, msg = row
+        if self.pattern.search(msg):
+            self.f.write(f'{ts}, {event}, {msg}\n')
+
+    def close(self) -> None:
+        if self.f is None:
+            return
+        try:
+            self.f.close()
+            print(f"위험 로그 저장됨: {self.path}")
+        except OSError as e:
+            print(f"파일 저장 오류: {e}")
+
+
+class MarkdownReportSink(RowSink):
+    # 전체 메시지를 하나로 합치지 않고, 키워드 등장 여부만 플래그로 기억
+    def __init__(self, path: str = 'log_analysis.md') -> None:
+        self.path = path
+        self.danger_kw = ['explosion', 'leak', 'unstable', 'overheat', 'oxygen']
+        self.pattern = compile_keywords(self.danger_kw, ignore_case=True)
+        self.seen = {k: False for k in self.danger_kw}
+        self.total = 0
+        self.first_ts = self.last_ts = ''
+        # 위험 로그 줄은 개수를 미리 알 수 없으니 임시 파일(작으면 메모리)에 흘려 씀
+        self.danger_buf = SpooledTemporaryFile(max_size=1024 * 1024, mode='w+', encoding='utf-8')
+
+    def feed(self, row: Row) -> None:
+        ts, event, msg = row
+        if self.total == 0:
+            self.first_ts = ts
+        self.last_ts = ts
+        self.total += 1
+        hits = self.pattern.findall(msg)
+        for k in hits:
+            self.seen[k.lower()] = True
+        if hits:
+            self.danger_buf.write(f'- {ts} {event} {msg}\n')
+
+    def cause(self) -> str:
+        seen = self.seen
+        if seen['oxygen'] and seen['explosion']:
+            return '산소 계통 관련 이상 후 폭발로 진행된 사고 가능성'
+        if seen['oxygen']:
+            return '산소 계통 이상 징후 감지(추가 점검 필요)'
+        if seen['explosion']:
+            return '폭발 징후 감지(원인 식별 필요)'
+        if seen['leak']:
+            return '누출 징후 감지(추가 점검 필요)'
+        if seen['overheat']:
+            return '과열 징후 감지(열관리 점검 필요)'
+        return '기타 이상 징후 없음'
+
+    def close(self) -> None:
+        with self.danger_buf:
+            try:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    f.write('# 사고 원인 분석 보고서\n')
+                    f.write('\n')
+                    f.write('## 1. 로그 개요\n')
+                    f.write(f'- 총 {self.total}개의 로그가 기록됨\n')
+                    if self.total:
+                        f.write(f'- 기간: {self.first_ts} ~ {self.last_ts}\n')
+                    f.write('\n')
+                    f.write('## 2. 위험 로그\n')
+                    if self.danger_buf.tell():
+                        self.danger_buf.seek(0)
+                        for line in self.danger_buf:
+                            f.write(line)
+                    else:
+                        f.write('- (없음)\n')
+                    f.write('\n')
+                    f.write('## 3. 추정 원인\n')
+                    f.write(f'- {self.cause()}\n')
+                print(f"마크다운 보고서 저장됨: {self.path}")
+            except OSError as e:
+                print(f"파일 저장 오류: {e}")
+
+
+def print_log(rows: Iterable[Row]) -> None:
+    count = 0
     for ts, event, msg in rows:
+        if count == 0:
+            print("Timestamp, Event, Message")
         print(f"{ts}, {event}, {msg}")
+        count += 1
+    if count == 0:
+        print('로그가 없습니다.')
 
 
 
-def rows_to_dict(rows: List[Tuple[str, str, str]]) -> dict[str, dict[str, str]]:
+def rows_to_dict(rows: List[Row]) -> dict[str, dict[str, str]]:
     log_dict : dict[str, dict[str, str]] = {}
     for ts, event, msg in rows:
         log_dict[ts] = {
@@ -45,106 +336,145 @@ def rows_to_dict(rows: List[Tuple[str, str, str]]) -> dict[str, dict[str, str]]:
         }
     return log_dict
 
-import json
+class JsonStreamWriter:
+    """(ts, event, msg)를 받는 즉시 JSON 객체 항목으로 흘려 쓰는 writer.
+
+    - 기본 출력은 json.dump(..., indent=4)와 같은 모양, compact=True면 공백 없는 한 줄
+    - json_lines=True면 한 줄에 {"timestamp", "event", "message"} 객체 하나(JSON Lines)
+    - 같은 타임스탬프가 연달아 나오면 기본은 첫 행만 남기고(기존 dict와 같은 결과),
+      keep_duplicates=True면 "ts": [{...}, {...}] 배열로 모두 남김
+    메모리에는 지금 묶고 있는 타임스탬프의 행들만 들고 있고, 쓰기는 buffer_size 단위로 모아서 한다.
+    (로그는 시간순이라 중복은 붙어서 나온다고 가정. 떨어져 있는 중복은 키가 두 번 나옴)
+    """
+
+    def __init__(self, path: str, compact: bool = False, keep_duplicates: bool = False,
+                 json_lines: bool = False, buffer_size: int = 1024 * 1024) -> None:
+        self.compact = compact
+        self.keep_duplicates = keep_duplicates
+        self.json_lines = json_lines
+        self._enc = json.JSONEncoder(ensure_ascii=False).encode
+        self._f = open(path, 'w', encoding='utf-8', buffering=buffer_size)
+        self._count = 0
+        self._ts: str | None = None
+        self._group: list[tuple[str, str]] = []
+
+    def write(self, ts: str, event: str, msg: str) -> None:
+        if self.json_lines:
+            if self.keep_duplicates or ts != self._ts:
+                self._ts = ts
+                self._f.write(f'{{"timestamp": {self._enc(ts)}, "event": {self._enc(event)}, '
+                              f'"message": {self._enc(msg)}}}\n')
+            return
+        if ts != self._ts:
+            self._flush_group()
+            self._ts = ts
+        if self.keep_duplicates or not self._group:
+            self._group.append((event, msg))
+
+    def write_rows(self, rows: Iterable[Row]) -> None:
+        for row in rows:
+            self.write(*row)
+
+    def _entry(self, event: str, msg: str, pad: str) -> str:
+        enc = self._enc
+        if self.compact:
+            return f'{{"event":{enc(event)},"message":{enc(msg)}}}'
+        return (f'{{\n{pad}    "event": {enc(event)},\n'
+                f'{pad}    "message": {enc(msg)}\n{pad}}}')
+
+    def _flush_group(self) -> None:
+        if not self._group:
+            return
+        key = self._enc(self._ts)
+        if self.compact:
+            head = '{' if self._count == 0 else ','
+            sep = ':'
+        else:
+            head = '{\n    ' if self._count == 0 else ',\n    '
+            sep = ': '
+        if len(self._group) == 1 and not self.keep_duplicates:
+            value = self._entry(*self._group[0], '    ')
+        elif self.compact:
+            value = '[' + ','.join(self._entry(e, m, '') for e, m in self._group) + ']'
+        else:
+            items = ',\n        '.join(self._entry(e, m, '        ') for e, m in self._group)
+            value = f'[\n        {items}\n    ]'
+        self._f.write(head + key + sep + value)
+        self._count += 1
+        self._group = []
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        try:
+            if not self.json_lines:
+                self._flush_group()
+                if self._count == 0:
+                    self._f.write('{}')
+                else:
+                    self._f.write('}' if self.compact else '\n}')
+        finally:
+            self._f.close()
+
+    def __enter__(self) -> 'JsonStreamWriter':
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
 
 def save_to_json(data: dict[str, dict[str, str]], path: str = "mission_computer_main.json") -> None:
     try:
-        with open(path, "w", encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        with JsonStreamWriter(path) as w:
+            for ts, value in data.items():
+                w.write(ts, value['event'], value['message'])
         print(f"JSON 파일로 저장됨: {path}")
-    except OSError as e:
-        print(f"파일 저장 오류: {e}")  
-
-def save_danger_logs(rows: list[tuple[str, str, str]], path: str = 'danger_logs.log') -> None:
-    danger_kw = ['explosion', 'unstable', 'leak', 'overheat', 'Oxygen']
-    try:
-        with open(path, 'w', encoding='utf-8') as f:
-            for ts, event, msg in rows:
-                if any(k in msg for k in danger_kw):
-                    f.write(f'{ts}, {event}, {msg}\n')
-        print(f"위험 로그 저장됨: {path}")
     except OSError as e:
         print(f"파일 저장 오류: {e}")
 
-def write_markdown_report(rows: List[Tuple[str, str, str]], path: str = 'log_analysis.md') -> None:
-    msgs = [m for _, _, m in rows]
-    blob = ' '.join(msgs)
-    blob_low = blob.lower()
-
-    danger_lines = [
-        f'- {ts} {event} {msg}'
-        for ts, event, msg in rows
-        if ('explosion in msg') or ('leak in msg') or ('unstable in msg') or ('overheat in msg') or ('oxygen' in msg.lower())
-    ]
-    if ('oxygen' in blob_low and 'explosion' in blob_low) or ('Oxygen' in blob and 'explosion' in blob):
-        cause = '산소 계통 관련 이상 후 폭발로 진행된 사고 가능성'
-    elif ('oxygen' in blob_low) or ('Oxygen' in blob):
-        cause = '산소 계통 이상 징후 감지(추가 점검 필요)'
-    elif ('explosion' in blob_low) or ('explosion' in blob):
-        cause = '폭발 징후 감지(원인 식별 필요)'
-    elif ('leak' in blob_low) or ('leak' in blob):
-        cause = '누출 징후 감지(추가 점검 필요)'
-    elif ('overheat' in blob_low) or ('overheat' in blob):
-        cause = '과열 징후 감지(열관리 점검 필요)'
-    else:
-        cause = '기타 이상 징후 없음'
-    
-    lines = []
-    lines.append('# 사고 원인 분석 보고서')
-    lines.append('')
-    lines.append('## 1. 로그 개요')
-    lines.append(f'- 총 {len(rows)}개의 로그가 기록됨')
-    if rows:
-        lines.append(f'- 기간: {rows[0][0]} ~ {rows[-1][0]}')
-    lines.append('')
-    lines.append('## 2. 위험 로그')
-    if danger_lines:
-        lines.extend(danger_lines)
-    else:
-        lines.append('- (없음)')
-    lines.append('')
-    lines.append('## 3. 추정 원인')
-    lines.append(f'- {cause}')
-    lines.append('')
+def save_rows_to_json(rows: Iterable[Row], path: str = "mission_computer_main.json",
+                      compact: bool = False, keep_duplicates: bool = False,
+                      json_lines: bool = False) -> None:
+    # rows_to_dict를 거치지 않고 바로 스트리밍 저장
+    pipeline = LogPipeline()
+    pipeline.add(JsonSink(path, compact, keep_duplicates, json_lines))
+    pipeline.run(rows)
 
-    try:
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
-        print(f"마크다운 보고서 저장됨: {path}")
-    except OSError as e:
-        print(f"파일 저장 오류: {e}")
+def save_danger_logs(rows: Iterable[Row], path: str = 'danger_logs.log') -> None:
+    pipeline = LogPipeline()
+    pipeline.add(DangerLogSink(path))
+    pipeline.run(rows)
+
+def write_markdown_report(rows: Iterable[Row], path: str = 'log_analysis.md') -> None:
+    pipeline = LogPipeline()
+    pipeline.add(MarkdownReportSink(path))
+    pipeline.run(rows)
 
-def filter_rows(rows, keyword: str | None) -> list[tuple[str, str, str]]:
+def filter_rows(rows: Iterable[Row], keyword: str | None) -> Iterator[Row]:
     if not keyword:
-        return rows
+        yield from rows
+        return
     k = keyword.lower()
-    out = []
-    for ts, event, msg in rows:
-        if (k in ts.lower()) or (k in event.lower()) or (k in msg.lower()):
-            out.append((ts, event, msg))
-    return out
-        
+    for row in rows:
+        if _row_matches(row, k):
+            yield row
+
 def main() -> None:
-    rows = load_log()
-    if not rows:
+    rows = iter_log()
+    first = next(rows, None)
+    if first is None:
         print('출력할 데이터가 없습니다')
         return
 
     kw = input('검색 키워드(엔터=전체): ').strip()
-    view = filter_rows(rows, kw)
-
-    print('====검색결과===')
-    print_log(view)
 
-    print('====역순출력===')
-    rev_view = list(reversed(view))
-    print_log(rev_view)
-
-    log_dict = rows_to_dict(list(reversed(rows)))
-    save_to_json(log_dict)
-    save_danger_logs(rows)
-    write_markdown_report(rows)
+    # 검색/역순 출력, JSON, 위험 로그, 보고서를 한 번의 순회로 같이 만듦
+    pipeline = LogPipeline()
+    pipeline.add(SearchPrintSink(kw))
+    pipeline.add(JsonSink())
+    pipeline.add(DangerLogSink())
+    pipeline.add(MarkdownReportSink())
+    pipeline.run(chain([first], rows))
 
 if __name__ == "__main__":
     main()
-